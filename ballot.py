@@ -0,0 +1,123 @@
+# ballot.py
+
+from typing import Awaitable, Callable, List
+
+import discord
+
+# 4 rows of names, the last row holds the clear button
+BUTTONS_PER_BALLOT = 20
+BUTTONS_PER_ROW = 5
+
+VoteCallback = Callable[[discord.Interaction, int], Awaitable[None]]
+ClearCallback = Callable[[discord.Interaction], Awaitable[None]]
+
+class BallotButton(discord.ui.Button):
+    """
+    One submission on a ballot. Clicking it spends one vote.
+    """
+    def __init__(self, custom_id: str, label: str, index: int, on_vote: VoteCallback, row: int):
+        super().__init__(
+            style=discord.ButtonStyle.secondary,
+            label=label[:80],
+            custom_id=custom_id,
+            row=row
+        )
+        self.index = index
+        self.on_vote = on_vote
+
+    async def callback(self, interaction: discord.Interaction):
+        await self.on_vote(interaction, self.index)
+
+class ClearVotesButton(discord.ui.Button):
+    """
+    Refunds every vote the user cast this round, same as reacting with ⭕.
+    """
+    def __init__(self, custom_id: str, on_clear: ClearCallback):
+        super().__init__(
+            style=discord.ButtonStyle.danger,
+            label="Clear my votes",
+            emoji="⭕",
+            custom_id=custom_id,
+            row=BUTTONS_PER_BALLOT // BUTTONS_PER_ROW
+        )
+        self.on_clear = on_clear
+
+    async def callback(self, interaction: discord.Interaction):
+        await self.on_clear(interaction)
+
+class BallotView(discord.ui.View):
+    """
+    A grid of submission buttons plus a clear button.
+    """
+    def __init__(self, custom_id_prefix: str, names: List[tuple[int, str]], on_vote: VoteCallback, on_clear: ClearCallback):
+        super().__init__(timeout=None)
+        for position, (index, name) in enumerate(names):
+            self.add_item(BallotButton(
+                f"{custom_id_prefix}:vote:{index}",
+                name,
+                index,
+                on_vote,
+                row=position // BUTTONS_PER_ROW
+            ))
+        self.add_item(ClearVotesButton(f"{custom_id_prefix}:clear:{names[0][0] if names else 0}", on_clear))
+
+def build_ballots(custom_id_prefix: str, names: List[str], on_vote: VoteCallback, on_clear: ClearCallback) -> List[BallotView]:
+    """
+    Split a round's submissions into as few ballot views as Discord allows.
+    Buttons carry the submission's index in `names`.
+    """
+    indexed = list(enumerate(names))
+    return [
+        BallotView(custom_id_prefix, indexed[i:i + BUTTONS_PER_BALLOT], on_vote, on_clear)
+        for i in range(0, len(indexed), BUTTONS_PER_BALLOT)
+    ]
+
+PickCallback = Callable[[discord.Interaction, int, int], Awaitable[None]]
+StartCallback = Callable[[discord.Interaction], Awaitable[None]]
+
+class MatchupStartButton(discord.ui.Button):
+    """
+    Hands the clicking user their first matchup.
+    """
+    def __init__(self, custom_id: str, on_start: StartCallback):
+        super().__init__(style=discord.ButtonStyle.primary, label="Vote", emoji="🗳️", custom_id=custom_id)
+        self.on_start = on_start
+
+    async def callback(self, interaction: discord.Interaction):
+        await self.on_start(interaction)
+
+class MatchupStartView(discord.ui.View):
+    """
+    The one message posted for a matchups ballot: start voting or clear.
+    """
+    def __init__(self, custom_id_prefix: str, on_start: StartCallback, on_clear: ClearCallback):
+        super().__init__(timeout=None)
+        self.add_item(MatchupStartButton(f"{custom_id_prefix}:start", on_start))
+        self.add_item(ClearVotesButton(f"{custom_id_prefix}:clear:0", on_clear))
+
+class MatchupButton(discord.ui.Button):
+    """
+    One side of a matchup. The custom id carries both submissions, so a
+    click counts the same wherever the view came from.
+    """
+    def __init__(self, custom_id_prefix: str, label: str, winner: int, loser: int, on_pick: PickCallback):
+        super().__init__(
+            style=discord.ButtonStyle.secondary,
+            label=label[:80],
+            custom_id=f"{custom_id_prefix}:pick:{winner}:{loser}"
+        )
+        self.winner = winner
+        self.loser = loser
+        self.on_pick = on_pick
+
+    async def callback(self, interaction: discord.Interaction):
+        await self.on_pick(interaction, self.winner, self.loser)
+
+class MatchupView(discord.ui.View):
+    """
+    Two names side by side, sent to one user.
+    """
+    def __init__(self, custom_id_prefix: str, first: tuple[int, str], second: tuple[int, str], on_pick: PickCallback):
+        super().__init__(timeout=None)
+        self.add_item(MatchupButton(custom_id_prefix, first[1], first[0], second[0], on_pick))
+        self.add_item(MatchupButton(custom_id_prefix, second[1], second[0], first[0], on_pick))
@@ -1,4 +1,4 @@
-import os, sys, re, asyncio
+import os, asyncio, logging
 import discord
 from discord import app_commands, Permissions
 from discord.ext import commands
@@ -10,34 +10,149 @@ from ai import get_name_submission
 import random
 from typing import List
 
-from mr_bracket import Bracket, ClashInfo
-from guild_state import setGuildVar, getGuildVar, clearGuild
+from mr_bracket import Bracket, ClashInfo, warm_up
+from guild_state import setGuildVar, getGuildVar, clearGuild, configureStore, getStore, MemoryGuildStore, FileGuildStore
+from guild_actor import GuildActors, current_guild
+from message_cache import TrackedMessageCache
+from edit_coalescer import EditCoalescer
+from outbound import OutboundScheduler, Priority
+from user_throttle import UserThrottle
+from leaderboard import Leaderboard
+from vote_budget import VoteBudget
+from name_cache import DisplayNameCache
+from channel_cache import ChannelCache
+from ballot import build_ballots, MatchupStartView, MatchupView
+from qual_pool import QualPool, qual_pools, find_qual_pool, pool_quotas
+from config import init_config, get_config, guild_settings
+from event_trace import open_trace
+from metrics import MetricsRegistry, serve_metrics, dump_metrics
+from profiler import OnDemandProfiler
+from command_sync import sync_command_tree
+from log_setup import GuildContextFilter, setup_logging
+
+# parsed and validated once, a bad setting stops the bot here
+config = init_config()
+
+# handlers only enqueue records, setup_logging() in __main__ starts the writer thread
+log = logging.getLogger("bot")
 
 intents = discord.Intents.default()
 intents.message_content = True
-intents.members = True
+# without the member cache Discord sends no member list and nothing gets chunked at startup
+intents.members = config.member_cache
 
-bot = commands.Bot(command_prefix="!", intents=intents)
+# ─── Sharding ─────────────────────────────────────────────────────
+# start.sh sets SHARD_COUNT/SHARD_IDS for each worker process when
+# SHARD_WORKERS > 1, otherwise we run a single unsharded bot.
+shard_count = config.shard_count
+shard_ids = list(config.shard_ids) or None
+
+if shard_count > 0:
+    bot = commands.AutoShardedBot(command_prefix="!", intents=intents, shard_count=shard_count, shard_ids=shard_ids)
+else:
+    bot = commands.Bot(command_prefix="!", intents=intents)
+
+if config.guild_state_store == "file":
+    configureStore(FileGuildStore(config.guild_state_dir, max(shard_count, 1)))
+else:
+    configureStore(MemoryGuildStore(max(shard_count, 1)))
 
 bot_removing_reaction = {}
 
+# latency histograms and counters, exposed over HTTP and/or dumped to a file
+metrics = MetricsRegistry()
+metrics.describe("gateway_event_seconds", "Time from receiving a gateway event until its handler finished, mailbox wait included")
+metrics.describe("process_stage_seconds", "Time spent in process_stage by stage and mode")
+metrics.describe("render_seconds", "Time spent rendering standings and memes")
+metrics.describe("outbound_call_seconds", "Duration of Discord API calls by route kind")
+metrics.describe("outbound_wait_seconds", "Time Discord API calls spent queued by route kind")
+metrics.describe("command_sync_seconds", "Duration of application command syncs by scope")
+metrics.describe("throttled_events_total", "User events dropped by the per-user throttle by event kind")
+metrics_tasks: List[asyncio.Task] = []
+
+# rendering modules are imported lazily, on_ready loads them off the event loop
+render_warm_up: Optional[asyncio.Task] = None
+
+# opt-in recording of handled gateway events, replayed with replay.py
+gateway_trace = open_trace(config.event_trace_dir, lambda guild_id: guild_settings(get_config(guild_id)))
+
+# cProfile for a bounded window, started with /profile
+profiler = OnDemandProfiler("logs")
+
+# every event for a guild is processed in order through that guild's mailbox
+guild_actors = GuildActors(
+    config.guild_mailbox_size,
+    on_processed=lambda guild_id: guild_event_processed(guild_id)
+)
+
+# voting messages we posted, so reactions resolve without a REST fetch
+tracked_messages = TrackedMessageCache(config.tracked_message_cache_size)
+
+# display names seen in events, only filled when the member cache is off
+display_names = DisplayNameCache(config.display_name_cache_size)
+
+# per-user token buckets, spam is dropped before it reaches the guild's mailbox
+user_throttle = UserThrottle({
+    "reaction": (config.user_reaction_rate, config.user_reaction_burst),
+    "message": (config.user_message_rate, config.user_message_burst),
+})
+
+# bracket channel lookups by name, resolved once per guild
+channel_cache = ChannelCache(bot)
+
+# every Discord API call is queued here, per-route token buckets keep us under the rate limits
+def observe_outbound(kind: str, wait: float, duration: float, ok: bool) -> None:
+    metrics.observe("outbound_call_seconds", duration, route=kind)
+    metrics.observe("outbound_wait_seconds", wait, route=kind)
+    if not ok:
+        metrics.inc("outbound_failures_total", route=kind)
+
+outbound = OutboundScheduler(
+    concurrency=config.outbound_concurrency,
+    drop_threshold=config.outbound_drop_threshold,
+    on_executed=observe_outbound
+)
+
+# "(N) name" counters are edited at most once per interval, keeping only the latest count
+vote_edits = EditCoalescer(
+    config.vote_edit_interval,
+    on_edited=tracked_messages.track,
+    edit=lambda message, fields: outbound.call(("edit", message.channel.id), Priority.VOTING, lambda: message.edit(**fields))
+)
+
 # ─── add this inside your file ─────────────────────────────────────
 
+async def submit_command(interaction: discord.Interaction, handler, *args):
+    """
+    Acknowledge a slash command right away and queue its handler on the
+    guild's mailbox, the handler answers with a followup. Waiting behind a
+    voting burst would otherwise miss Discord's 3 second deadline.
+    """
+    await interaction.response.defer(ephemeral=True)
+    await guild_actors.submit(interaction.guild_id, handler, interaction, *args)
+
 @bot.tree.command(name="start",
                   description="Begin team name bracket")
 @app_commands.default_permissions(administrator=True)
 async def start(interaction: discord.Interaction):
+    if gateway_trace is not None:
+        gateway_trace.command(interaction, "start")
+    await submit_command(interaction, handle_start)
+
+async def handle_start(interaction: discord.Interaction):
     guild_id = interaction.guild.id
     current = getGuildVar(guild_id, "stage", 0)
     if current == 0:
         setGuildVar(guild_id, "stage", 1)
-        if not await validate_start(interaction):
-            return        
-        await close_submissions(interaction.guild, os.getenv("BRACKET_CHANNEL_NAME"))
-        await interaction.response.send_message("Starting bracket...", ephemeral=True)
+        guild_config = get_config(guild_id)
+        await close_submissions(interaction.guild, guild_config.bracket_channel_name)
+        for pool in qual_pools(guild_config):
+            if pool.channel_name != guild_config.bracket_channel_name:
+                await close_submissions(interaction.guild, pool.channel_name)
+        await interaction.followup.send("Starting bracket...", ephemeral=True)
         await process_stage(guild_id)
     else:
-        await interaction.response.send_message(
+        await interaction.followup.send(
             "Bracket has already started.",
             ephemeral=True
         )
@@ -46,9 +161,16 @@ async def start(interaction: discord.Interaction):
                   description="Reset stages")
 @app_commands.default_permissions(administrator=True)
 async def clear_stage(interaction: discord.Interaction):
+    if gateway_trace is not None:
+        gateway_trace.command(interaction, "reset")
+    await submit_command(interaction, handle_reset)
+
+async def handle_reset(interaction: discord.Interaction):
     guild_id = interaction.guild.id
     clearGuild(guild_id)
-    await interaction.response.send_message(
+    vote_edits.discard(guild_id)
+    tracked_messages.forget_guild(guild_id)
+    await interaction.followup.send(
         "✅ Reset Everything.",
         ephemeral=True
     )
@@ -68,6 +190,17 @@ async def clear_stage(interaction: discord.Interaction):
     # Check how many members we can actually see
     visible_members = len(guild.members)
     visible_humans = len([m for m in guild.members if not m.bot])
+
+    # Mailbox health for this guild
+    mailbox = guild_actors.stats().get(guild.id, {})
+    outbound_stats = outbound.stats()
+    throttle_stats = user_throttle.stats()
+
+    # gateway event latency for this guild, mailbox wait included
+    event_latency = "".join(
+        f"- {dict(key)['event']} p50/p99: {row['p50'] * 1000:.1f}ms / {row['p99'] * 1000:.1f}ms ({row['count']} events)\n"
+        for key, row in sorted(metrics.quantiles("gateway_event_seconds", guild=guild.id).items())
+    )
     
     debug_info = (
         f"Debug Information:\n"
@@ -75,6 +208,15 @@ async def clear_stage(interaction: discord.Interaction):
         f"- Guild Member Count: {member_count}\n"
         f"- Visible Members: {visible_members}\n"
         f"- Visible Humans: {visible_humans}\n"
+        f"- Display Name Cache: {len(display_names)} names, {display_names.hits} hits, {display_names.misses} misses\n"
+        f"- Mailbox Queue Depth: {mailbox.get('queue_depth', 0)}\n"
+        f"- Mailbox Events Processed: {mailbox.get('processed', 0)}\n"
+        f"- Mailbox Avg/Max Latency: {mailbox.get('avg_latency', 0.0) * 1000:.1f}ms / {mailbox.get('max_latency', 0.0) * 1000:.1f}ms\n"
+        f"- Outbound: {outbound_stats['pending']} pending, {outbound_stats['executed']} sent, "
+        f"{outbound_stats['throttled']} throttled, {outbound_stats['coalesced']} coalesced, "
+        f"{outbound_stats['dropped']} dropped, {outbound_stats['rate_limited']} 429s, {outbound_stats['retried']} retries\n"
+        f"- User Throttle: {throttle_stats['dropped']} events dropped, {throttle_stats['buckets']} active buckets\n"
+        f"{event_latency}"
     )
 
     # bracket = Bracket()
@@ -82,13 +224,65 @@ async def clear_stage(interaction: discord.Interaction):
     
     await interaction.response.send_message(debug_info, ephemeral=True)
 
+@bot.tree.command(name="leaderboard",
+                  description="Show the top names of the round being voted on")
+async def show_leaderboard(interaction: discord.Interaction, count: int = 10):
+    # read only, answered right away instead of waiting in the guild's mailbox
+    guild_id = interaction.guild_id
+    guild_config = get_config(guild_id)
+    open_qual_round = getGuildVar(guild_id, "open_qual_round", 0)
+    count = max(1, min(count, 25))
+
+    pools = qual_pools(guild_config)
+    sections = []
+    if getGuildVar(guild_id, "stage", 0) == 1:
+        for pool in pools:
+            if get_pool_mode(guild_id, pool, open_qual_round) != "voting":
+                continue
+            round_submissions: List = getGuildVar(guild_id, pool.var(open_qual_round, "submissions"), [])
+            leaderboard = get_leaderboard(guild_id, pool, open_qual_round)
+            lines = [
+                f"{place}. {round_submissions[index]['name']} ({leaderboard.scores[index]:g})"
+                for place, index in enumerate(leaderboard.top(count), start=1)
+            ]
+            sections.append(f"**Round {open_qual_round}{pool.label(len(pools))}**\n" + "\n".join(lines))
+
+    if not sections:
+        await interaction.response.send_message("No round is being voted on right now.", ephemeral=True)
+        return
+    await interaction.response.send_message("\n\n".join(sections), ephemeral=True)
+
+@bot.tree.command(name="profile",
+                  description="Profile the bot for a number of seconds or events")
+@app_commands.default_permissions(administrator=True)
+async def profile(interaction: discord.Interaction, seconds: int = 30, events: int = 0):
+    # not queued through the guild mailbox, the profile covers every guild
+    if profiler.active:
+        await interaction.response.send_message("A profile is already running.", ephemeral=True)
+        return
+    seconds = max(1, min(seconds, 300))
+    await interaction.response.defer(ephemeral=True, thinking=True)
+    result = await profiler.run(seconds, max(events, 0))
+
+    summary = "\n".join(result.top)
+    await interaction.followup.send(
+        f"Profiled {result.seconds:.1f}s, {result.events} events. Saved to `{result.path}`\n"
+        f"```\n{summary[:1800]}\n```",
+        ephemeral=True
+    )
+
 @bot.tree.command(name="confirm",
                  description="Confirms the pending operation")
 @app_commands.default_permissions(administrator=True)
 async def confirm(interaction: discord.Interaction):
+    if gateway_trace is not None:
+        gateway_trace.command(interaction, "confirm")
+    await submit_command(interaction, handle_confirm)
+
+async def handle_confirm(interaction: discord.Interaction):
     setGuildVar(interaction.guild_id, "requires_confirmation", False)
     await process_stage(interaction.guild_id)
-    await interaction.response.send_message(
+    await interaction.followup.send(
         getGuildVar(interaction.guild_id, "confirm_message",  "Confirmed"),
         ephemeral=True
     )
@@ -98,110 +292,144 @@ async def confirm(interaction: discord.Interaction):
                   description="Give votes to users")
 @app_commands.default_permissions(administrator=True)
 async def give_vote(interaction: discord.Interaction, amount: int = 1, user_id: str = None):
+    if gateway_trace is not None:
+        gateway_trace.command(interaction, "give_vote", amount=amount, user_id=user_id)
+    await submit_command(interaction, handle_give_vote, amount, user_id)
+
+async def handle_give_vote(interaction: discord.Interaction, amount: int = 1, user_id: str = None):
     guild_id = interaction.guild.id
     
     if user_id is not None:
         try:
             user_id_int = int(user_id)
-            current_votes = get_user_vote_count(guild_id, user_id_int)
-            new_votes = current_votes + amount
-            set_user_vote_count(guild_id, user_id_int, new_votes)
+            budget = get_vote_budget(guild_id)
+            new_votes = budget.add(user_id_int, amount)
+            setGuildVar(guild_id, "vote_budget", budget)
             
-            user_name = user_id
-            try:
-                member = interaction.guild.get_member(user_id_int)
-                if member:
-                    user_name = member.display_name
-            except:
-                pass
+            user_name = get_user_display_name(guild_id, user_id_int)
             
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 f"Added {amount} vote(s) to {user_name}. New total: {new_votes}",
                 ephemeral=True
             )
         except ValueError:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 "Invalid user ID. Please provide a valid numeric ID.",
                 ephemeral=True
             )
     else:
-        non_bot_members = [member for member in interaction.guild.members if not member.bot]
-        if not non_bot_members:
-            await interaction.response.send_message(
-                "No users found in the server.",
-                ephemeral=True
-            )
-            return
+        # one grant for the whole guild, members who join later get it too
+        budget = get_vote_budget(guild_id)
+        budget.grant_all(amount)
+        setGuildVar(guild_id, "vote_budget", budget)
         
-        # Give votes to all non-bot users
-        updated_users = 0
-        for member in non_bot_members:
-            current_votes = get_user_vote_count(guild_id, member.id)
-            new_votes = current_votes + amount
-            set_user_vote_count(guild_id, member.id, new_votes)
-            updated_users += 1
-        
-        await interaction.response.send_message(
-            f"Added {amount} vote(s) to {updated_users} users.",
+        await interaction.followup.send(
+            f"Added {amount} vote(s) to everyone.",
             ephemeral=True
         )
 
 @bot.event
 async def on_error(event, *args, **kwargs):
-    print(f"Error in {event}: {sys.exc_info()[1]}", flush=True)
+    log.exception("Error in %s", event, extra={"event": event})
 
 @bot.event
 async def on_ready():
-    await bot.tree.sync()  # registers your slash commands with Discord
-    print(f"✅ Logged in as {bot.user} (ID: {bot.user.id})")
+    # commands are global, only the worker owning shard 0 needs to sync them
+    if shard_ids is None or 0 in shard_ids:
+        try:
+            # registers your slash commands with Discord, only when they changed
+            await sync_command_tree(
+                bot.tree,
+                config.command_hash_file,
+                config.command_sync_guilds,
+                on_synced=lambda scope, seconds: metrics.observe("command_sync_seconds", seconds, scope=scope)
+            )
+        except discord.HTTPException:
+            log.exception("Could not sync application commands")
+    if gateway_trace is not None:
+        gateway_trace.start(bot.user.id)
+    await start_metrics_exposition()
+    global render_warm_up
+    if render_warm_up is None:
+        render_warm_up = asyncio.create_task(warm_up_rendering(), name="render-warm-up")
+    log.info("Logged in as %s (ID: %s) shards: %s", bot.user, bot.user.id, shard_ids if shard_ids is not None else "all")
+
+@bot.event
+async def on_guild_channel_create(channel: discord.abc.GuildChannel):
+    channel_cache.invalidate(channel.guild.id)
+
+@bot.event
+async def on_guild_channel_update(before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+    channel_cache.invalidate(after.guild.id)
+
+@bot.event
+async def on_guild_channel_delete(channel: discord.abc.GuildChannel):
+    channel_cache.invalidate(channel.guild.id)
 
 @bot.event
 async def on_message(message: discord.Message):
     await bot.process_commands(message)
     if message.guild is None:
         return
+    remember_display_name(message.guild.id, message.author)
+    # only submissions spend the user's budget, chatting elsewhere does not
+    if (
+        not message.author.bot
+        and find_qual_pool(get_config(message.guild.id), message.channel.name) is not None
+        and is_throttled(message.guild.id, message.author.id, "message")
+    ):
+        reject_message(message, f"You're submitting too fast in {message.channel.mention}, that one was not counted. Try again in a moment.")
+        return
+    # the trace keeps what the bot acts on, not the rest of the guild's chat
+    if gateway_trace is not None and is_bracket_channel(message.guild.id, message.channel.name):
+        if message.author.id == bot.user.id:
+            gateway_trace.post(message)
+        else:
+            gateway_trace.message(message)
+    with metrics.timer("gateway_event_seconds", event="message", guild=message.guild.id):
+        await guild_actors.submit(message.guild.id, handle_message, message)
+
+async def handle_message(message: discord.Message):
     bot_is_playing = getGuildVar(message.guild.id, "bot_is_playing", False)
     if message.author.bot and bot_is_playing == False:
         return
     
     guild_id = message.guild.id
+    guild_config = get_config(guild_id)
 
-    # Only handle if we are in the bracket channel
-    bracket_channel_name = os.getenv("BRACKET_CHANNEL_NAME")
-    if message.channel.name == bracket_channel_name:
+    # Only handle qualification channels, the bracket channel unless pools are configured
+    pool = find_qual_pool(guild_config, message.channel.name)
+    if pool is not None:
         current_stage = getGuildVar(guild_id, "stage", 0)
         match current_stage:
             case 1:
-                open_qual_mode = getGuildVar(guild_id, "open_qual_mode")
-                match open_qual_mode:
+                open_qual_round = getGuildVar(guild_id, "open_qual_round", 0)
+                match get_pool_mode(guild_id, pool, open_qual_round):
                     case "submissions":
                         content = message.content.strip()
-                        open_qual_round = getGuildVar(guild_id, "open_qual_round", 0)
-                        round_subs: List = getGuildVar(guild_id, f"open_qual_round_{open_qual_round}_submissions", [])
+                        round_subs: List = getGuildVar(guild_id, pool.var(open_qual_round, "submissions"), [])
                         qualified_submissions: List = getGuildVar(guild_id, "qualified_submissions", [])
-                        min_sub_length = int(os.getenv("MIN_SUB_LENGTH", 3))
-                        max_sub_length = int(os.getenv("MAX_SUB_LENGTH", 32))
+                        min_sub_length = guild_config.min_sub_length
+                        max_sub_length = guild_config.max_sub_length
 
                         # Check all submission rules
                         if len(content) < min_sub_length:
-                            await message.delete()
-                            await message.author.send(f"Your submission in {message.channel.mention} must be at least {min_sub_length} characters long.")
+                            reject_message(message, f"Your submission in {message.channel.mention} must be at least {min_sub_length} characters long.")
                             return
                         elif len(content) > max_sub_length:
-                            await message.delete()
-                            await message.author.send(f"Your submission in {message.channel.mention} must be at most {max_sub_length} characters long.")
+                            reject_message(message, f"Your submission in {message.channel.mention} must be at most {max_sub_length} characters long.")
                             return
-                        for sub in round_subs:
-                            if sub["name"].lower() == content.lower():
-                                await message.delete()
-                                await message.author.send(
+                        for sub in round_submission_names(guild_id, open_qual_round, guild_config):
+                            if sub.lower() == content.lower():
+                                reject_message(
+                                    message,
                                     f"Your submission '{content}' in {message.channel.mention} is a duplicate for this round."
                                 )
                                 return
                         for sub in qualified_submissions:
                             if sub["name"].lower() == content.lower():
-                                await message.delete()
-                                await message.author.send(
+                                reject_message(
+                                    message,
                                     f"Your submission '{content}' in {message.channel.mention} has already qualified in a previous round."
                                 )
                                 return
@@ -210,47 +438,48 @@ async def on_message(message: discord.Message):
                             "name": content,
                             "votes": []
                         })
-                        setGuildVar(guild_id, f"open_qual_round_{open_qual_round}_submissions", round_subs)
+                        setGuildVar(guild_id, pool.var(open_qual_round, "submissions"), round_subs)
                         await process_stage(guild_id)
                         return
                     case "voting":
-                        await message.delete()
-                        await message.interaction.response.send_message(
-                            "Submissions are closed",
-                            ephemeral=True
-                        )
+                        # a message can still arrive after the channel was locked
+                        reject_message(message, f"Submissions in {message.channel.mention} are closed.")
                         return
                 return
             case 2:
                 return
 
 @bot.event
-async def on_raw_reaction_add(payload):
+async def on_raw_reaction_add(payload: discord.RawReactionActionEvent):
     if payload.guild_id is None:
         return
         
     bot_is_playing = getGuildVar(payload.guild_id, "bot_is_playing", False)
     if payload.user_id == bot.user.id and bot_is_playing == False:
         return
+    remember_display_name(payload.guild_id, payload.member)
         
     channel = bot.get_channel(payload.channel_id)
     if not channel:
         return
-        
-    try:
-        message = await channel.fetch_message(payload.message_id)
-    except discord.NotFound:
+    if payload.user_id != bot.user.id and is_bracket_channel(payload.guild_id, channel.name) and is_throttled(payload.guild_id, payload.user_id, "reaction"):
+        # take it off again so the ballots only show reactions that were counted
+        message = await resolve_reaction_message(channel, payload.message_id)
+        if message is not None:
+            await remove_user_reaction(message, str(payload.emoji), discord.Object(id=payload.user_id), Priority.VOTING)
         return
-        
-    user = await bot.fetch_user(payload.user_id)
-    for reaction in message.reactions:
-        if str(reaction.emoji) == str(payload.emoji):
-            await handle_reaction_add(reaction, user)
-            break
+
+    if gateway_trace is not None and payload.user_id != bot.user.id:
+        gateway_trace.reaction("reaction_add", payload)
+
+    # payload.member is always present for guild reaction adds
+    user = payload.member or bot.get_user(payload.user_id) or discord.Object(id=payload.user_id)
+    with metrics.timer("gateway_event_seconds", event="reaction_add", guild=payload.guild_id):
+        await guild_actors.submit(payload.guild_id, handle_reaction_add, channel, payload.message_id, str(payload.emoji), user)
 
 @bot.event
-async def on_raw_reaction_remove(payload):
-    if payload.user_id == bot.user.id:
+async def on_raw_reaction_remove(payload: discord.RawReactionActionEvent):
+    if payload.guild_id is None or payload.user_id == bot.user.id:
         return
     
     # prevent handling bot reactions
@@ -260,138 +489,169 @@ async def on_raw_reaction_remove(payload):
             del bot_removing_reaction[key]
             return
 
+    # removals are not throttled, each one undoes a reaction that got past the throttle
     channel = bot.get_channel(payload.channel_id)
     if not channel:
         return
-    try:
-        message = await channel.fetch_message(payload.message_id)
-    except discord.NotFound:
-        return
-    user = await bot.fetch_user(payload.user_id)
-    for reaction in message.reactions:
-        if str(reaction.emoji) == str(payload.emoji):
-            await handle_reaction_remove(reaction, user)
-            break
-            W
-async def handle_reaction_add(reaction: discord.Reaction, user: discord.User):
-    if reaction.message.guild is None:
+
+    if gateway_trace is not None:
+        gateway_trace.reaction("reaction_remove", payload)
+
+    # remove events carry no member, fall back to the user cache
+    user = bot.get_user(payload.user_id) or discord.Object(id=payload.user_id)
+    with metrics.timer("gateway_event_seconds", event="reaction_remove", guild=payload.guild_id):
+        await guild_actors.submit(payload.guild_id, handle_reaction_remove, channel, payload.message_id, str(payload.emoji), user)
+
+@bot.event
+async def on_interaction(interaction: discord.Interaction):
+    # every slash command and button click, on top of their own handlers
+    if interaction.guild_id is not None:
+        remember_display_name(interaction.guild_id, interaction.user)
+
+def remember_display_name(guild_id: int, member) -> None:
+    # with the member cache on, guild.get_member already knows everyone
+    if not config.member_cache:
+        display_names.remember(guild_id, member)
+
+def is_throttled(guild_id: int, user_id: int, kind: str) -> bool:
+    """
+    Spend one of the user's tokens for this kind of event in the bracket or
+    a pool channel. Events over the rate are dropped before they are traced
+    or queued, the caller removes a dropped reaction and rejects a dropped
+    submission.
+    """
+    if user_throttle.allow(guild_id, user_id, kind):
+        return False
+    metrics.inc("throttled_events_total", event=kind)
+    log.debug("Dropped %s from %s, over the rate", kind, user_id, extra={"guild": guild_id, "event": "throttled"})
+    return True
+
+async def resolve_reaction_message(channel, message_id: int):
+    """
+    Find the message a reaction landed on without touching the REST API.
+    Tracked voting messages come from the cache (fetched once on a miss),
+    anything else becomes a PartialMessage, which is all we need to remove
+    a stray reaction.
+    """
+    guild_id = channel.guild.id
+    message = tracked_messages.get(message_id)
+    if message is None and tracked_messages.is_tracked(guild_id, message_id):
+        try:
+            message = tracked_messages.track(guild_id, await channel.fetch_message(message_id))
+        except discord.NotFound:
+            return None
+    return message or channel.get_partial_message(message_id)
+
+async def remove_user_reaction(message, emoji: str, user, priority: Priority = Priority.CLEANUP):
+    """
+    Remove a user's reaction and flag it so on_raw_reaction_remove ignores it.
+    This is usually cosmetic cleanup, so it is queued at the lowest priority
+    and may be coalesced or dropped when the outbound queue is under pressure.
+    """
+    key = f"{message.id}:{user.id}:{emoji}"
+
+    async def remove():
+        # flagged only once the removal runs, a dropped cleanup must not swallow the user's own removal
+        bot_removing_reaction[key] = True
+        try:
+            await message.remove_reaction(emoji, user)
+        except Exception:
+            bot_removing_reaction.pop(key, None)
+            raise
+
+    outbound.fire(
+        ("reaction", message.channel.id),
+        priority,
+        remove,
+        key=f"remove:{key}"
+    )
+
+def round_submission_names(guild_id: int, open_qual_round: int, guild_config) -> List[str]:
+    """
+    Every name submitted this round, across all of its pools.
+    """
+    return [
+        submission["name"]
+        for pool in qual_pools(guild_config)
+        for submission in getGuildVar(guild_id, pool.var(open_qual_round, "submissions"), [])
+    ]
+
+def is_bracket_channel(guild_id: int, channel_name: str) -> bool:
+    """
+    Whether the bot runs anything in a channel: the bracket channel or a qualification pool.
+    """
+    guild_config = get_config(guild_id)
+    return channel_name == guild_config.bracket_channel_name or find_qual_pool(guild_config, channel_name) is not None
+
+def get_pool_mode(guild_id: int, pool: QualPool, open_qual_round: int) -> Optional[str]:
+    """
+    "submissions" or "voting" for one pool, the round's mode wins until its
+    submissions open.
+    """
+    open_qual_mode = getGuildVar(guild_id, "open_qual_mode")
+    if open_qual_mode != "submissions":
+        return open_qual_mode
+    return getGuildVar(guild_id, pool.var(open_qual_round, "mode"), "submissions")
+
+def reject_message(message: discord.Message, reason: Optional[str] = None) -> None:
+    """
+    Delete a message from the bracket channel and optionally DM the author why.
+    """
+    outbound.fire(("delete", message.channel.id), Priority.VOTING, message.delete)
+    if reason is not None:
+        # the same reason still waiting to go out is sent once, e.g. for someone who keeps getting throttled
+        outbound.fire(("dm", message.author.id), Priority.VOTING, lambda: message.author.send(reason), key=f"dm:{message.author.id}:{reason}")
+
+async def handle_reaction_add(channel, message_id: int, emoji: str, user):
+    message = await resolve_reaction_message(channel, message_id)
+    if message is None or message.guild is None:
         return
-    guild_id = reaction.message.guild.id
-    bracket_channel_name = os.getenv("BRACKET_CHANNEL_NAME")
-    if reaction.message.channel.name == bracket_channel_name:
+    guild_id = message.guild.id
+    guild_config = get_config(guild_id)
+    bracket_channel_name = guild_config.bracket_channel_name
+    pool = find_qual_pool(guild_config, message.channel.name)
+    if pool is not None or message.channel.name == bracket_channel_name:
         current_stage = getGuildVar(guild_id, "stage", 0)
         match current_stage:
             case 1:
-                open_qual_mode = getGuildVar(guild_id, "open_qual_mode")
-                match open_qual_mode:
+                if pool is None:
+                    await remove_user_reaction(message, emoji, user)
+                    return
+                open_qual_round = getGuildVar(guild_id, "open_qual_round", 0)
+                match get_pool_mode(guild_id, pool, open_qual_round):
                     case "submissions":
-                        key = f"{reaction.message.id}:{user.id}:{reaction.emoji}"
-                        bot_removing_reaction[key] = True
-                        await reaction.remove(user)
+                        await remove_user_reaction(message, emoji, user)
                         return
                     case "voting":
-                        open_qual_round = getGuildVar(guild_id, "open_qual_round", 0)
-                        round_submissions: List = getGuildVar(guild_id, f"open_qual_round_{open_qual_round}_submissions", [])
-
-                        content = reaction.message.content
-                        valid = False
-                        for submission in round_submissions:
-                            name = submission["name"]
-                            # match "(number) name"
-                            pattern = rf'^\(\s*\d+\s*\)\s*{re.escape(name)}$'
-                            if re.match(pattern, content):
-                                valid = True
-                                break
-
-                        exception_messages = [
-                            "Use 👍 to add votes, Use ⭕ to clear your votes"
-                        ]
-                        if not valid and content not in exception_messages:
-                            key = f"{reaction.message.id}:{user.id}:{reaction.emoji}"
-                            bot_removing_reaction[key] = True
-                            await reaction.remove(user)
+                        # route the reaction by message id to the submission's place on the ballot,
+                        # the submission itself is looked up so votes land on the stored list
+                        ballot_index = getGuildVar(guild_id, pool.var(open_qual_round, "message_index"), {}).get(message_id)
+                        submission = None
+                        if ballot_index is not None:
+                            submission = getGuildVar(guild_id, pool.var(open_qual_round, "submissions"), [])[ballot_index]
+                        is_instruction = message_id == getGuildVar(guild_id, pool.var(open_qual_round, "instruction_message_id"))
+                        if submission is None and not is_instruction:
+                            await remove_user_reaction(message, emoji, user)
                             return
                         
                         currently_generating_voting = getGuildVar(guild_id, "currently_generating", False)
                         if not currently_generating_voting:
-                            match str(reaction.emoji):
+                            match emoji:
                                 case "👍":
-                                    user_votes_remaining = get_user_vote_count(guild_id, user.id)
-                                    if user_votes_remaining < 1:
-                                        key = f"{reaction.message.id}:{user.id}:{reaction.emoji}"
-                                        bot_removing_reaction[key] = True
-                                        await reaction.remove(user)
-                                    else:
-                                        message_content = reaction.message.content
-                                        total_message_votes = 0
-                                        m = re.match(r'^\(\s*\d+\s*\)\s*(.+)$', message_content)
-                                        if m:
-                                            submission_name = m.group(1)
-                                            # Find the submission in round_submissions
-                                            for submission in round_submissions:
-                                                if submission['name'] == submission_name:
-                                                    submission['votes'].append(user.id)
-                                                    total_message_votes = len(submission['votes'])
-                                                    break
-
-                                            # Update the submissions in the guild state
-                                            setGuildVar(
-                                                guild_id,
-                                                f"open_qual_round_{open_qual_round}_submissions",
-                                                round_submissions
-                                            )
-                                        
-                                        user_votes_remaining -= 1
-                                        print(f"{get_user_display_name(guild_id, user.id)} ({user_votes_remaining}) voted for {submission_name}", flush=True)
-                                        set_user_vote_count(guild_id, user.id, user_votes_remaining)
-
-                                        # Update message content with new total
-                                        old_content = reaction.message.content
-                                        new_content = re.sub(r'\(\s*\d+\s*\)', f'({total_message_votes})', old_content, count=1)
-                                        await reaction.message.edit(content=new_content)
-
-                                        key = f"{reaction.message.id}:{user.id}:{reaction.emoji}"
-                                        bot_removing_reaction[key] = True
-                                        await reaction.remove(user)
+                                    if submission is not None and add_submission_vote(guild_id, pool, open_qual_round, submission, user.id) is not None:
+                                        schedule_vote_count_edit(guild_id, submission, pool.channel_name)
 
+                                    await remove_user_reaction(message, emoji, user)
                                     return
                                 case "⭕":
-                                    live_submission_messages = getGuildVar(guild_id, "live_submission_messages", [])
-                                    user_votes_remaining = get_user_vote_count(guild_id, user.id)
-                                    for submission in round_submissions:
-                                        # remove all of this users votes from the submission
-                                        original_count = len(submission['votes'])
-                                        submission['votes'] = [v for v in submission['votes'] if v != user.id]
-                                        removed_count = original_count - len(submission['votes'])
-                                        if removed_count == 0:
-                                            continue
-
-                                        user_votes_remaining += removed_count
-                                        total_message_votes = len(submission['votes'])
-                                        print(f"{get_user_display_name(guild_id, user.id)} ({user_votes_remaining}) Reset", flush=True)
-                                        set_user_vote_count(guild_id, user.id, user_votes_remaining)
-                                        # update live message
-                                        for live_message in live_submission_messages:
-                                            m = re.match(r'^\(\s*\d+\s*\)\s*(.+)$', live_message.content)
-                                            if m:
-                                                raw_name = m.group(1)
-                                                if raw_name == submission['name']:
-                                                    new_content = re.sub(r'\(\s*\d+\s*\)', f'({total_message_votes})', live_message.content, count=1)
-                                                    await live_message.edit(content=new_content)
-                                                    break
-
-
-                                    key = f"{reaction.message.id}:{user.id}:{reaction.emoji}"
-                                    bot_removing_reaction[key] = True
-                                    await reaction.remove(user)
+                                    for changed_submission in clear_submission_votes(guild_id, pool, open_qual_round, user.id):
+                                        schedule_vote_count_edit(guild_id, changed_submission, pool.channel_name)
+
+                                    await remove_user_reaction(message, emoji, user)
                                 case _:
-                                    key = f"{reaction.message.id}:{user.id}:{reaction.emoji}"
-                                    bot_removing_reaction[key] = True
-                                    await reaction.remove(user)
+                                    await remove_user_reaction(message, emoji, user)
                         else:
-                            key = f"{reaction.message.id}:{user.id}:{reaction.emoji}"
-                            bot_removing_reaction[key] = True
-                            await reaction.remove(user)
+                            await remove_user_reaction(message, emoji, user)
                             return
                         
 
@@ -399,16 +659,20 @@ async def handle_reaction_add(reaction: discord.Reaction, user: discord.User):
                         return
                 return
             case 2:
+                if message.channel.name != bracket_channel_name:
+                    return
                 playoff_mode = getGuildVar(guild_id, "playoff_mode", "view")
                 if playoff_mode == "view":
                     return
                 elif playoff_mode == "voting":
+                    if get_config(guild_id).playoff_parallel:
+                        await add_round_clash_vote(guild_id, message, emoji, user)
+                        return
+
                     current_clash: ClashInfo = getGuildVar(guild_id, "current_clash")
                     # check if current_clash was properly setup
                     if not (hasattr(current_clash, "team1emoji") and hasattr(current_clash, "team2emoji")):
-                        key = f"{reaction.message.id}:{user.id}:{reaction.emoji}"
-                        bot_removing_reaction[key] = True
-                        await reaction.remove(user)
+                        await remove_user_reaction(message, emoji, user)
                         return
 
                     team1_votes = getGuildVar(guild_id, "team1_votes", [])
@@ -416,56 +680,68 @@ async def handle_reaction_add(reaction: discord.Reaction, user: discord.User):
 
                     currently_generating = getGuildVar(guild_id, "currently_generating", False)
                     if not currently_generating:
-                        match reaction.emoji:
+                        match emoji:
                             case current_clash.team1emoji:
-                                print(f"{get_user_display_name(guild_id, user.id)} voted for {current_clash.team1}", flush=True)
+                                log.info("%s voted for %s", get_user_display_name(guild_id, user.id), current_clash.team1, extra={"event": "clash_vote"})
                                 team1_votes.append(user.id)
                                 team2_votes = [uid for uid in team2_votes if uid != user.id]
 
-                                key = f"{reaction.message.id}:{user.id}:{reaction.emoji}"
+                                key = f"{message.id}:{user.id}:{emoji}"
                                 bot_removing_reaction[key] = False
-                                await reaction.message.remove_reaction(current_clash.team2emoji, user)
+                                outbound.fire(
+                                    ("reaction", message.channel.id),
+                                    Priority.VOTING,
+                                    lambda: message.remove_reaction(current_clash.team2emoji, user),
+                                    key=f"remove:{message.id}:{user.id}:{current_clash.team2emoji}"
+                                )
                             case current_clash.team2emoji:
                                 team2_votes.append(user.id)
                                 team1_votes = [uid for uid in team1_votes if uid!= user.id]
 
-                                print(f"{get_user_display_name(guild_id, user.id)} voted for {current_clash.team2}", flush=True)
-                                key = f"{reaction.message.id}:{user.id}:{reaction.emoji}"
+                                log.info("%s voted for %s", get_user_display_name(guild_id, user.id), current_clash.team2, extra={"event": "clash_vote"})
+                                key = f"{message.id}:{user.id}:{emoji}"
                                 bot_removing_reaction[key] = False
-                                await reaction.message.remove_reaction(current_clash.team1emoji, user)
+                                outbound.fire(
+                                    ("reaction", message.channel.id),
+                                    Priority.VOTING,
+                                    lambda: message.remove_reaction(current_clash.team1emoji, user),
+                                    key=f"remove:{message.id}:{user.id}:{current_clash.team1emoji}"
+                                )
 
                         setGuildVar(guild_id, "team1_votes", team1_votes)
                         setGuildVar(guild_id, "team2_votes", team2_votes)
                         await process_stage(guild_id)
                     else:
-                        key = f"{reaction.message.id}:{user.id}:{reaction.emoji}"
-                        bot_removing_reaction[key] = True
-                        await reaction.remove(user)
+                        await remove_user_reaction(message, emoji, user)
 
                 return
             
-async def handle_reaction_remove(reaction: discord.Reaction, user: discord.User):
-    if user.bot or reaction.message.guild is None:
+async def handle_reaction_remove(channel, message_id: int, emoji: str, user):
+    if getattr(user, "bot", False) or channel.guild is None:
         return
     
-    guild_id = reaction.message.guild.id
-    bracket_channel_name = os.getenv("BRACKET_CHANNEL_NAME")
-    if reaction.message.channel.name == bracket_channel_name:
+    guild_id = channel.guild.id
+    bracket_channel_name = get_config(guild_id).bracket_channel_name
+    if channel.name == bracket_channel_name:
         current_stage = getGuildVar(guild_id, "stage", 0)
         match current_stage:
             case 2:
                 playoff_mode = getGuildVar(guild_id, "playoff_mode", "view")
                 if playoff_mode == "voting":
+                    if get_config(guild_id).playoff_parallel:
+                        remove_round_clash_vote(guild_id, message_id, emoji, user)
+                        return
+
                     current_clash: ClashInfo = getGuildVar(guild_id, "current_clash")
                     # check if current_clash was properly setup
                     if not (hasattr(current_clash, "team1emoji") and hasattr(current_clash, "team2emoji")):
-                        print("Current clash not properly setup on add", flush=True)
+                        log.warning("Current clash not properly setup on add", extra={"event": "reaction_add"})
                         return
 
                     team1_votes = getGuildVar(guild_id, "team1_votes", [])
                     team2_votes = getGuildVar(guild_id, "team2_votes", [])
 
-                    match reaction.emoji:
+                    match emoji:
                         case current_clash.team1emoji:
                             team1_votes = [uid for uid in team1_votes if uid != user.id]
                         case current_clash.team2emoji:
@@ -475,17 +751,377 @@ async def handle_reaction_remove(reaction: discord.Reaction, user: discord.User)
                     setGuildVar(guild_id, "team2_votes", team2_votes)
                     await process_stage(guild_id)
 
+async def add_round_clash_vote(guild_id: int, message, emoji: str, user) -> None:
+    """
+    A vote on one of the round's VS messages in parallel playoffs. Each
+    message has its own emoji pair and tally, switching sides removes the
+    user's other reaction.
+    """
+    clash: Optional[ClashInfo] = getGuildVar(guild_id, "round_clashes", {}).get(message.id)
+    if clash is None or getGuildVar(guild_id, "currently_generating", False) or emoji not in (clash.team1emoji, clash.team2emoji):
+        await remove_user_reaction(message, emoji, user)
+        return
+
+    round_votes = getGuildVar(guild_id, "round_votes", {})
+    team1_votes, team2_votes = round_votes[message.id]
+    if emoji == clash.team1emoji:
+        team, votes, other_votes, other_emoji = clash.team1, team1_votes, team2_votes, clash.team2emoji
+    else:
+        team, votes, other_votes, other_emoji = clash.team2, team2_votes, team1_votes, clash.team1emoji
+
+    log.info("%s voted for %s", get_user_display_name(guild_id, user.id), team, extra={"event": "clash_vote"})
+    if user.id not in votes:
+        votes.append(user.id)
+    if user.id in other_votes:
+        other_votes.remove(user.id)
+        outbound.fire(
+            ("reaction", message.channel.id),
+            Priority.VOTING,
+            lambda: message.remove_reaction(other_emoji, user),
+            key=f"remove:{message.id}:{user.id}:{other_emoji}"
+        )
+    setGuildVar(guild_id, "round_votes", round_votes)
+
+def remove_round_clash_vote(guild_id: int, message_id: int, emoji: str, user) -> None:
+    clash: Optional[ClashInfo] = getGuildVar(guild_id, "round_clashes", {}).get(message_id)
+    if clash is None:
+        return
+
+    round_votes = getGuildVar(guild_id, "round_votes", {})
+    team1_votes, team2_votes = round_votes[message_id]
+    votes = team1_votes if emoji == clash.team1emoji else team2_votes if emoji == clash.team2emoji else []
+    if user.id in votes:
+        votes.remove(user.id)
+        setGuildVar(guild_id, "round_votes", round_votes)
+
+async def post_ballots(guild_id: int, pool: QualPool, open_qual_round: int, round_submissions: List):
+    """
+    Post the round's submissions as button ballots. Buttons remember the
+    submission name, so votes still land correctly if the list gets re-sorted.
+    """
+    names = [submission["name"] for submission in round_submissions]
+
+    async def on_vote(interaction: discord.Interaction, index: int):
+        await submit_ballot_click(interaction, handle_ballot_vote, pool, open_qual_round, names[index])
+
+    async def on_clear(interaction: discord.Interaction):
+        await submit_ballot_click(interaction, handle_ballot_clear, pool, open_qual_round)
+
+    views = build_ballots(pool.ballot_prefix(guild_id, open_qual_round), names, on_vote, on_clear)
+    for idx, view in enumerate(views):
+        await send_channel_message(guild_id, pool.channel_name, f"Ballot {idx + 1}/{len(views)}", Priority.VOTING, view=view)
+
+def is_ballot_open(guild_id: int, pool: QualPool, open_qual_round: int) -> bool:
+    return (
+        getGuildVar(guild_id, "stage", 0) == 1
+        and getGuildVar(guild_id, "open_qual_round", 0) == open_qual_round
+        and getGuildVar(guild_id, pool.var(open_qual_round, "mode")) == "voting"
+    )
+
+async def submit_ballot_click(interaction: discord.Interaction, handler, *args, edit: bool = False):
+    """
+    Acknowledge a ballot button right away, run its handler on the guild's
+    mailbox and answer the click outside of it, like submit_command does for
+    slash commands. Handlers return (content, view), `edit` replaces the
+    clicked ephemeral message instead of sending a new one.
+    """
+    if gateway_trace is not None:
+        gateway_trace.button(interaction, interaction.data.get("custom_id"))
+    await interaction.response.defer(ephemeral=True, thinking=False)
+    content, view = await guild_actors.submit(interaction.guild_id, handler, interaction, *args)
+    if edit:
+        await interaction.edit_original_response(content=content, view=view)
+    elif view is None:
+        await interaction.followup.send(content, ephemeral=True)
+    else:
+        await interaction.followup.send(content, view=view, ephemeral=True)
+
+async def handle_ballot_vote(interaction: discord.Interaction, pool: QualPool, open_qual_round: int, name: str) -> tuple[str, None]:
+    guild_id = interaction.guild_id
+    if not is_ballot_open(guild_id, pool, open_qual_round):
+        return "This ballot is closed.", None
+
+    round_submissions: List = getGuildVar(guild_id, pool.var(open_qual_round, "submissions"), [])
+    submission = next((sub for sub in round_submissions if sub["name"] == name), None)
+    if submission is None:
+        return "That name is no longer on the ballot.", None
+
+    user_votes_remaining = add_submission_vote(guild_id, pool, open_qual_round, submission, interaction.user.id)
+    if user_votes_remaining is None:
+        return "You're out of votes. Use ⭕ to clear your votes and vote again.", None
+
+    await process_stage(guild_id)
+    return f"Voted for **{name}**. You have {user_votes_remaining} vote(s) left.", None
+
+async def handle_ballot_clear(interaction: discord.Interaction, pool: QualPool, open_qual_round: int) -> tuple[str, None]:
+    guild_id = interaction.guild_id
+    if not is_ballot_open(guild_id, pool, open_qual_round):
+        return "This ballot is closed.", None
+
+    clear_submission_votes(guild_id, pool, open_qual_round, interaction.user.id)
+    await process_stage(guild_id)
+    return f"Your votes were cleared. You have {get_vote_budget(guild_id).remaining(interaction.user.id)} vote(s) left.", None
+
+async def process_pool_submissions(guild_id: int, open_qual_round: int, pool: QualPool, pool_count: int, quota: int) -> bool:
+    """
+    Run the submissions phase of one pool: open its channel, cap the entries
+    and, once full, close it and post its ballot. Returns True while the pool
+    is still collecting.
+    """
+    guild_config = get_config(guild_id)
+    max_submissions = guild_config.open_qual_max_round_submissions
+    total_rounds = guild_config.open_qual_rounds
+    user_votes_per_round = guild_config.open_qual_max_votes
+    channel_name = pool.channel_name
+    label = pool.label(pool_count)
+
+    round_submissions: List = getGuildVar(guild_id, pool.var(open_qual_round, "submissions"), [])
+
+    # New round just started
+    if len(round_submissions) == 0 and await is_submission_open(bot.get_guild(guild_id), channel_name) == False:
+        setGuildVar(guild_id, "requires_confirmation", True)
+        await open_submissions(bot.get_guild(guild_id), channel_name)
+        await send_channel_message(guild_id, channel_name ,f"Submissions Open! {open_qual_round}/{total_rounds}{label}")
+        await send_channel_message(guild_id, channel_name, f"We'll accept a total of {max_submissions} names... Go!")
+        return False
+    if len(round_submissions) < max_submissions:
+        return True
+
+    # if submissions are above max we must stop further processing
+    prevent_processing = False
+    while len(round_submissions) > max_submissions:
+        round_submissions.pop()
+        prevent_processing = True
+    if prevent_processing:
+        setGuildVar(guild_id, pool.var(open_qual_round, "submissions"), round_submissions)
+        return False
+
+    currently_generating = getGuildVar(guild_id, "currently_generating", False)
+    if currently_generating:
+        return False
+    setGuildVar(guild_id, "currently_generating", True)
+    await close_submissions(bot.get_guild(guild_id), channel_name)
+    setGuildVar(guild_id, pool.var(open_qual_round, "mode"), "voting")
+    # the standings follow every vote from here on, the ballot is fixed
+    setGuildVar(guild_id, pool.var(open_qual_round, "leaderboard"), Leaderboard([submission["name"] for submission in round_submissions]))
+    await send_channel_message(guild_id, channel_name ,f"Submissions closed...")
+    await send_channel_message(guild_id, channel_name, f"Each person gets {user_votes_per_round} votes")
+    await send_channel_message(guild_id, channel_name, f"The top {quota} most voted names qualify for playoffs 😎")
+
+    # the first pool to vote starts the round's vote budget, the pools share it
+    if getGuildVar(guild_id, "open_qual_voting_round", 0) != open_qual_round:
+        setGuildVar(guild_id, "open_qual_voting_round", open_qual_round)
+        clear_user_votes(guild_id)
+
+        # only this round's messages are worth resolving reactions for
+        tracked_messages.forget_guild(guild_id)
+
+    if guild_config.open_qual_ballot_mode == "matchups":
+        # one message, every voter gets their own head-to-head picks
+        await send_channel_message(guild_id, channel_name, f"Click 🗳️ Vote to pick between two names at a time, Use ⭕ to clear your votes")
+        await post_matchup_ballot(guild_id, pool, open_qual_round, round_submissions)
+    elif guild_config.open_qual_ballot_mode == "buttons":
+        # a handful of button grids, each vote is a single interaction
+        await send_channel_message(guild_id, channel_name, f"Click a name to add a vote, Use ⭕ to clear your votes")
+        await post_ballots(guild_id, pool, open_qual_round, round_submissions)
+    else:
+        instruction_message = await send_channel_message(guild_id, channel_name ,f"Use 👍 to add votes, Use ⭕ to clear your votes")
+        await add_reaction(instruction_message, "⭕")
+        tracked_messages.track(guild_id, instruction_message)
+        setGuildVar(guild_id, pool.var(open_qual_round, "instruction_message_id"), instruction_message.id)
+
+        # Execute all message sending tasks in parallel
+        live_submission_messages = await asyncio.gather(*(
+            send_channel_message(guild_id, channel_name, f"(0) {submission['name']}", Priority.VOTING)
+            for submission in round_submissions
+        ))
+
+        # index the posted messages by ballot position so reactions route with one lookup
+        message_index = {}
+        for ballot_index, (submission, message) in enumerate(zip(round_submissions, live_submission_messages)):
+            if message is None:
+                continue
+            submission["message_id"] = message.id
+            message_index[message.id] = ballot_index
+            tracked_messages.track(guild_id, message)
+        setGuildVar(guild_id, pool.var(open_qual_round, "submissions"), round_submissions)
+        setGuildVar(guild_id, pool.var(open_qual_round, "message_index"), message_index)
+
+        # Now add reactions to all messages
+        await asyncio.gather(*(add_reaction(message, "👍") for message in live_submission_messages))
+
+    # Bot can vote too !
+    bot_is_playing = guild_config.bot_is_playing
+    if bot_is_playing and getGuildVar(guild_id, "bot_is_playing", False) == False:
+        setGuildVar(guild_id, "bot_is_playing", True)
+        bot_votes = guild_config.bot_votes
+        # Randomly select submissions to vote on until bot_votes is reached
+        if round_submissions and bot_votes > 0:
+            random_indexes = [random.randrange(len(round_submissions)) for _ in range(bot_votes)]
+            log.info("Bot is voting on %d submissions", len(random_indexes), extra={"event": "bot_vote"})
+            ranking = getGuildVar(guild_id, pool.var(open_qual_round, "matchups"))
+            leaderboard = get_leaderboard(guild_id, pool, open_qual_round)
+
+            for index in random_indexes:
+                # Add bot's vote
+                submission = round_submissions[index]
+                submission['votes'].append(bot.user.id)
+                leaderboard.add(submission["name"])
+                if ranking is not None and len(round_submissions) > 1:
+                    # the bot's pick beats some other name
+                    ranking.record(bot.user.id, index, (index + random.randrange(1, len(round_submissions))) % len(round_submissions))
+
+                # reaction ballots show a live counter
+                schedule_vote_count_edit(guild_id, submission, channel_name)
+                log.info("Bot voted for: %s", submission["name"], extra={"event": "bot_vote"})
+
+            # Update the submissions in the guild state
+            setGuildVar(guild_id, pool.var(open_qual_round, "submissions"), round_submissions)
+            setGuildVar(guild_id, pool.var(open_qual_round, "leaderboard"), leaderboard)
+            if ranking is not None:
+                setGuildVar(guild_id, pool.var(open_qual_round, "matchups"), ranking)
+
+        setGuildVar(guild_id, "bot_is_playing", False)
+
+    setGuildVar(guild_id, "currently_generating", False)
+    return False
+
+async def collect_submissions(guild_id: int, channel_name: str) -> None:
+    """
+    Event processing while submissions are open, the bot chimes in every
+    few messages when it is playing.
+    """
+    bot_is_playing = get_config(guild_id).bot_is_playing
+    setGuildVar(guild_id, "confirm_message", "Still collecting submissions..." + ("(spam to trigger bot submissions)" if bot_is_playing else ""))
+    setGuildVar(guild_id, "requires_confirmation", True)
+    if bot_is_playing and getGuildVar(guild_id, "bot_is_playing", False) == False:
+        msg_freq = get_config(guild_id).bot_submission_frequency
+        amt_msgs_since_last_bot_sub = getGuildVar(guild_id, "amt_msgs_since_last_bot_sub", 0)
+        amt_msgs_since_last_bot_sub += 1
+        if amt_msgs_since_last_bot_sub >= msg_freq:
+            setGuildVar(guild_id, "bot_is_playing", True)
+            amt_msgs_since_last_bot_sub = 0
+            log.info("Sending bot message...", extra={"event": "bot_submission"})
+            await send_channel_message(guild_id, channel_name, get_name_submission())
+            setGuildVar(guild_id, "bot_is_playing", False)
+        setGuildVar(guild_id, "amt_msgs_since_last_bot_sub", amt_msgs_since_last_bot_sub)
+
+def qualifier_list(submissions: List[dict]) -> str:
+    message = ""
+    for idx, submission in enumerate(submissions):
+        message += f"**{submission['name']}**"
+        if idx + 1 < len(submissions) - 1:
+            message += ", "
+        elif idx + 1 == len(submissions) - 1:
+            message += " and "
+    return message
+
+async def post_matchup_ballot(guild_id: int, pool: QualPool, open_qual_round: int, round_submissions: List):
+    """
+    Post the single message of a matchups ballot and start the pool's
+    pairwise ranking. Each voter gets two names at a time, privately.
+    """
+    from ranking import PairwiseRanking
+
+    setGuildVar(guild_id, pool.var(open_qual_round, "matchups"), PairwiseRanking(submission["name"] for submission in round_submissions))
+
+    async def on_start(interaction: discord.Interaction):
+        await submit_ballot_click(interaction, handle_matchup_start, pool, open_qual_round)
+
+    async def on_clear(interaction: discord.Interaction):
+        await submit_ballot_click(interaction, handle_ballot_clear, pool, open_qual_round)
+
+    view = MatchupStartView(pool.ballot_prefix(guild_id, open_qual_round), on_start, on_clear)
+    await send_channel_message(guild_id, pool.channel_name, f"{len(round_submissions)} names on the ballot", Priority.VOTING, view=view)
+
+def matchup_prompt(guild_id: int, pool: QualPool, open_qual_round: int, user_id: int) -> tuple[str, Optional[discord.ui.View]]:
+    """
+    The next matchup for a user, or why there is none.
+    """
+    ranking = getGuildVar(guild_id, pool.var(open_qual_round, "matchups"))
+    if ranking is None or len(ranking.names) < 2:
+        return "There is nothing to compare in this round.", None
+    user_votes_remaining = get_vote_budget(guild_id).remaining(user_id)
+    if user_votes_remaining < 1:
+        return "You're out of votes. Use ⭕ to clear your votes and vote again.", None
+
+    prefix = pool.ballot_prefix(guild_id, open_qual_round)
+    first, second = ranking.next_pair(f"{prefix}:{user_id}:{len(ranking)}")
+
+    async def on_pick(interaction: discord.Interaction, winner: int, loser: int):
+        await submit_ballot_click(interaction, handle_matchup_pick, pool, open_qual_round, winner, loser, edit=True)
+
+    view = MatchupView(prefix, (first, ranking.names[first]), (second, ranking.names[second]), on_pick)
+    return f"Which name is better? You have {user_votes_remaining} vote(s) left.", view
+
+async def handle_matchup_start(interaction: discord.Interaction, pool: QualPool, open_qual_round: int) -> tuple[str, Optional[discord.ui.View]]:
+    guild_id = interaction.guild_id
+    if not is_ballot_open(guild_id, pool, open_qual_round):
+        return "This ballot is closed.", None
+    return matchup_prompt(guild_id, pool, open_qual_round, interaction.user.id)
+
+async def handle_matchup_pick(interaction: discord.Interaction, pool: QualPool, open_qual_round: int, winner: int, loser: int) -> tuple[str, Optional[discord.ui.View]]:
+    guild_id = interaction.guild_id
+    if not is_ballot_open(guild_id, pool, open_qual_round):
+        return "This ballot is closed.", None
+
+    ranking = getGuildVar(guild_id, pool.var(open_qual_round, "matchups"))
+    round_submissions: List = getGuildVar(guild_id, pool.var(open_qual_round, "submissions"), [])
+    name = ranking.names[winner] if ranking is not None and winner < len(ranking.names) and loser < len(ranking.names) else None
+    submission = next((sub for sub in round_submissions if sub["name"] == name), None)
+    if submission is None:
+        return "That name is no longer on the ballot.", None
+
+    if add_submission_vote(guild_id, pool, open_qual_round, submission, interaction.user.id) is not None:
+        ranking.record(interaction.user.id, winner, loser)
+        setGuildVar(guild_id, pool.var(open_qual_round, "matchups"), ranking)
+
+    await process_stage(guild_id)
+    return matchup_prompt(guild_id, pool, open_qual_round, interaction.user.id)
+
+async def score_matchups(guild_id: int, pool: QualPool, open_qual_round: int, round_submissions: List) -> None:
+    """
+    Fit the pool's picks and store each submission's strength as its score.
+    The fit runs off the event loop, large pools take a moment.
+    """
+    ranking = getGuildVar(guild_id, pool.var(open_qual_round, "matchups"))
+    if ranking is None:
+        return
+    with metrics.timer("ranking_fit_seconds", guild=guild_id):
+        strengths = await asyncio.to_thread(ranking.fit)
+    scores = dict(zip(ranking.names, strengths.tolist()))
+    for submission in round_submissions:
+        submission["score"] = scores.get(submission["name"], 0.0)
+    setGuildVar(guild_id, pool.var(open_qual_round, "submissions"), round_submissions)
+    log.info("Ranked %d names from %d picks", len(ranking.names), len(ranking), extra={"event": "qual_ranking"})
+
+def qual_score(submission: dict) -> float:
+    """
+    What qualification ranks by: the fitted strength on matchups ballots,
+    the vote count everywhere else.
+    """
+    return submission.get("score", len(submission["votes"]))
+
+def stage_labels(guild_id: int) -> dict:
+    stage = getGuildVar(guild_id, "stage", 0)
+    if stage == 1:
+        mode = getGuildVar(guild_id, "open_qual_mode", "submissions")
+    elif stage == 2:
+        mode = getGuildVar(guild_id, "playoff_mode", "view")
+    else:
+        mode = "idle"
+    return {"guild": guild_id, "stage": stage, "mode": mode}
+
+@metrics.timed("process_stage_seconds", stage_labels)
 async def process_stage(guild_id: int):
     current_stage = getGuildVar(guild_id, "stage", 0)
-    bracket_channel_name = os.getenv("BRACKET_CHANNEL_NAME")
+    guild_config = get_config(guild_id)
+    bracket_channel_name = guild_config.bracket_channel_name
     
     match current_stage:
         case 1:
-            # validate env settings
-            max_submissions = int(os.getenv("OPEN_QUAL_MAX_ROUND_SUBMISSONS"))
-            total_rounds = int(os.getenv("OPEN_QUAL_ROUNDS"))
-            total_qual_spots = int(os.getenv("OPEN_QUAL_PASSTHRU_SUBMISSIONS"))
-            user_votes_per_round = os.getenv("OPEN_QUAL_MAX_VOTES", 3)
+            total_rounds = guild_config.open_qual_rounds
+            total_qual_spots = guild_config.open_qual_passthru_submissions
 
             # Beging processing
             open_qual_round = getGuildVar(guild_id, "open_qual_round", 0)
@@ -500,138 +1136,46 @@ async def process_stage(guild_id: int):
 
             total_remaining_qual_spots = total_qual_spots - len(qualified_submissions)
             round_qual_spots = math.floor(total_remaining_qual_spots / (total_rounds - (open_qual_round - 1)))
-            
-            round_submissions: List = getGuildVar(guild_id, f"open_qual_round_{open_qual_round}_submissions", [])
-            if open_qual_mode == "submissions":
 
-                # New round just started
-                if len(round_submissions) == 0 and await is_submission_open(bot.get_guild(guild_id), bracket_channel_name) == False:
-                    setGuildVar(guild_id, "requires_confirmation", True)
-                    await open_submissions(bot.get_guild(guild_id), bracket_channel_name)
-                    await send_channel_message(guild_id, bracket_channel_name ,f"Submissions Open! {open_qual_round}/{total_rounds}")
-                    await send_channel_message(guild_id, bracket_channel_name, f"We'll accept a total of {max_submissions} names... Go!")
-                elif len(round_submissions) >= max_submissions:
-                    # if submissions are above max we must stop further processing
-                    prevent_processing = False
-                    while len(round_submissions) > max_submissions:
-                        round_submissions.pop()
-                        prevent_processing = True
-                    if prevent_processing:
-                        return
-                    
-                    currently_generating = getGuildVar(guild_id, "currently_generating", False)
-                    if not currently_generating:
-                        currently_generating = True
-                        setGuildVar(guild_id, "currently_generating", currently_generating)
-                        await close_submissions(bot.get_guild(guild_id), bracket_channel_name)
-                        open_qual_mode = "voting"
-                        await send_channel_message(guild_id, bracket_channel_name ,f"Submissions closed...")
-                        await send_channel_message(guild_id, bracket_channel_name, f"Each person gets {user_votes_per_round} votes")
-                        await send_channel_message(guild_id, bracket_channel_name, f"The top {round_qual_spots} most voted names qualify for playoffs 😎")
-                        instruction_message = await send_channel_message(guild_id, bracket_channel_name ,f"Use 👍 to add votes, Use ⭕ to clear your votes")
-                        await instruction_message.add_reaction("⭕")
-                        clear_user_votes(guild_id)
-
-                        live_submission_messages = []
-                        # Prepare all message sending tasks
-                        message_tasks = []
-                        for submission in round_submissions:
-                            message_tasks.append(send_channel_message(guild_id, bracket_channel_name, f"(0) {submission['name']}"))
-                        
-                        # Execute all message sending tasks in parallel
-                        messages = await asyncio.gather(*message_tasks)
-                        live_submission_messages.extend(messages)
-                        
-                        # Now add reactions to all messages
-                        reaction_tasks = []
-                        for message in live_submission_messages:
-                            reaction_tasks.append(message.add_reaction("👍"))
-                        
-                        # Wait for all reactions to be added
-                        await asyncio.gather(*reaction_tasks)
-                        
-                        # Store the messages for later reference
-                        setGuildVar(guild_id, f"live_submission_messages", live_submission_messages)
-
-                        # Bot can vote too !    
-                        bot_is_playing = os.getenv("BOT_IS_PLAYING", "false").lower() == "true"
-                        if bot_is_playing and getGuildVar(guild_id, "bot_is_playing", False) == False:
-                            setGuildVar(guild_id, "bot_is_playing", True)
-                            bot_votes = int(os.getenv("BOT_VOTES", 1))
-                            # Randomly select messages to vote on until bot_votes is reached
-                            if live_submission_messages and bot_votes > 0:
-                                random_messages = [random.choice(live_submission_messages) for _ in range(bot_votes)]
-                                print(f"Bot is voting on {len(random_messages)} submissions", flush=True)
-                                
-                                # Add reactions to the randomly selected messages
-                                for message in random_messages:
-                                    # Now manually process the vote logic (similar to handle_reaction_add)
-                                    message_content = message.content
-                                    total_message_votes = 0
-                                    m = re.match(r'^\(\s*\d+\s*\)\s*(.+)$', message_content)
-                                    
-                                    if m:
-                                        submission_name = m.group(1)
-                                        for submission in round_submissions:
-                                            if submission['name'] == submission_name:
-                                                # Add bot's vote
-                                                submission['votes'].append(bot.user.id)
-                                                total_message_votes = len(submission['votes'])
-                                                break
-                                        
-                                        # Update the submissions in the guild state
-                                        setGuildVar(
-                                            guild_id,
-                                            f"open_qual_round_{open_qual_round}_submissions",
-                                            round_submissions
-                                        )
-                                    
-                                        # Update message content with new vote count
-                                        new_content = re.sub(r'\(\s*\d+\s*\)', f'({total_message_votes})', message_content, count=1)
-                                        await message.edit(content=new_content)
-                                        print(f"Bot voted for: {submission_name}", flush=True)
-                            
-                            setGuildVar(guild_id, "bot_is_playing", False)
-
-                        setGuildVar(guild_id, f"live_submission_messages", live_submission_messages)
-                        currently_generating = False
-                        setGuildVar(guild_id, "currently_generating", currently_generating)
-                else:
-                    # event processing lands here
-                    bot_is_playing = os.getenv("BOT_IS_PLAYING", "false").lower() == "true"
-                    setGuildVar(guild_id, "confirm_message", "Still collecting submissions..." + ("(spam to trigger bot submissions)" if bot_is_playing else ""))
-                    setGuildVar(guild_id, "requires_confirmation", True)
-                    if bot_is_playing and getGuildVar(guild_id, "bot_is_playing", False) == False:
-                        msg_freq = int(os.getenv("BOT_SUBMISSION_FREQUENCY", 3))
-                        amt_msgs_since_last_bot_sub = getGuildVar(guild_id, "amt_msgs_since_last_bot_sub", 0)
-                        amt_msgs_since_last_bot_sub += 1
-                        if amt_msgs_since_last_bot_sub >= msg_freq:
-                            setGuildVar(guild_id, "bot_is_playing", True)
-                            amt_msgs_since_last_bot_sub = 0
-                            print("Sending bot message...", flush=True)
-                            await send_channel_message(guild_id, bracket_channel_name, get_name_submission())
-                            setGuildVar(guild_id, "bot_is_playing", False)
-                        setGuildVar(guild_id, "amt_msgs_since_last_bot_sub", amt_msgs_since_last_bot_sub)
+            # every pool runs the round at the same time with its own share of the spots
+            pools = qual_pools(guild_config)
+            quotas = pool_quotas(round_qual_spots, len(pools))
+
+            if open_qual_mode == "submissions":
+                collecting = []
+                for pool, quota in zip(pools, quotas):
+                    if getGuildVar(guild_id, pool.var(open_qual_round, "mode"), "submissions") == "submissions":
+                        if await process_pool_submissions(guild_id, open_qual_round, pool, len(pools), quota):
+                            collecting.append(pool)
+                if collecting:
+                    # bot submissions go where they are needed most
+                    emptiest = min(collecting, key=lambda pool: len(getGuildVar(guild_id, pool.var(open_qual_round, "submissions"), [])))
+                    await collect_submissions(guild_id, emptiest.channel_name)
+                # the round is voting once every pool closed its submissions
+                if all(getGuildVar(guild_id, pool.var(open_qual_round, "mode"), "submissions") == "voting" for pool in pools):
+                    open_qual_mode = "voting"
             elif open_qual_mode == "voting":
-                start_count = round_qual_spots - 1
-                stop_count = min(round_qual_spots + 1, len(round_submissions))
                 # Admin must confirm round submission
                 if getGuildVar(guild_id, "requires_confirmation") == False:
                     setGuildVar(guild_id, "requires_confirmation", True)
-                    # sort by most votes
-                    round_submissions.sort(key=lambda x: len(x["votes"]), reverse=True)
-                    force_tie_breaker = os.getenv("OPEN_QUAL_FORCE_TIE_BREAKER", "false").lower() == "true"
-                    if force_tie_breaker:
-                        top_submissions = round_submissions[start_count:stop_count]
-                        for submission in top_submissions:
-                            for sub_submission in top_submissions:
-                                if sub_submission["name"] != submission["name"]:
-                                    if len(sub_submission["votes"]) == len(submission["votes"]):
-                                        setGuildVar(guild_id, "confirm_message", "Break the Tie!")
-                                        return
+                    # make sure the posted counters show the final tally before closing
+                    await vote_edits.flush(guild_id)
+                    pool_qual_submissions = []
+                    for pool, quota in zip(pools, quotas):
+                        round_submissions: List = getGuildVar(guild_id, pool.var(open_qual_round, "submissions"), [])
+                        leaderboard = get_leaderboard(guild_id, pool, open_qual_round)
+                        if guild_config.open_qual_ballot_mode == "matchups":
+                            await score_matchups(guild_id, pool, open_qual_round, round_submissions)
+                            leaderboard.reset([qual_score(submission) for submission in round_submissions])
+                            setGuildVar(guild_id, pool.var(open_qual_round, "leaderboard"), leaderboard)
+                        # the last spot must not tie with the first name left out
+                        if guild_config.open_qual_force_tie_breaker and leaderboard.tied_at(quota):
+                            setGuildVar(guild_id, "confirm_message", "Break the Tie!" + pool.label(len(pools)))
+                            return
+                        pool_qual_submissions.append((pool, [round_submissions[index] for index in leaderboard.top(quota)]))
 
                     # round confirmed
-                    round_qual_submissions = round_submissions[:round_qual_spots]
+                    round_qual_submissions = [submission for pool, submissions in pool_qual_submissions for submission in submissions]
                     open_qual_round += 1
                     open_qual_mode = "submissions"
                     qualified_submissions = getGuildVar(guild_id, "qualified_submissions", [])
@@ -640,16 +1184,13 @@ async def process_stage(guild_id: int):
                     setGuildVar(guild_id, "open_qual_round", open_qual_round)
                     setGuildVar(guild_id, "open_qual_mode", open_qual_mode)
 
-                    message = ""
-                    for idx, submission in enumerate(round_qual_submissions):
-                        message += f"**{submission['name']}**"
-                        if idx + 1 < len(round_qual_submissions) - 1:
-                            message += ", "
-                        elif idx + 1 == len(round_qual_submissions) - 1:
-                            message += " and "
-
+                    # each pool hears its own qualifiers, the bracket channel all of them
+                    if len(pools) > 1:
+                        for pool, submissions in pool_qual_submissions:
+                            if len(submissions) > 0:
+                                await send_channel_message(guild_id, pool.channel_name, qualifier_list(submissions) + " are moving on!")
                     if len(round_qual_submissions) > 0:
-                        await send_channel_message(guild_id, bracket_channel_name, message + " are moving on!")
+                        await send_channel_message(guild_id, bracket_channel_name, qualifier_list(round_qual_submissions) + " are moving on!")
 
                     # stage cofirmed
                     if len(qualified_submissions) == total_qual_spots:
@@ -665,7 +1206,7 @@ async def process_stage(guild_id: int):
             playoff_mode = getGuildVar(guild_id, "playoff_mode", "view")
 
             if playoff_mode == "view":
-                bracket: Bracket = getGuildVar(guild_id, "bracket", None)
+                bracket = load_bracket(guild_id)
 
                 # initialize bracket for first time
                 if bracket is None:
@@ -673,17 +1214,19 @@ async def process_stage(guild_id: int):
                     bracket = Bracket()
                     qualified_submissions = getGuildVar(guild_id, "qualified_submissions", [])
                     for submission in qualified_submissions:
-                        bracket.add_name(submission["name"], len(submission["votes"]))
-                        # reset for playoffs
-                        submission["votes"] = []
+                        # seeded by what qualified them, the fitted strength on matchups ballots
+                        bracket.add_name(submission["name"], qual_score(submission))
+                    # reset for playoffs, the round submissions keep their qualification votes
+                    setGuildVar(guild_id, "qualified_submissions", [{**submission, "votes": []} for submission in qualified_submissions])
 
                     bracket.finalize()
-                    setGuildVar(guild_id, "bracket", bracket)
+                    save_bracket(guild_id, bracket)
 
-                view_message = getGuildVar(guild_id, "view_message", f"The Top {len(bracket._bracket.rounds[bracket.rounds - 1]) * 2} is here!")
+                view_message = getGuildVar(guild_id, "view_message", f"The Top {bracket.round_size()} is here!")
 
                 # generate standings
-                image_path = bracket.generate_standings(guild_id)
+                with metrics.timer("render_seconds", guild=guild_id, kind="standings"):
+                    image_path = bracket.generate_standings(guild_id)
                 await send_channel_image(guild_id, 
                                          bracket_channel_name,
                                          image_path,
@@ -697,7 +1240,10 @@ async def process_stage(guild_id: int):
                 # Admin must confirm match submission
                 if getGuildVar(guild_id, "requires_confirmation") == False:
                     setGuildVar(guild_id, "requires_confirmation", True)
-                    bracket: Bracket = getGuildVar(guild_id, "bracket")
+                    bracket = load_bracket(guild_id)
+                    if guild_config.playoff_parallel and bracket.get_winner() is None:
+                        await process_parallel_round(guild_id, bracket, bracket_channel_name)
+                        return
                     current_clash: ClashInfo = getGuildVar(guild_id, "current_clash")
 
                     currently_generating = getGuildVar(guild_id, "currently_generating", False)
@@ -714,10 +1260,12 @@ async def process_stage(guild_id: int):
                         # send the VS line
                         vs_text = f"**{current_clash.team1}** {emoji1} VS **{current_clash.team2}** {emoji2}"
                         msg = await send_channel_message(guild_id, bracket_channel_name, vs_text)
+                        tracked_messages.forget_guild(guild_id)
+                        tracked_messages.track(guild_id, msg)
 
                         # add the reactions for voting
-                        await msg.add_reaction(emoji1)
-                        await msg.add_reaction(emoji2)
+                        await add_reaction(msg, emoji1)
+                        await add_reaction(msg, emoji2)
 
                         currently_generating = False
                         setGuildVar(guild_id, "currently_generating", currently_generating)
@@ -736,6 +1284,7 @@ async def process_stage(guild_id: int):
                             else:
                                 bracket.submit_winner(current_clash.team2, len(team2_votes), len(team1_votes))
                                 message = f"**{current_clash.team2}** is moving on!"
+                            save_bracket(guild_id, bracket)
 
                             current_clash = None
                             if bracket.get_winner() is not None:
@@ -757,13 +1306,14 @@ async def process_stage(guild_id: int):
                             setGuildVar(guild_id, "confirm_message", "We need a tiebreaker vote...")
                     else:
                         memes_posted = getGuildVar(guild_id, "memes_posted", 0)
-                        bracket: Bracket = getGuildVar(guild_id, "bracket")
+                        bracket = load_bracket(guild_id)
                         img_path = ""
-                        match memes_posted:
-                            case 0:
-                                img_path = bracket.generate_win_meme(guild_id, "pass_sword")
-                            case 1:
-                                img_path = bracket.generate_win_meme(guild_id, "hotline_bling")
+                        with metrics.timer("render_seconds", guild=guild_id, kind="meme"):
+                            match memes_posted:
+                                case 0:
+                                    img_path = bracket.generate_win_meme(guild_id, "pass_sword")
+                                case 1:
+                                    img_path = bracket.generate_win_meme(guild_id, "hotline_bling")
                         memes_posted += 1
                         setGuildVar(guild_id, "memes_posted", memes_posted)
                         await send_channel_image(guild_id, bracket_channel_name, img_path)
@@ -772,12 +1322,95 @@ async def process_stage(guild_id: int):
                     return
                 return
 
+async def process_parallel_round(guild_id: int, bracket: Bracket, bracket_channel_name: str) -> None:
+    """
+    Parallel playoffs: one confirm opens every clash of the current round,
+    each on its own VS message with its own emoji pair, the next one closes
+    the whole round.
+    """
+    round_clashes: dict = getGuildVar(guild_id, "round_clashes", {})
+    if not round_clashes:
+        setGuildVar(guild_id, "currently_generating", True)
+        clashes = bracket.get_round_clashes()
+        await send_channel_message(guild_id, bracket_channel_name, "Which names are more worthy?")
+        tracked_messages.forget_guild(guild_id)
+
+        for clash, (emoji1, emoji2) in zip(clashes, get_emoji_clash_pairs(len(clashes))):
+            clash.team1emoji = emoji1
+            clash.team2emoji = emoji2
+        messages = await asyncio.gather(*(
+            send_channel_message(guild_id, bracket_channel_name, f"**{clash.team1}** {clash.team1emoji} VS **{clash.team2}** {clash.team2emoji}")
+            for clash in clashes
+        ))
+
+        round_votes = {}
+        for clash, message in zip(clashes, messages):
+            tracked_messages.track(guild_id, message)
+            round_clashes[message.id] = clash
+            round_votes[message.id] = ([], [])
+        setGuildVar(guild_id, "round_clashes", round_clashes)
+        setGuildVar(guild_id, "round_votes", round_votes)
+
+        # add the reactions for voting
+        await asyncio.gather(*(
+            add_reaction(message, emoji)
+            for clash, message in zip(clashes, messages)
+            for emoji in (clash.team1emoji, clash.team2emoji)
+        ))
+        setGuildVar(guild_id, "currently_generating", False)
+        return
+
+    round_votes = getGuildVar(guild_id, "round_votes", {})
+    ties = [clash for message_id, clash in round_clashes.items() if len(round_votes[message_id][0]) == len(round_votes[message_id][1])]
+    if ties:
+        matches = ", ".join(f"**{clash.team1}** VS **{clash.team2}**" for clash in ties)
+        setGuildVar(guild_id, "confirm_message", f"We need a tiebreaker vote on {matches}...")
+        return
+
+    winners = []
+    for message_id, clash in round_clashes.items():
+        team1_votes, team2_votes = round_votes[message_id]
+        if len(team1_votes) > len(team2_votes):
+            bracket.submit_winner(clash.team1, len(team1_votes), len(team2_votes))
+            winners.append(clash.team1)
+        else:
+            bracket.submit_winner(clash.team2, len(team2_votes), len(team1_votes))
+            winners.append(clash.team2)
+    save_bracket(guild_id, bracket)
+
+    message = f"{', '.join(f'**{winner}**' for winner in winners)} {'are' if len(winners) > 1 else 'is'} moving on!"
+    current_clash = None
+    if bracket.get_winner() is not None:
+        message = f"Well it's official! The winner is **{bracket.get_winner()}**!"
+        await allow_reacts_and_messages(bot.get_guild(guild_id), bracket_channel_name)
+        current_clash = ClashInfo(0, 0, "", "")
+
+    setGuildVar(guild_id, "view_message", message)
+    setGuildVar(guild_id, "current_clash", current_clash)
+    setGuildVar(guild_id, "round_clashes", {})
+    setGuildVar(guild_id, "round_votes", {})
+    setGuildVar(guild_id, "playoff_mode", "view")
+    await process_stage(guild_id)
+
+def load_bracket(guild_id: int) -> Optional[Bracket]:
+    """
+    The guild's playoff bracket, rebuilt from its stored snapshot.
+    """
+    snapshot = getGuildVar(guild_id, "bracket_snapshot")
+    return Bracket.from_snapshot(snapshot) if snapshot is not None else None
+
+def save_bracket(guild_id: int, bracket: Bracket) -> None:
+    """
+    Store the bracket as a snapshot, done after every result.
+    """
+    setGuildVar(guild_id, "bracket_snapshot", bracket.snapshot())
+
 def prompt_confirmation(interaction):
     setGuildVar(interaction.guild.id, "requires_confirmation", True)
 
 async def open_submissions(guild: discord.Guild, channel_name: str):
     # find the channel by name
-    channel = discord.utils.get(guild.text_channels, name=channel_name)
+    channel = channel_cache.resolve(guild, channel_name)
     if channel is None:
         return None
 
@@ -787,12 +1420,16 @@ async def open_submissions(guild: discord.Guild, channel_name: str):
     overwrite.add_reactions = False
 
     # apply the permission overwrite
-    await channel.set_permissions(guild.default_role, overwrite=overwrite)
+    await outbound.call(
+        ("permissions", channel.id),
+        Priority.ROUND,
+        lambda: channel.set_permissions(guild.default_role, overwrite=overwrite)
+    )
     return None
 
 async def close_submissions(guild: discord.Guild, channel_name: str):
     # find the channel by name
-    channel = discord.utils.get(guild.text_channels, name=channel_name)
+    channel = channel_cache.resolve(guild, channel_name)
     if channel is None:
         return None
 
@@ -802,12 +1439,16 @@ async def close_submissions(guild: discord.Guild, channel_name: str):
     overwrite.add_reactions = False
 
     # apply the permission overwrite
-    await channel.set_permissions(guild.default_role, overwrite=overwrite)
+    await outbound.call(
+        ("permissions", channel.id),
+        Priority.ROUND,
+        lambda: channel.set_permissions(guild.default_role, overwrite=overwrite)
+    )
     return None
 
 async def allow_reacts_and_messages(guild: discord.Guild, channel_name: str):
     # find the channel by name
-    channel = discord.utils.get(guild.text_channels, name=channel_name)
+    channel = channel_cache.resolve(guild, channel_name)
     if channel is None:
         return None
 
@@ -817,12 +1458,16 @@ async def allow_reacts_and_messages(guild: discord.Guild, channel_name: str):
     overwrite.add_reactions = True
 
     # apply the permission overwrite
-    await channel.set_permissions(guild.default_role, overwrite=overwrite)
+    await outbound.call(
+        ("permissions", channel.id),
+        Priority.ROUND,
+        lambda: channel.set_permissions(guild.default_role, overwrite=overwrite)
+    )
     return None
 
 async def is_submission_open(guild: discord.Guild, channel_name: str):
     # find the channel by name
-    channel = discord.utils.get(guild.text_channels, name=channel_name)
+    channel = channel_cache.resolve(guild, channel_name)
     if channel is None:
         return None
 
@@ -833,80 +1478,32 @@ def validate_submission(interaction):
     # Max 16 characters
     return None
 
-async def validate_start(interaction: discord.Interaction):
-    max_submissions = int(os.getenv("OPEN_QUAL_MAX_ROUND_SUBMISSONS"))
-    total_rounds = int(os.getenv("OPEN_QUAL_ROUNDS"))
-    submission_passthru = int(os.getenv("OPEN_QUAL_PASSTHRU_SUBMISSIONS"))
-    bracket_channel_name = os.getenv("BRACKET_CHANNEL_NAME")
-    force_tie_breaker = os.getenv("OPEN_QUAL_FORCE_TIE_BREAKER", "false").lower()
-
-    if bracket_channel_name is None:
-        await interaction.response.send_message(
-            "Error: Bracket channel name not set in environment variables.",
-            ephemeral=True
-        )
-        return False
-    if total_rounds < 1:
-        await interaction.response.send_message(
-            "Error: Number of rounds must be greater than 0.",
-            ephemeral=True
-        )
-        return False
-    min_max_submissions = math.ceil(submission_passthru /total_rounds)
-    if max_submissions < min_max_submissions:
-        await interaction.response.send_message(
-            f"Error: Maximum submissions per round is {min_max_submissions}.",
-            ephemeral=True
-        )
-        return False
-    # Check if submission_passthru is NOT a power of 2
-    if submission_passthru <= 0 or (submission_passthru & (submission_passthru - 1)) != 0:
-        await interaction.response.send_message(
-            "Error: Number of submissions must be a power of 2 (2, 4, 8, 16, 32, etc.).",
-            ephemeral=True
-        )
-        return False
-    if force_tie_breaker not in ["true", "false"]:
-        await interaction.response.send_message(
-            "Error: OPEN_QUAL_FORCE_TIE_BREAKER must be 'true' or 'false'.",
-            ephemeral=True
-        )
-        return False
-    return True
-
-async def send_channel_message(guild_id: int, channel_name: str, content: str):
-    # Get the guild
-    guild = bot.get_guild(guild_id)
-    if not guild:
-        print(f"Error: Could not find guild with ID {guild_id}", flush=True)
-        return None
-    
-    # Find the channel
-    channel = discord.utils.get(guild.text_channels, name=channel_name)
+async def send_channel_message(guild_id: int, channel_name: str, content: str, priority: Priority = Priority.ROUND, view: Optional[discord.ui.View] = None):
+    # Find the channel, cached per guild
+    channel = channel_cache.messageable(guild_id, channel_name)
     if not channel:
-        print(f"Error: Could not find channel '{channel_name}' in guild {guild.name}", flush=True)
+        log.error("Could not find channel '%s'", channel_name, extra={"guild": guild_id})
         return None
     
     # Send the message
-    return await channel.send(content)
+    if view is not None:
+        return await outbound.call(("send", channel.id), priority, lambda: channel.send(content, view=view))
+    return await outbound.call(("send", channel.id), priority, lambda: channel.send(content))
+
+async def add_reaction(message: discord.Message, emoji: str) -> None:
+    await outbound.call(("reaction", message.channel.id), Priority.VOTING, lambda: message.add_reaction(emoji))
 
 
 async def send_channel_image(guild_id: int, channel_name: str, image_path: str, content: str = None) -> Optional[discord.Message]:
-    # Get the guild
-    guild = bot.get_guild(guild_id)
-    if not guild:
-        print(f"Error: Could not find guild with ID {guild_id}", flush=True)
-        return None
-    
-    # Find the channel
-    channel = discord.utils.get(guild.text_channels, name=channel_name)
+    # Find the channel, cached per guild
+    channel = channel_cache.messageable(guild_id, channel_name)
     if not channel:
-        print(f"Error: Could not find channel '{channel_name}' in guild {guild.name}", flush=True)
+        log.error("Could not find channel '%s'", channel_name, extra={"guild": guild_id})
         return None
     
     # Check if the file exists
     if not os.path.isfile(image_path):
-        print(f"Error: Image file not found at path: {image_path}", flush=True)
+        log.error("Image file not found at path: %s", image_path, extra={"guild": guild_id})
         return None
     
     try:
@@ -914,59 +1511,116 @@ async def send_channel_image(guild_id: int, channel_name: str, image_path: str,
         file = discord.File(image_path)
         
         # Send the message with the file
-        return await channel.send(content=content, file=file)
+        return await outbound.call(("send", channel.id), Priority.ROUND, lambda: channel.send(content=content, file=file))
     except Exception as e:
-        print(f"Error sending image: {str(e)}", flush=True)
+        log.error("Error sending image: %s", e, extra={"guild": guild_id})
         return None
 
 
-def get_user_vote_count(guild_id: int, user_id: int) -> int:
+def schedule_vote_count_edit(guild_id: int, submission: dict, channel_name: Optional[str] = None) -> None:
     """
-    Get the number of votes a user has left.
-    Creates and initializes the count if it doesn't exist.
+    Queue a "(N) name" counter update for the message posted for a submission
+    in `channel_name` (the bracket channel by default).
     """
-    # Get the user vote count dictionary, default to empty dict if not exists
-    user_vote_count = getGuildVar(guild_id, "user_vote_count", {})
-    
-    # Convert user_id to string since JSON keys are strings
-    user_id_str = str(user_id)
-    
-    # Check if the user exists in the dictionary
-    if user_id_str not in user_vote_count:
-        # User doesn't exist, create entry with default max votes
-        max_votes = int(os.getenv("OPEN_QUAL_MAX_VOTES", 3))
-        user_vote_count[user_id_str] = max_votes
-        
-        # Save the updated dictionary
-        setGuildVar(guild_id, "user_vote_count", user_vote_count)
-    
-    # Return the user's vote count
-    return user_vote_count[user_id_str]
+    if "message_id" not in submission:
+        return
+    message = tracked_messages.get(submission["message_id"])
+    if message is None:
+        channel = channel_cache.messageable(guild_id, channel_name or get_config(guild_id).bracket_channel_name)
+        if channel is None:
+            return
+        message = channel.get_partial_message(submission["message_id"])
+    vote_edits.schedule(guild_id, message, content=f"({len(submission['votes'])}) {submission['name']}")
 
-def set_user_vote_count(guild_id: int, user_id: int, count: int) -> None:
+def add_submission_vote(guild_id: int, pool: QualPool, open_qual_round: int, submission: dict, user_id: int) -> Optional[int]:
     """
-    Set the number of votes a user has left.
+    Spend one of the user's votes on a submission.
+    Returns the votes the user has left, or None if they had none to spend.
     """
-    # Get the user vote count dictionary, default to empty dict if not exists
-    user_vote_count = getGuildVar(guild_id, "user_vote_count", {})
-    
-    # Convert user_id to string since JSON keys are strings
-    user_id_str = str(user_id)
-    
-    # Set the user's vote count
-    user_vote_count[user_id_str] = count
-    
-    # Save the updated dictionary
-    setGuildVar(guild_id, "user_vote_count", user_vote_count)
+    budget = get_vote_budget(guild_id)
+    if budget.remaining(user_id) < 1:
+        return None
 
+    submission['votes'].append(user_id)
+    user_votes_remaining = budget.add(user_id, -1)
+    setGuildVar(guild_id, "vote_budget", budget)
+    leaderboard = get_leaderboard(guild_id, pool, open_qual_round)
+    leaderboard.add(submission["name"])
+    setGuildVar(guild_id, pool.var(open_qual_round, "leaderboard"), leaderboard)
+
+    # Update the submissions in the guild state
+    setGuildVar(
+        guild_id,
+        pool.var(open_qual_round, "submissions"),
+        getGuildVar(guild_id, pool.var(open_qual_round, "submissions"), [])
+    )
+    log.info("%s (%d) voted for %s", get_user_display_name(guild_id, user_id), user_votes_remaining, submission["name"], extra={"event": "qual_vote"})
+    return user_votes_remaining
+
+def clear_submission_votes(guild_id: int, pool: QualPool, open_qual_round: int, user_id: int) -> List[dict]:
+    """
+    Refund every vote the user cast in this pool this round.
+    Returns the submissions that lost votes.
+    """
+    round_submissions: List = getGuildVar(guild_id, pool.var(open_qual_round, "submissions"), [])
+    leaderboard = get_leaderboard(guild_id, pool, open_qual_round)
+    refunded = 0
+    changed = []
+    for submission in round_submissions:
+        # remove all of this users votes from the submission
+        original_count = len(submission['votes'])
+        submission['votes'] = [v for v in submission['votes'] if v != user_id]
+        removed_count = original_count - len(submission['votes'])
+        if removed_count == 0:
+            continue
+        refunded += removed_count
+        leaderboard.add(submission["name"], -removed_count)
+        changed.append(submission)
+
+    if changed:
+        budget = get_vote_budget(guild_id)
+        user_votes_remaining = budget.add(user_id, refunded)
+        setGuildVar(guild_id, "vote_budget", budget)
+        setGuildVar(guild_id, pool.var(open_qual_round, "submissions"), round_submissions)
+        setGuildVar(guild_id, pool.var(open_qual_round, "leaderboard"), leaderboard)
+        ranking = getGuildVar(guild_id, pool.var(open_qual_round, "matchups"))
+        if ranking is not None:
+            ranking.forget_voter(user_id)
+            setGuildVar(guild_id, pool.var(open_qual_round, "matchups"), ranking)
+        log.info("%s (%d) Reset", get_user_display_name(guild_id, user_id), user_votes_remaining, extra={"event": "qual_vote_clear"})
+    return changed
+
+def get_leaderboard(guild_id: int, pool: QualPool, open_qual_round: int) -> Leaderboard:
+    """
+    The pool's live standings. Rebuilt from the vote lists when the pool
+    started voting without one, e.g. on state saved by an older version.
+    """
+    leaderboard = getGuildVar(guild_id, pool.var(open_qual_round, "leaderboard"))
+    if leaderboard is None:
+        round_submissions: List = getGuildVar(guild_id, pool.var(open_qual_round, "submissions"), [])
+        leaderboard = Leaderboard([submission["name"] for submission in round_submissions])
+        leaderboard.reset([len(submission["votes"]) for submission in round_submissions])
+        setGuildVar(guild_id, pool.var(open_qual_round, "leaderboard"), leaderboard)
+    return leaderboard
+
+def get_vote_budget(guild_id: int) -> VoteBudget:
+    """
+    The votes users have left this round, everyone starts with
+    OPEN_QUAL_MAX_VOTES. Counts saved by an older version are carried over.
+    """
+    budget = getGuildVar(guild_id, "vote_budget")
+    if budget is None:
+        budget = VoteBudget.from_counts(get_config(guild_id).open_qual_max_votes, getGuildVar(guild_id, "user_vote_count", {}))
+        setGuildVar(guild_id, "vote_budget", budget)
+    return budget
 
 def clear_user_votes(guild_id: int) -> None:
     """
     Clear all user vote counts for a specific guild.
     This resets the voting state for everyone in the guild.
     """
-    # Set an empty dictionary to reset all user votes
-    setGuildVar(guild_id, "user_vote_count", {})
+    setGuildVar(guild_id, "vote_budget", VoteBudget(get_config(guild_id).open_qual_max_votes))
+    setGuildVar(guild_id, "user_vote_count", None)
 
 def get_user_display_name(guild_id: int, user_id: int) -> str:
     """
@@ -981,27 +1635,124 @@ def get_user_display_name(guild_id: int, user_id: int) -> str:
         member = guild.get_member(user_id)
         if member:
             return member.display_name
-        return str(user_id)  # Fallback to ID if member not found
+        # without the member cache, the names we saw in events
+        return display_names.get(guild_id, user_id) or str(user_id)
     except:
         return str(user_id)  # Fallback to ID if any error occurs
 
+CLASH_EMOJI_PAIRS = [
+    ["🐨", "🐻"],
+    ["🦁", "🐯"],
+    ["🐱", "🐶"],
+    ["🐼", "🐵"],
+    ["🦊", "🐺"],
+    ["🐮", "🐷"],
+    ["🐸", "🐭"],
+    ["🐲", "🦄"],
+    ["🐧", "🦉"],
+    ["🦝", "🐰"],
+]
+
 def get_emoji_clash_pair() -> list[str]:
-    pairs = [
-        ["🐨", "🐻"],
-        ["🦁", "🐯"],
-        ["🐱", "🐶"],
-        ["🐼", "🐵"],
-        ["🦊", "🐺"],
-        ["🐮", "🐷"],
-        ["🐸", "🐭"],
-        ["🐲", "🦄"],
-        ["🐧", "🦉"],
-        ["🦝", "🐰"],
-    ]
-    return random.choice(pairs)
+    return random.choice(CLASH_EMOJI_PAIRS)
+
+def get_emoji_clash_pairs(count: int) -> list[list[str]]:
+    """
+    `count` pairs, all different while there are enough of them.
+    """
+    pairs = random.sample(CLASH_EMOJI_PAIRS, len(CLASH_EMOJI_PAIRS))
+    return [pairs[i % len(pairs)] for i in range(count)]
+
+def collect_runtime_metrics():
+    """
+    Values owned by the outbound scheduler and the mailboxes, read at scrape time.
+    """
+    stats = outbound.stats()
+    yield "discord_rate_limited_total", "counter", {}, stats["rate_limited"]
+    yield "discord_retries_total", "counter", {}, stats["retried"]
+    yield "outbound_dropped_total", "counter", {}, stats["dropped"]
+    yield "outbound_coalesced_total", "counter", {}, stats["coalesced"]
+    yield "outbound_pending", "gauge", {}, stats["pending"]
+    for guild_id, mailbox in guild_actors.stats().items():
+        yield "guild_mailbox_depth", "gauge", {"guild": guild_id}, mailbox["queue_depth"]
+
+metrics.collect(collect_runtime_metrics)
+
+async def start_metrics_exposition() -> None:
+    """
+    Start the metrics endpoint and file dump once, on the first on_ready.
+    """
+    if metrics_tasks:
+        return
+    if config.metrics_port:
+        server = await serve_metrics(metrics, config.metrics_host, config.metrics_port)
+        metrics_tasks.append(asyncio.create_task(server.serve_forever(), name="metrics-server"))
+        log.info("Metrics on http://%s:%s/metrics", config.metrics_host, config.metrics_port)
+    if config.metrics_dump_file:
+        metrics_tasks.append(asyncio.create_task(
+            dump_metrics(metrics, config.metrics_dump_file, config.metrics_dump_interval),
+            name="metrics-dump"
+        ))
+
+async def warm_up_rendering() -> None:
+    try:
+        seconds = await asyncio.to_thread(warm_up)
+    except Exception:
+        log.exception("Could not load the rendering modules")
+        return
+    log.info("Rendering modules loaded in %.2fs", seconds)
+
+def guild_event_processed(guild_id: int) -> None:
+    profiler.event_processed()
+    if gateway_trace is not None:
+        trace_guild_state(guild_id)
+
+def guild_state_summary(guild_id: int) -> dict:
+    """
+    Where the guild's tournament stands. The clash emojis (every open pair
+    in posting order for parallel playoffs) let replay.py map recorded
+    reactions onto its own pairs.
+    """
+    current_clash = getGuildVar(guild_id, "current_clash")
+    round_clashes = getGuildVar(guild_id, "round_clashes", {})
+    if round_clashes:
+        clash = [emoji for open_clash in round_clashes.values() for emoji in (open_clash.team1emoji, open_clash.team2emoji)]
+    elif hasattr(current_clash, "team1emoji"):
+        clash = [current_clash.team1emoji, current_clash.team2emoji]
+    else:
+        clash = None
+    return {
+        "stage": getGuildVar(guild_id, "stage", 0),
+        "mode": getGuildVar(guild_id, "open_qual_mode"),
+        "round": getGuildVar(guild_id, "open_qual_round", 0),
+        "playoff": getGuildVar(guild_id, "playoff_mode", "view"),
+        "clash": clash,
+    }
+
+def trace_guild_state(guild_id: int) -> None:
+    """
+    Record where the guild's tournament stands after a handler ran.
+    """
+    gateway_trace.state(guild_id, guild_state_summary(guild_id))
 
 # ──────────────────────────────────────────────—
 
 if __name__ == "__main__":
-    TOKEN = os.getenv("DISCORD_TOKEN", "YOUR_TOKEN_HERE")
-    bot.run(TOKEN)
+    log_listener = setup_logging(
+        config.log_file,
+        config.log_level,
+        config.log_levels,
+        config.log_max_bytes,
+        config.log_backup_count,
+        config.log_console_level,
+        GuildContextFilter(current_guild, lambda guild_id: getGuildVar(guild_id, "stage", 0)),
+    )
+    try:
+        # log_handler=None keeps discord.py from installing its own blocking handler
+        bot.run(config.discord_token, log_handler=None)
+    finally:
+        if gateway_trace is not None:
+            gateway_trace.close()
+        if isinstance(getStore(), FileGuildStore):
+            getStore().flush_all()
+        log_listener.stop()
@@ -0,0 +1,53 @@
+# channel_cache.py
+
+from typing import Dict, Optional, Tuple, Union
+
+import discord
+
+# remembers that a guild has no channel by that name
+_MISSING = 0
+
+class ChannelCache:
+    """
+    Per-guild cache of channel IDs looked up by name.
+
+    The first lookup scans guild.text_channels once; after that the channel
+    comes straight from the guild's channel map. Entries are invalidated by
+    the channel create/update/delete events.
+    """
+    def __init__(self, client: discord.Client):
+        self.client = client
+        self._ids: Dict[Tuple[int, str], int] = {}
+
+    def resolve(self, guild: Optional[discord.Guild], channel_name: str) -> Optional[discord.TextChannel]:
+        if guild is None:
+            return None
+        key = (guild.id, channel_name)
+        channel_id = self._ids.get(key)
+        if channel_id == _MISSING:
+            return None
+        if channel_id is not None:
+            channel = guild.get_channel(channel_id)
+            if channel is not None:
+                return channel
+
+        channel = discord.utils.get(guild.text_channels, name=channel_name)
+        self._ids[key] = channel.id if channel is not None else _MISSING
+        return channel
+
+    def messageable(self, guild_id: int, channel_name: str) -> Optional[Union[discord.TextChannel, discord.PartialMessageable]]:
+        """
+        Something we can send() to. Prefers the cached channel object and only
+        falls back to a PartialMessageable when the guild itself is not cached.
+        """
+        guild = self.client.get_guild(guild_id)
+        if guild is not None:
+            return self.resolve(guild, channel_name)
+        channel_id = self._ids.get((guild_id, channel_name))
+        if not channel_id:
+            return None
+        return self.client.get_partial_messageable(channel_id, guild_id=guild_id)
+
+    def invalidate(self, guild_id: int) -> None:
+        for key in [key for key in self._ids if key[0] == guild_id]:
+            del self._ids[key]
@@ -0,0 +1,97 @@
+# command_sync.py
+
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import discord
+from discord import app_commands
+
+log = logging.getLogger(__name__)
+
+def command_tree_hash(tree: app_commands.CommandTree, test_guild_ids: Sequence[int] = ()) -> str:
+    """
+    sha256 of the global command definitions as Discord receives them,
+    independent of registration order. The test guilds are part of the
+    hash so changing them syncs again.
+    """
+    payload = {
+        "commands": sorted((command.to_dict(tree) for command in tree.get_commands()), key=lambda c: (c.get("type", 1), c["name"])),
+        "test_guilds": sorted(test_guild_ids),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+def _read_hash(path: str) -> Tuple[Optional[str], List[int]]:
+    """
+    The digest of the last sync and the test guilds it went to.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            lines = f.read().split("\n")
+    except OSError:
+        return None, []
+    digest = lines[0].strip() or None
+    guild_ids = [int(v) for v in lines[1].split(",") if v.strip()] if len(lines) > 1 else []
+    return digest, guild_ids
+
+def _write_hash(path: str, digest: str, test_guild_ids: Sequence[int]) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        f.write(digest + "\n" + ",".join(str(guild_id) for guild_id in test_guild_ids) + "\n")
+    os.replace(path + ".tmp", path)
+
+async def _sync_guild(tree: app_commands.CommandTree, guild_id: int, on_synced: Optional[Callable[[str, float], None]]) -> None:
+    guild = discord.Object(id=guild_id)
+    started = time.perf_counter()
+    synced = await tree.sync(guild=guild)
+    elapsed = time.perf_counter() - started
+    log.info("Synced %d commands to test guild %s in %.2fs", len(synced), guild_id, elapsed, extra={"guild": guild_id})
+    if on_synced is not None:
+        on_synced("guild", elapsed)
+
+async def sync_command_tree(
+    tree: app_commands.CommandTree,
+    hash_path: str,
+    test_guild_ids: Sequence[int] = (),
+    on_synced: Optional[Callable[[str, float], None]] = None,
+) -> bool:
+    """
+    Sync the command tree only when its definitions changed since the last
+    successful sync recorded at `hash_path` (an empty path always syncs).
+    With test guilds only they get a guild copy, where updates show up
+    immediately, and the global commands are left alone. Without them the
+    global commands are synced and the guild copies of earlier test guilds
+    are removed, so no command shows up twice. `on_synced` gets ("guild" or
+    "global", seconds) per sync call. Returns whether anything was synced.
+    """
+    digest = command_tree_hash(tree, test_guild_ids)
+    last_digest, last_test_guild_ids = _read_hash(hash_path) if hash_path else (None, [])
+    if last_digest == digest:
+        log.info("Command tree unchanged (%s), skipping sync", digest[:12])
+        return False
+
+    if test_guild_ids:
+        for guild_id in test_guild_ids:
+            tree.copy_global_to(guild=discord.Object(id=guild_id))
+            await _sync_guild(tree, guild_id, on_synced)
+    else:
+        started = time.perf_counter()
+        synced = await tree.sync()
+        elapsed = time.perf_counter() - started
+        log.info("Synced %d global commands in %.2fs (%s)", len(synced), elapsed, digest[:12])
+        if on_synced is not None:
+            on_synced("global", elapsed)
+
+    # test guilds that were dropped keep their copies until cleared
+    for guild_id in set(last_test_guild_ids) - set(test_guild_ids):
+        tree.clear_commands(guild=discord.Object(id=guild_id))
+        await _sync_guild(tree, guild_id, on_synced)
+
+    if hash_path:
+        _write_hash(hash_path, digest, test_guild_ids)
+    return True
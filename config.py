@@ -0,0 +1,351 @@
+# config.py
+
+import dataclasses
+import json
+import math
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple, get_args, get_origin, get_type_hints
+
+_LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+
+class ConfigError(ValueError):
+    """
+    Raised at startup when a setting is missing or invalid.
+    """
+
+def _parse_bool(value: str) -> bool:
+    value = value.strip().lower()
+    if value not in ("true", "false"):
+        raise ValueError("must be 'true' or 'false'")
+    return value == "true"
+
+def _parse_log_levels(value: str) -> Tuple[Tuple[str, str], ...]:
+    """
+    "discord=WARNING,outbound=DEBUG" -> (("discord", "WARNING"), ("outbound", "DEBUG"))
+    """
+    levels = []
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        name, sep, level = item.partition("=")
+        level = level.strip().upper()
+        if not sep or not name.strip() or level not in _LOG_LEVELS:
+            raise ValueError(f"expected module=LEVEL, got {item.strip()!r}")
+        levels.append((name.strip(), level))
+    return tuple(levels)
+
+def _parse_str_list(value: str) -> Tuple[str, ...]:
+    return tuple(item.strip() for item in value.split(",") if item.strip())
+
+def _parse_int_list(value: str) -> Tuple[int, ...]:
+    return tuple(int(v) for v in value.split(",") if v.strip() != "")
+
+@dataclass(frozen=True)
+class BracketConfig:
+    """
+    Every setting the bot reads, parsed and validated once at startup.
+    """
+    # tournament settings, these can be overridden per guild
+    bracket_channel_name: str
+    open_qual_max_round_submissions: int
+    open_qual_rounds: int
+    open_qual_passthru_submissions: int
+    open_qual_max_votes: int = 3
+    open_qual_force_tie_breaker: bool = False
+    open_qual_ballot_mode: str = "reactions"
+    open_qual_pool_channels: Tuple[str, ...] = ()
+    min_sub_length: int = 3
+    max_sub_length: int = 32
+    bot_is_playing: bool = False
+    bot_submission_frequency: int = 3
+    bot_votes: int = 1
+    previous_team_name: str = ""
+    playoff_parallel: bool = False
+
+    # process settings, shared by every guild
+    discord_token: str = ""
+    guild_mailbox_size: int = 1000
+    tracked_message_cache_size: int = 512
+    member_cache: bool = True
+    display_name_cache_size: int = 10000
+    vote_edit_interval: float = 1.0
+    outbound_concurrency: int = 4
+    outbound_drop_threshold: int = 200
+    user_reaction_rate: float = 2.0
+    user_reaction_burst: int = 10
+    user_message_rate: float = 0.5
+    user_message_burst: int = 5
+    shard_count: int = 0
+    shard_ids: Tuple[int, ...] = ()
+    guild_state_store: str = "memory"
+    guild_state_dir: str = "state"
+    guild_config_file: str = ""
+    event_trace_dir: str = ""
+    metrics_host: str = "127.0.0.1"
+    metrics_port: int = 0
+    metrics_dump_file: str = ""
+    metrics_dump_interval: float = 60.0
+    log_file: str = "logs/bot.log"
+    log_level: str = "INFO"
+    log_levels: Tuple[Tuple[str, str], ...] = ()
+    log_console_level: str = "WARNING"
+    log_max_bytes: int = 10 * 1024 * 1024
+    log_backup_count: int = 5
+    command_hash_file: str = "state/command_tree.sha256"
+    command_sync_guilds: Tuple[int, ...] = ()
+
+# field name -> (env var, parser), fields without a default are required
+_ENV: Dict[str, Tuple[str, Callable[[str], Any]]] = {
+    "bracket_channel_name": ("BRACKET_CHANNEL_NAME", str),
+    "open_qual_max_round_submissions": ("OPEN_QUAL_MAX_ROUND_SUBMISSONS", int),
+    "open_qual_rounds": ("OPEN_QUAL_ROUNDS", int),
+    "open_qual_passthru_submissions": ("OPEN_QUAL_PASSTHRU_SUBMISSIONS", int),
+    "open_qual_max_votes": ("OPEN_QUAL_MAX_VOTES", int),
+    "open_qual_force_tie_breaker": ("OPEN_QUAL_FORCE_TIE_BREAKER", _parse_bool),
+    "open_qual_ballot_mode": ("OPEN_QUAL_BALLOT_MODE", lambda v: v.strip().lower()),
+    "open_qual_pool_channels": ("OPEN_QUAL_POOL_CHANNELS", _parse_str_list),
+    "min_sub_length": ("MIN_SUB_LENGTH", int),
+    "max_sub_length": ("MAX_SUB_LENGTH", int),
+    "bot_is_playing": ("BOT_IS_PLAYING", _parse_bool),
+    "bot_submission_frequency": ("BOT_SUBMISSION_FREQUENCY", int),
+    "bot_votes": ("BOT_VOTES", int),
+    "previous_team_name": ("PREVIOUS_TEAM_NAME", str),
+    "playoff_parallel": ("PLAYOFF_PARALLEL", _parse_bool),
+    "discord_token": ("DISCORD_TOKEN", str),
+    "guild_mailbox_size": ("GUILD_MAILBOX_SIZE", int),
+    "tracked_message_cache_size": ("TRACKED_MESSAGE_CACHE_SIZE", int),
+    "member_cache": ("MEMBER_CACHE", _parse_bool),
+    "display_name_cache_size": ("DISPLAY_NAME_CACHE_SIZE", int),
+    "vote_edit_interval": ("VOTE_EDIT_INTERVAL", float),
+    "outbound_concurrency": ("OUTBOUND_CONCURRENCY", int),
+    "outbound_drop_threshold": ("OUTBOUND_DROP_THRESHOLD", int),
+    "user_reaction_rate": ("USER_REACTION_RATE", float),
+    "user_reaction_burst": ("USER_REACTION_BURST", int),
+    "user_message_rate": ("USER_MESSAGE_RATE", float),
+    "user_message_burst": ("USER_MESSAGE_BURST", int),
+    "shard_count": ("SHARD_COUNT", int),
+    "shard_ids": ("SHARD_IDS", _parse_int_list),
+    "guild_state_store": ("GUILD_STATE_STORE", lambda v: v.strip().lower()),
+    "guild_state_dir": ("GUILD_STATE_DIR", str),
+    "guild_config_file": ("GUILD_CONFIG_FILE", str),
+    "event_trace_dir": ("EVENT_TRACE_DIR", str),
+    "metrics_host": ("METRICS_HOST", str),
+    "metrics_port": ("METRICS_PORT", int),
+    "metrics_dump_file": ("METRICS_DUMP_FILE", str),
+    "metrics_dump_interval": ("METRICS_DUMP_INTERVAL", float),
+    "log_file": ("LOG_FILE", str),
+    "log_level": ("LOG_LEVEL", lambda v: v.strip().upper()),
+    "log_levels": ("LOG_LEVELS", _parse_log_levels),
+    "log_console_level": ("LOG_CONSOLE_LEVEL", lambda v: v.strip().upper()),
+    "log_max_bytes": ("LOG_MAX_BYTES", int),
+    "log_backup_count": ("LOG_BACKUP_COUNT", int),
+    "command_hash_file": ("COMMAND_HASH_FILE", str),
+    "command_sync_guilds": ("COMMAND_SYNC_GUILDS", _parse_int_list),
+}
+
+# settings a guild may override in GUILD_CONFIG_FILE
+GUILD_FIELDS = (
+    "bracket_channel_name",
+    "open_qual_max_round_submissions",
+    "open_qual_rounds",
+    "open_qual_passthru_submissions",
+    "open_qual_max_votes",
+    "open_qual_force_tie_breaker",
+    "open_qual_ballot_mode",
+    "open_qual_pool_channels",
+    "min_sub_length",
+    "max_sub_length",
+    "bot_is_playing",
+    "bot_submission_frequency",
+    "bot_votes",
+    "previous_team_name",
+    "playoff_parallel",
+)
+
+def _parse_fields(values: Mapping[str, Any], fields) -> Tuple[Dict[str, Any], list]:
+    """
+    Parse raw values keyed by env var name. Returns (parsed, errors).
+    """
+    parsed, errors = {}, []
+    for name in fields:
+        env_name, parser = _ENV[name]
+        raw = values.get(env_name)
+        if raw is None or (isinstance(raw, str) and raw.strip() == "" and parser is not str):
+            continue
+        try:
+            if isinstance(raw, str):
+                parsed[name] = parser(raw)
+            else:
+                parsed[name] = _check_json(name, raw)
+        except ValueError as e:
+            errors.append(f"{env_name}={raw!r} is invalid: {e}")
+    return parsed, errors
+
+_JSON_TYPE_NAMES = {str: "a string", int: "an integer", float: "a number", bool: "true or false"}
+
+def _check_json(name: str, raw: Any) -> Any:
+    """
+    A non-string JSON override checked against its field's type. JSON lists
+    stand in for comma separated env vars and become tuples.
+    """
+    expected = get_type_hints(BracketConfig)[name]
+    if get_origin(expected) is tuple:
+        item_type = get_args(expected)[0]
+        if isinstance(raw, list) and all(_is_json_type(item, item_type) for item in raw):
+            return tuple(raw)
+        raise ValueError(f"must be a list, each item {_JSON_TYPE_NAMES[item_type]}")
+    if not _is_json_type(raw, expected):
+        raise ValueError(f"must be {_JSON_TYPE_NAMES[expected]}")
+    return float(raw) if expected is float else raw
+
+def _is_json_type(value: Any, expected: type) -> bool:
+    # bool is an int in Python but not a number in the settings
+    if isinstance(value, bool):
+        return expected is bool
+    if expected is float:
+        return isinstance(value, (int, float))
+    return isinstance(value, expected)
+
+def guild_settings(config: BracketConfig) -> Dict[str, Any]:
+    """
+    The overridable settings of a config keyed by env var name, the same
+    shape GUILD_CONFIG_FILE uses.
+    """
+    return {_ENV[name][0]: getattr(config, name) for name in GUILD_FIELDS}
+
+def validate(config: BracketConfig) -> list:
+    """
+    Return a list of problems with a config, empty when it is usable.
+    """
+    errors = []
+    if not config.discord_token:
+        errors.append("DISCORD_TOKEN must be set")
+    if not config.bracket_channel_name:
+        errors.append("BRACKET_CHANNEL_NAME must be set")
+    if config.open_qual_rounds < 1:
+        errors.append("OPEN_QUAL_ROUNDS must be greater than 0")
+    passthru = config.open_qual_passthru_submissions
+    # Check if submission_passthru is NOT a power of 2
+    if passthru <= 0 or (passthru & (passthru - 1)) != 0:
+        errors.append("OPEN_QUAL_PASSTHRU_SUBMISSIONS must be a power of 2 (2, 4, 8, 16, 32, etc.)")
+    elif config.open_qual_rounds >= 1:
+        min_max_submissions = math.ceil(passthru / config.open_qual_rounds)
+        if config.open_qual_max_round_submissions < min_max_submissions:
+            errors.append(f"OPEN_QUAL_MAX_ROUND_SUBMISSONS must be at least {min_max_submissions}")
+    if config.open_qual_max_votes < 1:
+        errors.append("OPEN_QUAL_MAX_VOTES must be at least 1")
+    if config.open_qual_ballot_mode not in ("reactions", "buttons", "matchups"):
+        errors.append("OPEN_QUAL_BALLOT_MODE must be 'reactions', 'buttons' or 'matchups'")
+    pools = config.open_qual_pool_channels
+    if len(set(pools)) != len(pools):
+        errors.append("OPEN_QUAL_POOL_CHANNELS must not repeat a channel")
+    elif pools and config.open_qual_rounds >= 1 and passthru // config.open_qual_rounds < len(pools):
+        errors.append("OPEN_QUAL_POOL_CHANNELS must not list more pools than OPEN_QUAL_PASSTHRU_SUBMISSIONS / OPEN_QUAL_ROUNDS, every pool needs a qualifier spot")
+    if config.min_sub_length < 1 or config.max_sub_length < config.min_sub_length:
+        errors.append("MIN_SUB_LENGTH must be at least 1 and no greater than MAX_SUB_LENGTH")
+    if config.bot_submission_frequency < 1:
+        errors.append("BOT_SUBMISSION_FREQUENCY must be at least 1")
+    if config.guild_mailbox_size < 1:
+        errors.append("GUILD_MAILBOX_SIZE must be at least 1")
+    if config.vote_edit_interval < 0:
+        errors.append("VOTE_EDIT_INTERVAL must not be negative")
+    if config.display_name_cache_size < 1:
+        errors.append("DISPLAY_NAME_CACHE_SIZE must be at least 1")
+    if config.outbound_concurrency < 1:
+        errors.append("OUTBOUND_CONCURRENCY must be at least 1")
+    if config.user_reaction_rate < 0 or config.user_message_rate < 0:
+        errors.append("USER_REACTION_RATE and USER_MESSAGE_RATE must not be negative (0 turns throttling off)")
+    if config.user_reaction_burst < 1 or config.user_message_burst < 1:
+        errors.append("USER_REACTION_BURST and USER_MESSAGE_BURST must be at least 1")
+    if config.guild_state_store not in ("memory", "file"):
+        errors.append("GUILD_STATE_STORE must be 'memory' or 'file'")
+    if config.metrics_port < 0 or config.metrics_port > 65535:
+        errors.append("METRICS_PORT must be between 0 (off) and 65535")
+    if config.metrics_dump_interval <= 0:
+        errors.append("METRICS_DUMP_INTERVAL must be greater than 0")
+    if config.log_level not in _LOG_LEVELS or config.log_console_level not in _LOG_LEVELS:
+        errors.append(f"LOG_LEVEL and LOG_CONSOLE_LEVEL must be one of {', '.join(_LOG_LEVELS)}")
+    if not config.log_file:
+        errors.append("LOG_FILE must be set")
+    if config.log_max_bytes < 0 or config.log_backup_count < 0:
+        errors.append("LOG_MAX_BYTES and LOG_BACKUP_COUNT must not be negative")
+    if config.shard_ids and (config.shard_count < 1 or any(s < 0 or s >= config.shard_count for s in config.shard_ids)):
+        errors.append("SHARD_IDS must be within 0..SHARD_COUNT-1")
+    return errors
+
+def load_config(environ: Optional[Mapping[str, str]] = None) -> BracketConfig:
+    """
+    Build the base config from environment variables. Raises ConfigError.
+    """
+    environ = os.environ if environ is None else environ
+    parsed, errors = _parse_fields(environ, _ENV.keys())
+
+    required = [f.name for f in dataclasses.fields(BracketConfig) if f.default is dataclasses.MISSING]
+    for name in required:
+        if name not in parsed:
+            errors.append(f"{_ENV[name][0]} must be set")
+    if errors:
+        raise ConfigError("Invalid configuration:\n- " + "\n- ".join(errors))
+
+    config = BracketConfig(**parsed)
+    errors = validate(config)
+    if errors:
+        raise ConfigError("Invalid configuration:\n- " + "\n- ".join(errors))
+    return config
+
+def load_guild_overrides(base: BracketConfig, path: str) -> Dict[int, BracketConfig]:
+    """
+    Read per-guild overrides from a JSON file shaped like
+    {"<guild_id>": {"OPEN_QUAL_ROUNDS": 2, ...}}. Raises ConfigError.
+    """
+    if not path:
+        return {}
+    try:
+        with open(path) as f:
+            raw = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ConfigError(f"Could not read GUILD_CONFIG_FILE {path}: {e}")
+
+    overrides, errors = {}, []
+    known = {_ENV[name][0] for name in GUILD_FIELDS}
+    for guild_id, values in raw.items():
+        unknown = set(values) - known
+        if unknown:
+            errors.append(f"guild {guild_id}: unknown or non-overridable settings {sorted(unknown)}")
+            continue
+        parsed, parse_errors = _parse_fields(values, GUILD_FIELDS)
+        errors.extend(f"guild {guild_id}: {e}" for e in parse_errors)
+        if parse_errors:
+            continue
+        config = dataclasses.replace(base, **parsed)
+        errors.extend(f"guild {guild_id}: {e}" for e in validate(config))
+        overrides[int(guild_id)] = config
+
+    if errors:
+        raise ConfigError("Invalid guild configuration:\n- " + "\n- ".join(errors))
+    return overrides
+
+# module-level config, set once by init_config()
+_base: Optional[BracketConfig] = None
+_overrides: Dict[int, BracketConfig] = {}
+
+def init_config(environ: Optional[Mapping[str, str]] = None) -> BracketConfig:
+    """
+    Load, validate and freeze the config for this process.
+    """
+    global _base, _overrides
+    base = load_config(environ)
+    _overrides = load_guild_overrides(base, base.guild_config_file)
+    _base = base
+    return base
+
+def get_config(guild_id: Optional[int] = None) -> BracketConfig:
+    """
+    The config for a guild (its overrides applied), or the base config.
+    """
+    if _base is None:
+        raise ConfigError("Config has not been loaded, call init_config() first")
+    if guild_id is None:
+        return _base
+    return _overrides.get(guild_id, _base)
@@ -0,0 +1,119 @@
+# edit_coalescer.py
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import discord
+
+log = logging.getLogger(__name__)
+
+@dataclass
+class PendingEdit:
+    guild_id: int
+    message: discord.Message
+    fields: Dict[str, Any] = field(default_factory=dict)
+
+class EditCoalescer:
+    """
+    Write-behind message edits.
+
+    schedule() only records the latest desired fields for a message; a timer
+    sends a single edit at most once per `interval` seconds per message, so any
+    intermediate states in between are dropped. flush() pushes everything
+    pending right away and waits for edits already in flight.
+    """
+    def __init__(
+        self,
+        interval: float = 1.0,
+        on_edited: Optional[Callable[[int, discord.Message], Any]] = None,
+        edit: Optional[Callable[[discord.Message, Dict[str, Any]], Awaitable[discord.Message]]] = None,
+    ):
+        self.interval = interval
+        self.on_edited = on_edited
+        # how an edit is actually sent, e.g. through the outbound scheduler
+        self.edit = edit or (lambda message, fields: message.edit(**fields))
+        self.scheduled = 0
+        self.coalesced = 0
+        self.sent = 0
+        self._pending: Dict[int, PendingEdit] = {}
+        self._timers: Dict[int, asyncio.Task] = {}
+        self._locks: Dict[int, asyncio.Lock] = {}
+        self._guild_of: Dict[int, int] = {}
+        self._last_sent: Dict[int, float] = {}
+
+    def schedule(self, guild_id: int, message: discord.Message, **fields) -> None:
+        """
+        Record the content (or any other edit() kwargs) a message should end up with.
+        """
+        self.scheduled += 1
+        pending = self._pending.get(message.id)
+        if pending is None:
+            self._pending[message.id] = PendingEdit(guild_id, message, dict(fields))
+        else:
+            pending.message = message
+            pending.fields.update(fields)
+            self.coalesced += 1
+        self._guild_of[message.id] = guild_id
+
+        if message.id not in self._timers:
+            delay = max(0.0, self._last_sent.get(message.id, 0.0) + self.interval - time.monotonic())
+            self._timers[message.id] = asyncio.create_task(self._flush_later(message.id, delay))
+
+    async def _flush_later(self, message_id: int, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._timers.pop(message_id, None)
+        await self._flush_one(message_id)
+
+    async def _flush_one(self, message_id: int) -> None:
+        lock = self._locks.setdefault(message_id, asyncio.Lock())
+        # one edit in flight per message so an older state never lands last
+        async with lock:
+            pending = self._pending.pop(message_id, None)
+            if pending is None:
+                return
+            self._last_sent[message_id] = time.monotonic()
+            try:
+                edited = await self.edit(pending.message, pending.fields)
+            except discord.HTTPException as e:
+                log.warning("Error editing message %s: %s", message_id, e, extra={"guild": pending.guild_id})
+                return
+            self.sent += 1
+            if self.on_edited is not None:
+                self.on_edited(pending.guild_id, edited)
+
+    async def flush(self, guild_id: Optional[int] = None) -> None:
+        """
+        Send every pending edit (for one guild, or all) now, without waiting for timers.
+        """
+        message_ids = [mid for mid, gid in self._guild_of.items() if guild_id is None or gid == guild_id]
+        for message_id in message_ids:
+            timer = self._timers.pop(message_id, None)
+            if timer is not None:
+                timer.cancel()
+        await asyncio.gather(*(self._flush_one(message_id) for message_id in message_ids))
+        self._forget(message_ids)
+
+    def discard(self, guild_id: int) -> None:
+        """
+        Drop pending edits for a guild without sending them, e.g. on reset.
+        """
+        message_ids = [mid for mid, gid in self._guild_of.items() if gid == guild_id]
+        for message_id in message_ids:
+            timer = self._timers.pop(message_id, None)
+            if timer is not None:
+                timer.cancel()
+            self._pending.pop(message_id, None)
+        self._forget(message_ids)
+
+    def _forget(self, message_ids) -> None:
+        for message_id in message_ids:
+            if message_id in self._pending or message_id in self._timers:
+                continue
+            self._guild_of.pop(message_id, None)
+            self._last_sent.pop(message_id, None)
+            lock = self._locks.get(message_id)
+            if lock is not None and not lock.locked():
+                self._locks.pop(message_id, None)
@@ -0,0 +1,159 @@
+# event_trace.py
+
+import gzip
+import json
+import os
+import time
+from typing import Any, Callable, Dict, Iterator, Optional
+
+TRACE_VERSION = 1
+
+# flush the compressed stream at most this often, a crash loses at most this much
+FLUSH_INTERVAL = 1.0
+
+class EventTrace:
+    """
+    Opt-in recorder of the gateway events the bot handles.
+
+    Writes one compact JSON record per line into a gzip file: a header, the
+    settings of every guild seen, each user event (messages, reactions,
+    commands, button clicks) with its offset in milliseconds, every message
+    the bot posted (so replay can map message IDs) and the guild's stage
+    whenever a handler changed it. replay.py feeds a trace back through
+    the handlers.
+    """
+    def __init__(self, path: str, guild_settings: Callable[[int], Dict[str, Any]]):
+        self.path = path
+        self.guild_settings = guild_settings
+        self.records = 0
+        self.bot_user_id: Optional[int] = None
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._started = time.monotonic()
+        self._flushed = self._started
+        self._guilds: set = set()
+        self._states: Dict[int, Dict[str, Any]] = {}
+        self._posts: Dict[int, int] = {}
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        record["t"] = int((time.monotonic() - self._started) * 1000)
+        self._file.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self.records += 1
+        now = time.monotonic()
+        if now - self._flushed >= FLUSH_INTERVAL:
+            self._file.flush()
+            self._flushed = now
+
+    def _guild(self, guild_id: int) -> None:
+        if guild_id in self._guilds:
+            return
+        self._guilds.add(guild_id)
+        self._write({"e": "guild", "g": guild_id, "config": self.guild_settings(guild_id)})
+
+    def start(self, bot_user_id: int) -> None:
+        """
+        Write the header, once, when the bot user is known. on_ready fires
+        again after reconnects.
+        """
+        if self.bot_user_id is not None:
+            return
+        self.bot_user_id = bot_user_id
+        self._write({"e": "header", "v": TRACE_VERSION, "bot": bot_user_id, "wall": time.time()})
+
+    def message(self, message) -> None:
+        guild_id = message.guild.id
+        self._guild(guild_id)
+        self._write({
+            "e": "message",
+            "g": guild_id,
+            "c": message.channel.id,
+            "cn": message.channel.name,
+            "u": message.author.id,
+            "un": getattr(message.author, "display_name", None),
+            "x": message.content,
+        })
+
+    def post(self, message) -> None:
+        """
+        A message the bot sent itself. Replay matches them up by order.
+        """
+        guild_id = message.guild.id
+        self._guild(guild_id)
+        index = self._posts.get(guild_id, 0)
+        self._posts[guild_id] = index + 1
+        self._write({"e": "post", "g": guild_id, "c": message.channel.id, "cn": message.channel.name, "m": message.id, "i": index})
+
+    def reaction(self, kind: str, payload) -> None:
+        self._guild(payload.guild_id)
+        member = getattr(payload, "member", None)
+        self._write({
+            "e": kind,
+            "g": payload.guild_id,
+            "c": payload.channel_id,
+            "m": payload.message_id,
+            "u": payload.user_id,
+            "un": getattr(member, "display_name", None),
+            "em": str(payload.emoji),
+        })
+
+    def command(self, interaction, name: str, **options) -> None:
+        self._guild(interaction.guild_id)
+        self._write({
+            "e": "command",
+            "g": interaction.guild_id,
+            "u": interaction.user.id,
+            "un": getattr(interaction.user, "display_name", None),
+            "n": name,
+            "o": {k: v for k, v in options.items() if v is not None},
+        })
+
+    def button(self, interaction, custom_id: str) -> None:
+        self._guild(interaction.guild_id)
+        self._write({
+            "e": "button",
+            "g": interaction.guild_id,
+            "u": interaction.user.id,
+            "un": getattr(interaction.user, "display_name", None),
+            "id": custom_id,
+        })
+
+    def state(self, guild_id: int, summary: Dict[str, Any]) -> None:
+        """
+        Record the guild's state after a handler, only when it changed.
+        """
+        if self._states.get(guild_id) == summary:
+            return
+        self._states[guild_id] = summary
+        self._write({"e": "state", "g": guild_id, "s": summary})
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+def open_trace(directory: str, guild_settings: Callable[[int], Dict[str, Any]]) -> Optional[EventTrace]:
+    """
+    Start a new trace file in `directory`, or None when tracing is off.
+    Every run (and every shard worker) gets its own file.
+    """
+    if not directory:
+        return None
+    os.makedirs(directory, exist_ok=True)
+    name = time.strftime("trace_%Y%m%d_%H%M%S") + f"_{os.getpid()}.jsonl.gz"
+    return EventTrace(os.path.join(directory, name), guild_settings)
+
+def read_trace(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the records of a trace file. A file cut short by a crash is read
+    up to its last complete record.
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        try:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    return
+        except EOFError:
+            return
@@ -0,0 +1,386 @@
+# fake_discord.py
+
+import asyncio
+import itertools
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import discord
+
+class FakeUser:
+    """
+    Stands in for discord.User / discord.Member.
+    """
+    def __init__(self, gateway: "FakeGateway", user_id: int, name: str, bot: bool = False):
+        self._gateway = gateway
+        self.id = user_id
+        self.name = name
+        self.display_name = name
+        self.bot = bot
+        self.mention = f"<@{user_id}>"
+
+    async def send(self, content: Optional[str] = None, **kwargs):
+        self._gateway.record_api("dm")
+        return None
+
+    def __str__(self) -> str:
+        return self.name
+
+class FakeRole:
+    def __init__(self, role_id: int):
+        self.id = role_id
+
+class FakeMessage:
+    """
+    Stands in for discord.Message. Reactions and edits are counted as API
+    calls and echoed back through the gateway like Discord would.
+    """
+    def __init__(self, gateway: "FakeGateway", message_id: int, channel: "FakeChannel", author: FakeUser, content: str, view: Optional[discord.ui.View] = None):
+        self._gateway = gateway
+        self.id = message_id
+        self.channel = channel
+        self.guild = channel.guild
+        self.author = author
+        self.content = content
+        self.view = view
+        self.interaction = None
+
+    async def edit(self, content: Optional[str] = None, view: Optional[discord.ui.View] = None, **kwargs) -> "FakeMessage":
+        self._gateway.record_api("edit", self.guild.id)
+        if content is not None:
+            self.content = content
+        if view is not None:
+            self.view = view
+        return self
+
+    async def delete(self) -> None:
+        self._gateway.record_api("delete", self.guild.id)
+        self._gateway.messages.pop(self.id, None)
+
+    async def add_reaction(self, emoji: str) -> None:
+        self._gateway.record_api("reaction_add", self.guild.id)
+        self._gateway.react(self, self._gateway.bot_user, str(emoji))
+
+    async def remove_reaction(self, emoji: str, member) -> None:
+        self._gateway.record_api("reaction_remove", self.guild.id)
+        self._gateway.unreact(self, member.id, str(emoji))
+
+class FakeChannel:
+    """
+    Stands in for discord.TextChannel.
+    """
+    def __init__(self, gateway: "FakeGateway", channel_id: int, guild: "FakeGuild", name: str):
+        self._gateway = gateway
+        self.id = channel_id
+        self.guild = guild
+        self.name = name
+        self.mention = f"<#{channel_id}>"
+        self._overwrites: Dict[int, discord.PermissionOverwrite] = {}
+
+    async def send(self, content: Optional[str] = None, *, file: Optional[discord.File] = None, view: Optional[discord.ui.View] = None, **kwargs) -> FakeMessage:
+        self._gateway.record_api("send", self.guild.id)
+        if file is not None:
+            file.close()
+        return self._gateway.post(self, self._gateway.bot_user, content or "", view)
+
+    def get_partial_message(self, message_id: int):
+        return self._gateway.messages.get(message_id) or FakeMessage(self._gateway, message_id, self, self._gateway.bot_user, "")
+
+    async def fetch_message(self, message_id: int) -> FakeMessage:
+        self._gateway.record_api("fetch_message", self.guild.id)
+        message = self._gateway.messages.get(message_id)
+        if message is None:
+            raise discord.NotFound(_FakeResponse(404), "Unknown Message")
+        return message
+
+    def overwrites_for(self, role) -> discord.PermissionOverwrite:
+        current = self._overwrites.get(role.id, discord.PermissionOverwrite())
+        return discord.PermissionOverwrite(**dict(current))
+
+    def permissions_for(self, role) -> discord.Permissions:
+        overwrite = self._overwrites.get(role.id, discord.PermissionOverwrite())
+        allow, deny = overwrite.pair()
+        base = discord.Permissions.text()
+        return discord.Permissions((base.value & ~deny.value) | allow.value)
+
+    async def set_permissions(self, role, *, overwrite: discord.PermissionOverwrite) -> None:
+        self._gateway.record_api("permissions", self.guild.id)
+        self._overwrites[role.id] = overwrite
+
+    def can_send(self) -> bool:
+        return self.permissions_for(self.guild.default_role).send_messages
+
+class FakeGuild:
+    """
+    Stands in for discord.Guild.
+    """
+    def __init__(self, gateway: "FakeGateway", guild_id: int, name: str):
+        self._gateway = gateway
+        self.id = guild_id
+        self.name = name
+        self.default_role = FakeRole(guild_id)
+        self.text_channels: List[FakeChannel] = []
+        self._members: Dict[int, FakeUser] = {}
+
+    @property
+    def members(self) -> List[FakeUser]:
+        if not self._gateway.member_cache:
+            return [self._gateway.bot_user]
+        return list(self._members.values())
+
+    @property
+    def member_count(self) -> int:
+        return len(self._members)
+
+    def get_channel(self, channel_id: int) -> Optional[FakeChannel]:
+        return next((c for c in self.text_channels if c.id == channel_id), None)
+
+    def get_member(self, user_id: int) -> Optional[FakeUser]:
+        # without the members intent only the bot itself is cached
+        if not self._gateway.member_cache and user_id != self._gateway.bot_user.id:
+            return None
+        return self._members.get(user_id)
+
+class _FakeResponse:
+    """
+    Just enough of an aiohttp response for discord.HTTPException.
+    """
+    def __init__(self, status: int):
+        self.status = status
+        self.reason = "Fake"
+
+class FakeInteractionResponse:
+    def __init__(self, gateway: "FakeGateway", guild_id: int):
+        self._gateway = gateway
+        self._guild_id = guild_id
+        self._done = False
+        self.messages: List[str] = []
+        self.view = None
+
+    def is_done(self) -> bool:
+        return self._done
+
+    def _show(self, view) -> None:
+        # ephemeral messages stay clickable until their user dismisses them
+        self.view = view
+        if view is not None:
+            items = self._gateway.ephemeral_items.setdefault(self._guild_id, {})
+            for item in view.children:
+                items[item.custom_id] = item
+
+    async def send_message(self, content: Optional[str] = None, **kwargs) -> None:
+        self._gateway.record_api("interaction", self._guild_id)
+        self._done = True
+        self.messages.append(content or "")
+        self._show(kwargs.get("view"))
+
+    async def edit_message(self, content: Optional[str] = None, **kwargs) -> None:
+        self._gateway.record_api("interaction", self._guild_id)
+        self._done = True
+        self.messages.append(content or "")
+        self._show(kwargs.get("view"))
+
+    async def defer(self, **kwargs) -> None:
+        self._gateway.record_api("interaction", self._guild_id)
+        self._done = True
+
+class FakeFollowup:
+    def __init__(self, gateway: "FakeGateway", response: FakeInteractionResponse):
+        self._gateway = gateway
+        self._response = response
+
+    async def send(self, content: Optional[str] = None, **kwargs) -> None:
+        self._gateway.record_api("interaction", self._response._guild_id)
+        self._response.messages.append(content or "")
+        self._response._show(kwargs.get("view"))
+
+class FakeInteraction:
+    """
+    Stands in for discord.Interaction for slash commands and button clicks.
+    """
+    def __init__(self, gateway: "FakeGateway", guild: FakeGuild, user: FakeUser, custom_id: Optional[str] = None):
+        self.guild = guild
+        self.guild_id = guild.id
+        self.user = user
+        self.data = {"custom_id": custom_id} if custom_id is not None else {}
+        self.response = FakeInteractionResponse(gateway, guild.id)
+        self.followup = FakeFollowup(gateway, self.response)
+
+    async def edit_original_response(self, content: Optional[str] = None, **kwargs) -> None:
+        # after a deferred click the original response is the clicked message
+        await self.response.edit_message(content, **kwargs)
+
+@dataclass
+class FakeReactionPayload:
+    """
+    Stands in for discord.RawReactionActionEvent.
+    """
+    guild_id: int
+    channel_id: int
+    message_id: int
+    user_id: int
+    emoji: str
+    member: Optional[FakeUser] = None
+
+class FakeGateway:
+    """
+    The fake Discord: owns guilds, channels, users and messages, counts every
+    API call the bot makes and delivers gateway events to the bot's handlers.
+
+    install(bot) points the bot's cache lookups at this gateway so the real
+    handlers run unmodified.
+    """
+    def __init__(self, bot_user_id: int = 1000):
+        self._ids = itertools.count(1 << 32)
+        self.api_calls: Counter = Counter()
+        self.api_calls_by_guild: Dict[int, Counter] = {}
+        self.events: Counter = Counter()
+        self.event_latencies: Dict[str, List[float]] = {}
+        self.errors: Counter = Counter()
+        self.guilds: Dict[int, FakeGuild] = {}
+        self.channels: Dict[int, FakeChannel] = {}
+        self.users: Dict[int, FakeUser] = {}
+        self.messages: Dict[int, FakeMessage] = {}
+        self.posted: Dict[int, List[FakeMessage]] = {}
+        self.reactions: Dict[int, Dict[str, set]] = {}
+        self.ephemeral_items: Dict[int, Dict[str, Any]] = {}
+        self.member_cache = True
+        self.bot_user = FakeUser(self, bot_user_id, "Mr Bracket", bot=True)
+        self.users[bot_user_id] = self.bot_user
+        self._handlers: Dict[str, Callable[..., Awaitable[Any]]] = {}
+        self._tasks: set = set()
+
+    def next_id(self) -> int:
+        return next(self._ids)
+
+    # ─── world building ──────────────────────────────────────────
+    def add_guild(self, name: str = "Sim Guild", guild_id: Optional[int] = None) -> FakeGuild:
+        guild = FakeGuild(self, guild_id or self.next_id() << 22, name)
+        guild._members[self.bot_user.id] = self.bot_user
+        self.guilds[guild.id] = guild
+        return guild
+
+    def add_channel(self, guild: FakeGuild, name: str, channel_id: Optional[int] = None) -> FakeChannel:
+        channel = FakeChannel(self, channel_id or self.next_id(), guild, name)
+        guild.text_channels.append(channel)
+        self.channels[channel.id] = channel
+        return channel
+
+    def add_user(self, guild: FakeGuild, name: str, user_id: Optional[int] = None) -> FakeUser:
+        user = FakeUser(self, user_id or self.next_id(), name)
+        self.users[user.id] = user
+        guild._members[user.id] = user
+        return user
+
+    # ─── bot wiring ──────────────────────────────────────────────
+    def install(self, bot, on_message, on_raw_reaction_add, on_raw_reaction_remove, on_interaction_event=None) -> None:
+        """
+        Point a real discord.py client at this gateway. `on_interaction_event`
+        is the bot's own on_interaction, run before the command or button.
+        """
+        bot._connection.user = self.bot_user
+        bot.get_guild = self.guilds.get
+        bot.get_channel = self.channels.get
+        bot.get_user = self.users.get
+        bot.get_partial_messageable = lambda channel_id, guild_id=None, **kwargs: self.channels.get(channel_id)
+
+        async def process_commands(message):
+            return None
+        bot.process_commands = process_commands
+
+        async def on_interaction(callback, interaction):
+            if on_interaction_event is not None:
+                await on_interaction_event(interaction)
+            await callback(interaction)
+
+        self._handlers = {
+            "on_message": on_message,
+            "on_raw_reaction_add": on_raw_reaction_add,
+            "on_raw_reaction_remove": on_raw_reaction_remove,
+            "on_interaction": on_interaction,
+        }
+
+    def record_api(self, kind: str, guild_id: Optional[int] = None) -> None:
+        self.api_calls[kind] += 1
+        if guild_id is not None:
+            self.api_calls_by_guild.setdefault(guild_id, Counter())[kind] += 1
+
+    def dispatch(self, event: str, *args) -> asyncio.Task:
+        """
+        Deliver a gateway event on its own task, like discord.py does, and
+        time it from dispatch until the handler returns.
+        """
+        self.events[event] += 1
+        handler = self._handlers[event]
+
+        async def run():
+            started = time.perf_counter()
+            try:
+                await handler(*args)
+            except Exception as e:
+                self.events[f"{event}_error"] += 1
+                self.errors[f"{event}: {e!r}"] += 1
+            finally:
+                self.event_latencies.setdefault(event, []).append(time.perf_counter() - started)
+
+        task = asyncio.create_task(run())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def drain(self) -> None:
+        """
+        Wait until every dispatched event (and any it triggered) has been handled.
+        """
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks))
+
+    # ─── user actions / gateway echoes ───────────────────────────
+    def post(self, channel: FakeChannel, author: FakeUser, content: str, view: Optional[discord.ui.View] = None) -> FakeMessage:
+        message = FakeMessage(self, self.next_id(), channel, author, content, view)
+        self.messages[message.id] = message
+        if author is self.bot_user:
+            self.posted.setdefault(channel.guild.id, []).append(message)
+        self.dispatch("on_message", message)
+        return message
+
+    def user_post(self, channel: FakeChannel, author: FakeUser, content: str) -> Optional[asyncio.Task]:
+        """
+        A user typing in a channel. Returns None when the channel is locked.
+        """
+        if not channel.can_send():
+            return None
+        message = FakeMessage(self, self.next_id(), channel, author, content)
+        self.messages[message.id] = message
+        return self.dispatch("on_message", message)
+
+    def react(self, message: FakeMessage, user: FakeUser, emoji: str) -> Optional[asyncio.Task]:
+        users = self.reactions.setdefault(message.id, {}).setdefault(emoji, set())
+        if user.id in users:
+            return None
+        users.add(user.id)
+        payload = FakeReactionPayload(message.guild.id, message.channel.id, message.id, user.id, emoji, user)
+        return self.dispatch("on_raw_reaction_add", payload)
+
+    def unreact(self, message: FakeMessage, user_id: int, emoji: str) -> Optional[asyncio.Task]:
+        users = self.reactions.get(message.id, {}).get(emoji, set())
+        if user_id not in users:
+            return None
+        users.discard(user_id)
+        payload = FakeReactionPayload(message.guild.id, message.channel.id, message.id, user_id, emoji)
+        return self.dispatch("on_raw_reaction_remove", payload)
+
+    def interaction(self, guild: FakeGuild, user: FakeUser, custom_id: Optional[str] = None) -> FakeInteraction:
+        return FakeInteraction(self, guild, user, custom_id)
+
+    def interact(self, guild: FakeGuild, user: FakeUser, callback: Callable[[FakeInteraction], Awaitable[Any]], custom_id: Optional[str] = None) -> Tuple[FakeInteraction, asyncio.Task]:
+        """
+        A user running a slash command or clicking a button.
+        """
+        interaction = self.interaction(guild, user, custom_id)
+        return interaction, self.dispatch("on_interaction", callback, interaction)
+
+    def messages_in(self, channel: FakeChannel) -> List[FakeMessage]:
+        return [m for m in self.messages.values() if m.channel is channel]
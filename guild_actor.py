@@ -0,0 +1,157 @@
+# guild_actor.py
+
+import asyncio
+import contextvars
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+# set while an actor is running a handler, so nested submits run inline
+_running_guild: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar("running_guild", default=None)
+
+log = logging.getLogger(__name__)
+
+def current_guild() -> Optional[int]:
+    """
+    The guild whose actor is running the current task, None outside of one.
+    """
+    return _running_guild.get()
+
+@dataclass
+class MailboxStats:
+    """
+    Running totals for a single guild mailbox. Times are in seconds.
+    """
+    processed: int = 0
+    failed: int = 0
+    total_wait: float = 0.0
+    total_latency: float = 0.0
+    last_latency: float = 0.0
+    max_latency: float = 0.0
+
+    @property
+    def avg_latency(self) -> float:
+        return self.total_latency / self.processed if self.processed else 0.0
+
+    @property
+    def avg_wait(self) -> float:
+        return self.total_wait / self.processed if self.processed else 0.0
+
+class GuildActor:
+    """
+    Owns a bounded mailbox for one guild and runs its handlers one at a time,
+    in the order they were submitted.
+    """
+    def __init__(self, guild_id: int, maxsize: int, on_processed: Optional[Callable[[int], None]] = None):
+        self.guild_id = guild_id
+        self.on_processed = on_processed
+        self.stats = MailboxStats()
+        self._mailbox: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def queue_depth(self) -> int:
+        return self._mailbox.qsize()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name=f"guild-actor-{self.guild_id}")
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def submit(self, handler: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """
+        Queue handler(*args, **kwargs) and wait for its result.
+        Blocks while the mailbox is full. Calls made from inside this
+        guild's own handler run inline to avoid waiting on ourselves.
+        """
+        if _running_guild.get() == self.guild_id:
+            return await handler(*args, **kwargs)
+
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._mailbox.put((handler, args, kwargs, future, time.perf_counter()))
+        return await future
+
+    async def _run(self) -> None:
+        _running_guild.set(self.guild_id)
+        while True:
+            handler, args, kwargs, future, enqueued_at = await self._mailbox.get()
+            started_at = time.perf_counter()
+            try:
+                # the caller may have given up waiting, the event still gets processed
+                result = await handler(*args, **kwargs)
+            except asyncio.CancelledError:
+                if not future.done():
+                    future.cancel()
+                raise
+            except Exception as e:
+                self.stats.failed += 1
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+            finally:
+                latency = time.perf_counter() - started_at
+                self.stats.processed += 1
+                self.stats.total_wait += started_at - enqueued_at
+                self.stats.total_latency += latency
+                self.stats.last_latency = latency
+                self.stats.max_latency = max(self.stats.max_latency, latency)
+                self._mailbox.task_done()
+                if self.on_processed is not None:
+                    try:
+                        self.on_processed(self.guild_id)
+                    except Exception:
+                        log.exception("Error in on_processed", extra={"guild": self.guild_id})
+
+class GuildActors:
+    """
+    Registry of per-guild actors. Different guilds process concurrently,
+    events for the same guild are serialized through its mailbox.
+    """
+    def __init__(self, mailbox_size: int = 1000, on_processed: Optional[Callable[[int], None]] = None):
+        self.mailbox_size = mailbox_size
+        self.on_processed = on_processed
+        self._actors: Dict[int, GuildActor] = {}
+
+    def get(self, guild_id: int) -> GuildActor:
+        actor = self._actors.get(guild_id)
+        if actor is None:
+            actor = GuildActor(guild_id, self.mailbox_size, self.on_processed)
+            self._actors[guild_id] = actor
+        return actor
+
+    async def submit(self, guild_id: int, handler: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        return await self.get(guild_id).submit(handler, *args, **kwargs)
+
+    def queue_depth(self, guild_id: int) -> int:
+        actor = self._actors.get(guild_id)
+        return actor.queue_depth if actor else 0
+
+    def stats(self) -> Dict[int, Dict[str, float]]:
+        """
+        Snapshot of queue depth and processing latency for every known guild.
+        """
+        return {
+            guild_id: {
+                "queue_depth": actor.queue_depth,
+                "processed": actor.stats.processed,
+                "failed": actor.stats.failed,
+                "avg_wait": actor.stats.avg_wait,
+                "avg_latency": actor.stats.avg_latency,
+                "last_latency": actor.stats.last_latency,
+                "max_latency": actor.stats.max_latency,
+            }
+            for guild_id, actor in self._actors.items()
+        }
+
+    def stop(self, guild_id: int) -> None:
+        actor = self._actors.pop(guild_id, None)
+        if actor is not None:
+            actor.stop()
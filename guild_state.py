@@ -1,38 +1,190 @@
 # guild_state.py
 
-from typing import Any, Dict, Optional
+import asyncio
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Set
+
+def shard_for_guild(guild_id: int, shard_count: int) -> int:
+    """
+    Discord's shard routing formula, the shard that receives a guild's events.
+    """
+    return (guild_id >> 22) % shard_count if shard_count > 1 else 0
+
+class MemoryGuildStore:
+    """
+    In-process guild state, partitioned by shard.
+    """
+    def __init__(self, shard_count: int = 1):
+        self.shard_count = shard_count
+        self._partitions: Dict[int, Dict[int, Dict[str, Any]]] = {}
+
+    def _partition(self, guild_id: int) -> Dict[int, Dict[str, Any]]:
+        return self._partitions.setdefault(shard_for_guild(guild_id, self.shard_count), {})
+
+    def get(self, guild_id: int) -> Optional[Dict[str, Any]]:
+        return self._partition(guild_id).get(guild_id)
+
+    def setdefault(self, guild_id: int) -> Dict[str, Any]:
+        return self._partition(guild_id).setdefault(guild_id, {})
+
+    def commit(self, guild_id: int, key: str) -> None:
+        """
+        Called after one of a guild's vars changed. Nothing to do in memory.
+        """
+        return None
+
+    def clear(self, guild_id: int) -> None:
+        self._partition(guild_id).pop(guild_id, None)
+
+class FileGuildStore(MemoryGuildStore):
+    """
+    Store that mirrors each guild to {root}/shard_{shard}/guild_{guild_id}.pkl
+    so state survives a worker restart and can stand in for the shared store
+    in tests. Values that cannot be pickled (live discord objects) stay in
+    memory only.
+
+    Changed vars are collected and flushed once the current event loop
+    iteration is done: only they are pickled again, the rest of the file
+    reuses the bytes of the last flush, and the file is written on a
+    background thread so a vote never waits on the disk.
+    """
+    def __init__(self, root: str = "state", shard_count: int = 1):
+        super().__init__(shard_count)
+        self.root = root
+        self._pickled: Dict[int, Dict[str, bytes]] = {}
+        self._dirty: Dict[int, Set[str]] = {}
+        # guilds whose file is being removed, never read back from disk
+        self._cleared: Set[int] = set()
+        # a single writer keeps each guild's writes in order
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="guild-state")
+
+    def _path(self, guild_id: int) -> str:
+        shard = shard_for_guild(guild_id, self.shard_count)
+        return os.path.join(self.root, f"shard_{shard}", f"guild_{guild_id}.pkl")
+
+    def get(self, guild_id: int) -> Optional[Dict[str, Any]]:
+        state = super().get(guild_id)
+        if state is None and guild_id not in self._cleared:
+            state = self._load(guild_id)
+        return state
+
+    def setdefault(self, guild_id: int) -> Dict[str, Any]:
+        state = self.get(guild_id)
+        return state if state is not None else super().setdefault(guild_id)
+
+    def _load(self, guild_id: int) -> Optional[Dict[str, Any]]:
+        path = self._path(guild_id)
+        if not os.path.isfile(path):
+            return None
+        with open(path, "rb") as f:
+            pickled = pickle.load(f)
+        state = {key: pickle.loads(data) for key, data in pickled.items()}
+        self._partition(guild_id)[guild_id] = state
+        self._pickled[guild_id] = pickled
+        return state
+
+    def commit(self, guild_id: int, key: str) -> None:
+        dirty = self._dirty.get(guild_id)
+        if dirty is None:
+            dirty = self._dirty[guild_id] = set()
+            try:
+                asyncio.get_running_loop().call_soon(self.flush, guild_id)
+            except RuntimeError:
+                # no event loop, e.g. a script, write right away
+                dirty.add(key)
+                self.flush(guild_id)
+                return
+        dirty.add(key)
+
+    def flush(self, guild_id: int) -> None:
+        """
+        Pickle a guild's changed vars and queue the file write.
+        """
+        dirty = self._dirty.pop(guild_id, None)
+        if not dirty:
+            return
+        state = super().get(guild_id) or {}
+        pickled = self._pickled.setdefault(guild_id, {})
+        for key in dirty:
+            pickled.pop(key, None)
+            if key in state:
+                try:
+                    pickled[key] = pickle.dumps(state[key])
+                except Exception:
+                    continue
+        self._writer.submit(self._write, self._path(guild_id), dict(pickled))
+
+    def flush_all(self) -> None:
+        """
+        Flush every guild and wait for the writes, e.g. before shutting down.
+        """
+        for guild_id in list(self._dirty):
+            self.flush(guild_id)
+        self._writer.submit(lambda: None).result()
+
+    @staticmethod
+    def _write(path: str, pickled: Dict[str, bytes]) -> None:
+        if not pickled:
+            if os.path.isfile(path):
+                os.remove(path)
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(pickled, f)
+        os.replace(tmp_path, path)
+
+    def clear(self, guild_id: int) -> None:
+        super().clear(guild_id)
+        self._dirty.pop(guild_id, None)
+        self._pickled.pop(guild_id, None)
+        self._cleared.add(guild_id)
+        self._writer.submit(self._write, self._path(guild_id), {})
 
 # module-level storage
-_guild_vars: Dict[int, Dict[str, Any]] = {}
+_store: MemoryGuildStore = MemoryGuildStore()
+
+def configureStore(store: MemoryGuildStore) -> None:
+    """
+    Swap the backing store, e.g. a FileGuildStore for sharded workers or tests.
+    """
+    global _store
+    _store = store
+
+def getStore() -> MemoryGuildStore:
+    return _store
 
 def setGuildVar(guild_id: int, key: str, value: Any = None) -> None:
     """
-    Set a guild-scoped var.  
+    Set a guild-scoped var.
     If value is None or empty string, delete the key.
     """
-    state = _guild_vars.setdefault(guild_id, {})
+    state = _store.setdefault(guild_id)
     if value is None or (isinstance(value, str) and value == ""):
         state.pop(key, None)
         if not state:
-            _guild_vars.pop(guild_id, None)
+            _store.clear(guild_id)
+            return
     else:
         state[key] = value
+    _store.commit(guild_id, key)
 
 def getGuildVar(guild_id: int, key: str, default: Any = None) -> Optional[Any]:
     """
     Retrieve a guild-scoped var, or default if missing.
     """
-    return _guild_vars.get(guild_id, {}).get(key, default)
+    return (_store.get(guild_id) or {}).get(key, default)
 
 def clearGuild(guild_id: int) -> None:
     """
     Clear all variables for a specific guild.
-    
+
     Args:
         guild_id: The ID of the guild to clear data for
-        
+
     Returns:
         None
     """
-    if guild_id in _guild_vars:
-        _guild_vars.pop(guild_id)
\ No newline at end of file
+    _store.clear(guild_id)
@@ -1,6 +1,5 @@
 from PIL import Image, ImageDraw, ImageFont
 import os
-import requests
 from typing import Optional, List
 from bracketool.domain import Competitor, Clash
 from diagrams import Diagram, Node, Edge, Cluster
@@ -0,0 +1,102 @@
+# leaderboard.py
+
+import heapq
+from typing import List, Sequence, Tuple
+
+class Leaderboard:
+    """
+    A pool's standings while it votes: an indexed max-heap over the
+    submissions' scores, updated with every vote instead of sorted at
+    /confirm. Equal scores keep ballot order, the same order a stable sort
+    of the submissions gives, so the qualifiers do not change.
+
+    Submissions are referred to by their index on the ballot, the list of
+    round submissions is fixed once a pool starts voting.
+    """
+    def __init__(self, names: Sequence[str]):
+        self.index = {name: i for i, name in enumerate(names)}
+        self.scores: List[float] = [0] * len(names)
+        # heap slot -> submission index and back, every score starts at 0 so ballot order is a valid heap
+        self.heap: List[int] = list(range(len(names)))
+        self.position: List[int] = list(range(len(names)))
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def add(self, name: str, amount: float = 1) -> None:
+        submission = self.index.get(name)
+        if submission is None:
+            return
+        self.scores[submission] += amount
+        slot = self.position[submission]
+        if amount > 0:
+            self._sift_up(slot)
+        else:
+            self._sift_down(slot)
+
+    def reset(self, scores: Sequence[float]) -> None:
+        """
+        Replace every score at once, e.g. with fitted strengths, and re-heapify.
+        """
+        self.scores = list(scores)
+        for slot in reversed(range(len(self.heap) // 2)):
+            self._sift_down(slot)
+
+    def top(self, k: int) -> List[int]:
+        """
+        Indexes of the k best submissions, best first. Walks the heap from
+        the root so it costs O(k log k), however long the ballot is.
+        """
+        found = []
+        frontier: List[Tuple[float, int, int]] = []
+        if self.heap and k > 0:
+            frontier.append(self._entry(0))
+        while frontier and len(found) < k:
+            _, submission, slot = heapq.heappop(frontier)
+            found.append(submission)
+            for child in (2 * slot + 1, 2 * slot + 2):
+                if child < len(self.heap):
+                    heapq.heappush(frontier, self._entry(child))
+        return found
+
+    def tied_at(self, k: int) -> bool:
+        """
+        Whether the last qualifying spot ties with the first one left out.
+        """
+        if k < 1 or k >= len(self.heap):
+            return False
+        best = self.top(k + 1)
+        return self.scores[best[k - 1]] == self.scores[best[k]]
+
+    def _entry(self, slot: int) -> Tuple[float, int, int]:
+        submission = self.heap[slot]
+        return (-self.scores[submission], submission, slot)
+
+    def _above(self, a: int, b: int) -> bool:
+        return self.scores[a] > self.scores[b] or (self.scores[a] == self.scores[b] and a < b)
+
+    def _swap(self, i: int, j: int) -> None:
+        heap = self.heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self.position[heap[i]] = i
+        self.position[heap[j]] = j
+
+    def _sift_up(self, slot: int) -> None:
+        while slot > 0:
+            parent = (slot - 1) // 2
+            if not self._above(self.heap[slot], self.heap[parent]):
+                return
+            self._swap(slot, parent)
+            slot = parent
+
+    def _sift_down(self, slot: int) -> None:
+        size = len(self.heap)
+        while True:
+            best = slot
+            for child in (2 * slot + 1, 2 * slot + 2):
+                if child < size and self._above(self.heap[child], self.heap[best]):
+                    best = child
+            if best == slot:
+                return
+            self._swap(slot, best)
+            slot = best
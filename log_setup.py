@@ -0,0 +1,107 @@
+# log_setup.py
+
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import time
+from typing import Any, Callable, Iterable, Optional, Tuple
+
+# optional per-record fields, pass them with extra={...} or let GuildContextFilter fill them in
+STRUCTURED_FIELDS = ("guild", "stage", "event")
+
+class GuildContextFilter(logging.Filter):
+    """
+    Tags records logged while a guild actor runs a handler with that guild
+    and its current stage, so call sites do not have to pass them.
+    """
+    def __init__(self, current_guild: Callable[[], Optional[int]], stage_of: Optional[Callable[[int], Any]] = None):
+        super().__init__()
+        self.current_guild = current_guild
+        self.stage_of = stage_of
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        guild = getattr(record, "guild", None)
+        if guild is None:
+            guild = self.current_guild()
+            record.guild = guild
+        if guild is not None and getattr(record, "stage", None) is None and self.stage_of is not None:
+            record.stage = self.stage_of(guild)
+        return True
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line.
+    """
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(record.created)) + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for field in STRUCTURED_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class ConsoleFormatter(logging.Formatter):
+    """
+    Human readable lines with the structured fields appended.
+    """
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = " ".join(f"{field}={getattr(record, field)}" for field in STRUCTURED_FIELDS if getattr(record, field, None) is not None)
+        return f"{line} [{fields}]" if fields else line
+
+def setup_logging(
+    path: str,
+    level: str = "INFO",
+    module_levels: Iterable[Tuple[str, str]] = (),
+    max_bytes: int = 10 * 1024 * 1024,
+    backup_count: int = 5,
+    console_level: str = "WARNING",
+    context_filter: Optional[logging.Filter] = None,
+) -> logging.handlers.QueueListener:
+    """
+    Route every log record through a queue to a background thread that owns
+    the size-rotated JSON file and the console, so handlers on the event loop
+    never wait on disk. Call stop() on the returned listener at shutdown to
+    flush what is still queued.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    file_handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+    file_handler.setFormatter(JsonFormatter())
+    console_handler = logging.StreamHandler(sys.stderr)
+    console_handler.setLevel(console_level.upper())
+    console_handler.setFormatter(ConsoleFormatter())
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    if context_filter is not None:
+        queue_handler.addFilter(context_filter)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level.upper())
+    for name, module_level in module_levels:
+        logging.getLogger(name).setLevel(module_level)
+
+    listener = logging.handlers.QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    listener.start()
+    return listener
@@ -0,0 +1,54 @@
+# message_cache.py
+
+from collections import OrderedDict
+from typing import Dict, Optional, Set
+
+import discord
+
+class TrackedMessageCache:
+    """
+    Bounded LRU of the voting messages the bot posted, keyed by message id.
+
+    Tracked ids are remembered per guild even after their message object is
+    evicted, so a reaction on a tracked message can tell a cache miss (fetch
+    it once) apart from a message we never cared about (no fetch at all).
+    """
+    def __init__(self, maxsize: int = 512):
+        self.maxsize = maxsize
+        self._messages: "OrderedDict[int, discord.Message]" = OrderedDict()
+        self._tracked: Dict[int, Set[int]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def track(self, guild_id: int, message: Optional[discord.Message]) -> Optional[discord.Message]:
+        """
+        Remember a message (or a newer copy of it, e.g. the result of edit()).
+        Returns the message for chaining.
+        """
+        if message is None:
+            return None
+        self._tracked.setdefault(guild_id, set()).add(message.id)
+        self._messages[message.id] = message
+        self._messages.move_to_end(message.id)
+        while len(self._messages) > self.maxsize:
+            self._messages.popitem(last=False)
+        return message
+
+    def is_tracked(self, guild_id: int, message_id: int) -> bool:
+        return message_id in self._tracked.get(guild_id, ())
+
+    def get(self, message_id: int) -> Optional[discord.Message]:
+        message = self._messages.get(message_id)
+        if message is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._messages.move_to_end(message_id)
+        return message
+
+    def forget_guild(self, guild_id: int) -> None:
+        """
+        Drop every tracked message for a guild, e.g. when a new round starts.
+        """
+        for message_id in self._tracked.pop(guild_id, set()):
+            self._messages.pop(message_id, None)
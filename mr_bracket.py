@@ -1,10 +1,25 @@
-import os
+import json
+import time
 from dataclasses import dataclass
 from bracketool.single_elimination import SingleEliminationGen
 from bracketool.domain import Competitor, Clash as BOClash
-from typing import Optional, List
-from image_gen import ImageGen
-from PIL import ImageFont
+from typing import Dict, Optional, List
+from config import get_config
+
+# image_gen pulls in Pillow, diagrams and graphviz, it is only imported on the
+# first render (or by warm_up) so the bot connects without paying for it
+
+def warm_up() -> float:
+    """
+    Import the rendering modules ahead of the first render and return how
+    long it took. Safe to run in a worker thread.
+    """
+    started = time.perf_counter()
+    import image_gen  # noqa: F401
+    return time.perf_counter() - started
+
+# bump when the snapshot layout changes, from_snapshot rejects versions it does not know
+SNAPSHOT_VERSION = 1
 
 @dataclass
 class ClashInfo:
@@ -16,17 +31,38 @@ class ClashInfo:
     team1: str
     team2: str
 
+class Slot:
+    """
+    One match in the bracket array. Teams are None until someone advances
+    into them, the scores stay None for byes.
+    """
+    __slots__ = ("team1", "team2", "winner", "win_score", "lose_score")
+
+    def __init__(self):
+        self.team1: Optional[str] = None
+        self.team2: Optional[str] = None
+        self.winner: Optional[str] = None
+        self.win_score: Optional[int] = None
+        self.lose_score: Optional[int] = None
+
 class Bracket:
     """
-    Manages a single-elimination bracket using bracketool and diagrams.
+    Single-elimination bracket stored as a heap-indexed array of slots:
+    slot 1 is the final and the children of slot i are 2i and 2i + 1, so
+    each round is a contiguous range and a winner only touches slot i // 2.
+    bracketool seeds the first round, diagrams renders it.
     """
     def __init__(self):
         self.rounds: int = 0
         self._participants: list[tuple[str, int]] = []
-        self._gen: SingleEliminationGen | None = None
-        self._bracket = None
+        self._depth: int = 0
+        self._slots: List[Optional[Slot]] = []
+        # next unresolved slot in play order (round by round, top to bottom), 0 once decided
+        self._cursor: int = 0
+        # team -> slot of its next match
+        self._position: Dict[str, int] = {}
 
-    def add_name(self, name: str, rating: int) -> None:
+    def add_name(self, name: str, rating: float) -> None:
         """
         Add a new participant by name and rating. Seeds are adjusted
         by rating descending. Cannot add once rounds > 0.
@@ -45,13 +81,12 @@ class Bracket:
         if len(self._participants) < 2:
             raise RuntimeError("Need at least two participants to finalize")
 
-        self.rounds = 1
         # sort by rating (highest first) for seeding
         seeds = sorted(self._participants, key=lambda x: x[1], reverse=True)
         # build Competitor objects (no team grouping)
         competitors = [Competitor(name, "", rating) for name, rating in seeds]
 
-        # initialize and generate the bracket structure
+        # bracketool decides the first round pairings, the array takes it from there
         se = SingleEliminationGen(
             use_three_way_final=False,
             third_place_clash=False,
@@ -59,97 +94,207 @@ class Bracket:
             use_teams=False,
             random_seed=None
         )
-        self._gen = se
-        self._bracket = se.generate(competitors)
+        first_round: List[BOClash] = se.generate(competitors).rounds[0]
+
+        self._depth = (len(first_round) - 1).bit_length() + 1
+        first = 1 << (self._depth - 1)
+        self._slots = [None] + [Slot() for _ in range(2 * first - 1)]
+        for offset, bo_clash in enumerate(first_round):
+            slot = self._slots[first + offset]
+            slot.team1 = bo_clash.competitor_a.name if bo_clash.competitor_a else None
+            slot.team2 = bo_clash.competitor_b.name if bo_clash.competitor_b else None
+            for team in (slot.team1, slot.team2):
+                if team is not None:
+                    self._position[team] = first + offset
+
+        self.rounds = 1
+        self._cursor = first
+        # byes advance straight away
+        for index in range(first, 2 * first):
+            slot = self._slots[index]
+            if (slot.team1 is None) != (slot.team2 is None):
+                self._resolve(index, slot.team1 or slot.team2, None, None)
+        self._advance_cursor()
+
+    def _round_range(self, round: int) -> range:
+        first = 1 << (self._depth - round)
+        return range(first, 2 * first)
+
+    def _resolve(self, index: int, winner: str, win_score: Optional[int], lose_score: Optional[int]) -> None:
+        slot = self._slots[index]
+        slot.winner = winner
+        slot.win_score = win_score
+        slot.lose_score = lose_score
+        loser = slot.team2 if winner == slot.team1 else slot.team1
+        if loser is not None and self._position.get(loser) == index:
+            del self._position[loser]
+
+        parent = index >> 1
+        if parent:
+            if index & 1:
+                self._slots[parent].team2 = winner
+            else:
+                self._slots[parent].team1 = winner
+            self._position[winner] = parent
+
+    def _advance_cursor(self) -> None:
+        """
+        Move past resolved slots. The cursor only moves forward, so this is
+        O(1) amortized over the whole bracket.
+        """
+        while self._cursor and self._slots[self._cursor].winner is not None:
+            following = self._cursor + 1
+            # the end of a round is a power of two, the next round starts at a quarter of it
+            self._cursor = following >> 2 if following & (following - 1) == 0 else following
+        self.rounds = self._depth - self._cursor.bit_length() + 1 if self._cursor else self._depth
+
+    def round_size(self, round: Optional[int] = None) -> int:
+        """
+        Number of entrants in a round, the current one by default.
+        """
+        return 2 * len(self._round_range(self.rounds if round is None else round))
 
     def get_next_clash(self) -> ClashInfo:
-        if self.rounds == 0 or self._bracket is None:
+        if self.rounds == 0 or not self._slots:
             raise RuntimeError("Bracket not started")
+        if not self._cursor:
+            raise RuntimeError(f"All clashes resolved for round {self.rounds}")
 
-        matches: List[BOClash] = self._bracket.rounds[self.rounds - 1]
+        slot = self._slots[self._cursor]
+        return ClashInfo(
+            round=self.rounds,
+            index=self._cursor - self._round_range(self.rounds).start,
+            team1=slot.team1,
+            team2=slot.team2
+        )
 
-        for idx, bo_clash in enumerate(matches):
-            if not hasattr(bo_clash, "winner") or bo_clash.winner is None:
-                return ClashInfo(
-                    round=self.rounds,
-                    index=idx,
-                    team1=bo_clash.competitor_a.name,
-                    team2=bo_clash.competitor_b.name
-                )
+    def get_round_clashes(self) -> List[ClashInfo]:
+        """
+        Every unresolved clash of the current round, for playing them at once.
+        """
+        if self.rounds == 0 or not self._slots:
+            raise RuntimeError("Bracket not started")
 
-        raise RuntimeError(f"All clashes resolved for round {self.rounds}")
+        current = self._round_range(self.rounds)
+        return [
+            ClashInfo(round=self.rounds, index=index - current.start, team1=slot.team1, team2=slot.team2)
+            for index in current
+            if (slot := self._slots[index]).winner is None
+        ]
 
     def submit_winner(self, name: str, win_score: int, lose_score: int) -> None:
-        if self.rounds == 0 or self._bracket is None:
+        if self.rounds == 0 or not self._slots:
             raise RuntimeError("Bracket not started")
 
-        # 1) Grab the list of BOClash objects for this round
-        matches: list[BOClash] = self._bracket.rounds[self.rounds - 1]
-
-        # 2) Find the first unresolved clash for 'name'
-        for bo_clash in matches:
-            # treat missing or None as unresolved
-            if not hasattr(bo_clash, "winner") or bo_clash.winner is None:
-                # check if this clash involves the given name
-                a = bo_clash.competitor_a.name
-                b = bo_clash.competitor_b.name
-                if name in (a, b):
-                    # dynamically attach the winner property
-                    setattr(bo_clash, "winner", name)
-                    setattr(bo_clash, "win_score", win_score)
-                    setattr(bo_clash, "lost_score", lose_score)
-                    break
-        else:
+        current = self._round_range(self.rounds)
+        index = self._position.get(name, 0)
+        slot = self._slots[index] if index in current else None
+        if slot is None or slot.winner is not None or name not in (slot.team1, slot.team2):
+            # duplicate names share one position entry, fall back to scanning the round
+            index = next(
+                (i for i in current if self._slots[i].winner is None and name in (self._slots[i].team1, self._slots[i].team2)),
+                0
+            )
+            slot = self._slots[index] if index else None
+        if slot is None or slot.team1 is None or slot.team2 is None:
             raise ValueError(f"No unresolved match for '{name}' in round {self.rounds}")
 
-        # 3) Collect winners and advance round if needed
-        winners = [getattr(m, "winner", None) for m in matches]
-        
-        # If all matches have winners, advance to next round
-        if all(winner is not None for winner in winners):
-            self.rounds += 1
-        
-        # Check if we've reached the final round
-        max_rounds = len(self._bracket.rounds)
-        if self.rounds > max_rounds:
-            self.rounds = max_rounds
-        else:
-            # 4) Seed all future rounds with any known winners from their respective previous rounds
-            for iterate_round in range(2, max_rounds + 1):  # Start from round 2 (which needs winners from round 1)
-                next_round = self._bracket.rounds[iterate_round - 1]
-                previous_round = self._bracket.rounds[iterate_round - 2]
-                
-                for idx, clash in enumerate(next_round):
-                    # Calculate indices for the two potential clashes feeding into this clash
-                    left_idx = 2 * idx
-                    right_idx = 2 * idx + 1
-                    
-                    # Update competitor_a if we have a winner from the left clash
-                    if left_idx < len(previous_round):
-                        left_clash = previous_round[left_idx]
-                        if hasattr(left_clash, "winner") and left_clash.winner is not None:
-                            clash.competitor_a = Competitor(left_clash.winner, "", 0)
-                    
-                    # Update competitor_b if we have a winner from the right clash
-                    if right_idx < len(previous_round):
-                        right_clash = previous_round[right_idx]
-                        if hasattr(right_clash, "winner") and right_clash.winner is not None:
-                            clash.competitor_b = Competitor(right_clash.winner, "", 0)
+        self._resolve(index, name, win_score, lose_score)
+        self._advance_cursor()
 
     def get_winner(self) -> Optional[str]:
         """
         Return the final winner's name if the bracket is complete; otherwise None.
         """
-        if self._bracket is None:
-            return None
-        total_rounds = len(self._bracket.rounds)
-        if self.rounds != total_rounds:
-            return None
-        final_round = self._bracket.rounds[self.rounds - 1]
-        if not final_round:
+        if not self._slots:
             return None
-        final_clash = final_round[0]
-        return getattr(final_clash, 'winner', None)
+        return self._slots[1].winner
+
+    def snapshot(self) -> bytes:
+        """
+        Compact, versioned form of the bracket: participants with their
+        ratings, the seeded first round as participant indexes and every
+        result as [slot, winning side, win score, lose score]. Small enough
+        to store after every result and to hand to another process.
+        """
+        index = {name: i for i, (name, rating) in enumerate(self._participants)}
+        data = {
+            "v": SNAPSHOT_VERSION,
+            "p": [[name, rating] for name, rating in self._participants],
+        }
+        if self.rounds:
+            first = self._round_range(1)
+            data["s"] = [
+                index.get(team, -1)
+                for slot in self._slots[first.start:first.stop]
+                for team in (slot.team1, slot.team2)
+            ]
+            data["r"] = [
+                [i, 0 if slot.winner == slot.team1 else 1, slot.win_score, slot.lose_score]
+                for i, slot in enumerate(self._slots)
+                if slot is not None and slot.winner is not None
+            ]
+        return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode()
+
+    @classmethod
+    def from_snapshot(cls, data: bytes) -> "Bracket":
+        """
+        Rebuild a bracket from snapshot(). The seeding is taken as stored,
+        bracketool is not involved.
+        """
+        state = json.loads(data)
+        if state.get("v") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported bracket snapshot version {state.get('v')!r}")
+
+        bracket = cls()
+        bracket._participants = [(name, rating) for name, rating in state["p"]]
+        if "s" not in state:
+            return bracket
+
+        names = [name for name, rating in bracket._participants]
+        seeded = state["s"]
+        first = len(seeded) // 2
+        bracket._depth = first.bit_length()
+        bracket._slots = [None] + [Slot() for _ in range(2 * first - 1)]
+        for offset in range(first):
+            slot = bracket._slots[first + offset]
+            team1, team2 = seeded[2 * offset], seeded[2 * offset + 1]
+            slot.team1 = names[team1] if team1 >= 0 else None
+            slot.team2 = names[team2] if team2 >= 0 else None
+            for team in (slot.team1, slot.team2):
+                if team is not None:
+                    bracket._position[team] = first + offset
+
+        # children sit at higher indexes than their parents, so replaying
+        # the results from the back fills every slot before it is decided
+        for index, side, win_score, lose_score in sorted(state["r"], reverse=True):
+            slot = bracket._slots[index]
+            bracket._resolve(index, slot.team2 if side else slot.team1, win_score, lose_score)
+        bracket._cursor = first
+        bracket._advance_cursor()
+        return bracket
+
+    def render_rounds(self) -> List[List[BOClash]]:
+        """
+        The bracket as bracketool clashes per round, with winner, win_score
+        and lost_score attached the way ImageGen.create_bracket reads them.
+        """
+        rounds = []
+        for round in range(1, self._depth + 1):
+            clashes = []
+            for index in self._round_range(round):
+                slot = self._slots[index]
+                bo_clash = BOClash(
+                    Competitor(slot.team1, "", 0) if slot.team1 is not None else None,
+                    Competitor(slot.team2, "", 0) if slot.team2 is not None else None
+                )
+                if slot.winner is not None:
+                    bo_clash.winner = slot.winner
+                    bo_clash.win_score = slot.win_score
+                    bo_clash.lost_score = slot.lose_score
+                clashes.append(bo_clash)
+            rounds.append(clashes)
+        return rounds
 
     def generate_standings(self, guild_id: int) -> None:
         """
@@ -158,20 +303,24 @@ class Bracket:
           /images/{guild_id}/bracket/current_standing.png
         Requires rounds > 0. To be implemented.
         """
-        rounds: List[List[BOClash]] = self._bracket.rounds
-
-        if self.rounds == 0 or self._gen is None:
+        if self.rounds == 0 or not self._slots:
             raise RuntimeError("Bracket not started")
 
+        rounds = self.render_rounds()
+
+        from image_gen import ImageGen
+
         img_gen = ImageGen(f"images/guild_{guild_id}")
         return img_gen.create_bracket(rounds, self.rounds).save("bracket/current_standing.png").get_save_path()
 
 
     def generate_win_meme(self, guild_id: int, name: str) -> str:
+        from image_gen import ImageGen
+
         # Example usage:
         image_gen = ImageGen(f"images")
         winner = self.get_winner() if self.get_winner() is not None else "New Team Name"
-        previous_team_name = os.getenv("PREVIOUS_TEAM_NAME")
+        previous_team_name = get_config(guild_id).previous_team_name
 
         match name:
             case "pass_sword":
@@ -0,0 +1,41 @@
+# name_cache.py
+
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+class DisplayNameCache:
+    """
+    Bounded LRU of member display names keyed by (guild id, user id), for
+    running without the members intent. It is filled from the members that
+    come along with reactions, messages and interactions anyway, so the
+    users who show up in the logs are the ones it knows.
+    """
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self._names: "OrderedDict[Tuple[int, int], str]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def remember(self, guild_id: int, member) -> None:
+        """
+        Store a member's (or user's) display name, None is ignored.
+        """
+        if member is None:
+            return
+        key = (guild_id, member.id)
+        self._names[key] = member.display_name
+        self._names.move_to_end(key)
+        while len(self._names) > self.maxsize:
+            self._names.popitem(last=False)
+
+    def get(self, guild_id: int, user_id: int) -> Optional[str]:
+        name = self._names.get((guild_id, user_id))
+        if name is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._names.move_to_end((guild_id, user_id))
+        return name
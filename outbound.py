@@ -0,0 +1,281 @@
+# outbound.py
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+class Priority(IntEnum):
+    """
+    Lower value runs first.
+    """
+    ROUND = 0      # round transitions, results, channel permissions
+    VOTING = 1     # ballot messages, their reactions and vote counter edits
+    CLEANUP = 2    # cosmetic reaction removal, safe to coalesce or drop
+
+# (rate per second, burst capacity) per kind of route, roughly Discord's per-channel limits
+DEFAULT_ROUTE_RATES: Dict[str, Tuple[float, float]] = {
+    "send": (1.0, 5.0),
+    "edit": (1.0, 5.0),
+    "reaction": (4.0, 1.0),
+    "permissions": (1.0, 2.0),
+    "delete": (1.0, 5.0),
+    "dm": (1.0, 2.0),
+    "interaction": (50.0, 50.0),
+}
+
+class TokenBucket:
+    """
+    Classic token bucket: `rate` tokens per second, holding at most `capacity`.
+    """
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now: Optional[float] = None) -> float:
+        """
+        Seconds until a token is available, 0 if one is available now.
+        """
+        self._refill(time.monotonic() if now is None else now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def try_acquire(self, now: Optional[float] = None) -> bool:
+        if self.wait_time(now) > 0:
+            return False
+        self.tokens -= 1
+        return True
+
+@dataclass(order=True)
+class OutboundAction:
+    priority: int
+    seq: int
+    route: Tuple[str, int] = field(compare=False)
+    factory: Callable[[], Awaitable[Any]] = field(compare=False)
+    future: Optional[asyncio.Future] = field(compare=False, default=None)
+    key: Optional[Hashable] = field(compare=False, default=None)
+    enqueued_at: float = field(compare=False, default=0.0)
+    throttled: bool = field(compare=False, default=False)
+
+@dataclass
+class OutboundMetrics:
+    queued: int = 0
+    executed: int = 0
+    failed: int = 0
+    throttled: int = 0
+    coalesced: int = 0
+    dropped: int = 0
+    rate_limited: int = 0
+    retried: int = 0
+    total_wait: float = 0.0
+    by_route_kind: Dict[str, int] = field(default_factory=dict)
+
+class _RateLimitCounter(logging.Handler):
+    """
+    discord.py retries 429s internally and only logs them, count those logs.
+    """
+    def __init__(self, metrics: OutboundMetrics):
+        super().__init__(logging.WARNING)
+        self.metrics = metrics
+
+    def emit(self, record: logging.LogRecord) -> None:
+        message = str(record.msg)
+        if "429" in message or "rate limit has been hit" in message:
+            self.metrics.rate_limited += 1
+        if "Retrying in" in message:
+            self.metrics.retried += 1
+
+class OutboundScheduler:
+    """
+    Central queue for every Discord API call the bot makes.
+
+    Actions are grouped by route, e.g. ("send", channel_id), and each route
+    has its own token bucket. Whenever a worker slot is free the dispatcher
+    runs the highest priority action whose route has a token, so round
+    transitions never wait behind reaction cleanup. CLEANUP actions sent
+    with fire() are coalesced by key and dropped once the queue backs up.
+    """
+    def __init__(
+        self,
+        route_rates: Optional[Dict[str, Tuple[float, float]]] = None,
+        concurrency: int = 4,
+        drop_threshold: int = 200,
+        on_executed: Optional[Callable[[str, float, float, bool], None]] = None,
+    ):
+        self.route_rates = {**DEFAULT_ROUTE_RATES, **(route_rates or {})}
+        self.drop_threshold = drop_threshold
+        # called with (route kind, seconds queued, seconds running, succeeded)
+        self.on_executed = on_executed
+        self.metrics = OutboundMetrics()
+        self._buckets: Dict[Tuple[str, int], TokenBucket] = {}
+        self._queues: Dict[Tuple[str, int], List[OutboundAction]] = {}
+        self._keys: Dict[Hashable, OutboundAction] = {}
+        self._pending = 0
+        self._seq = itertools.count()
+        self._slots = asyncio.Semaphore(concurrency)
+        self._wakeup: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        logging.getLogger("discord.http").addHandler(_RateLimitCounter(self.metrics))
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def set_route_rates(self, route_rates: Dict[str, Tuple[float, float]]) -> None:
+        """
+        Change the (rate, capacity) of route kinds. Existing buckets are
+        discarded and rebuilt on their next use.
+        """
+        self.route_rates.update(route_rates)
+        self._buckets.clear()
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _bucket(self, route: Tuple[str, int]) -> TokenBucket:
+        bucket = self._buckets.get(route)
+        if bucket is None:
+            rate, capacity = self.route_rates.get(route[0], (1.0, 1.0))
+            bucket = TokenBucket(rate, capacity)
+            self._buckets[route] = bucket
+        return bucket
+
+    def _enqueue(self, action: OutboundAction) -> None:
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch(), name="outbound-dispatcher")
+        heapq.heappush(self._queues.setdefault(action.route, []), action)
+        if action.key is not None:
+            self._keys[action.key] = action
+        self._pending += 1
+        self.metrics.queued += 1
+        kind = action.route[0]
+        self.metrics.by_route_kind[kind] = self.metrics.by_route_kind.get(kind, 0) + 1
+        self._wakeup.set()
+
+    async def call(self, route: Tuple[str, int], priority: Priority, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Queue factory() on a route and wait for its result. Never dropped.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._enqueue(OutboundAction(int(priority), next(self._seq), route, factory, future, None, time.monotonic()))
+        return await future
+
+    def fire(
+        self,
+        route: Tuple[str, int],
+        priority: Priority,
+        factory: Callable[[], Awaitable[Any]],
+        key: Optional[Hashable] = None,
+    ) -> None:
+        """
+        Queue factory() without waiting for it. A pending action with the same
+        key is replaced, and CLEANUP actions are dropped once the queue backs up.
+        """
+        if key is not None and key in self._keys:
+            self._keys[key].factory = factory
+            self.metrics.coalesced += 1
+            return
+        if priority >= Priority.CLEANUP and self._pending >= self.drop_threshold:
+            self.metrics.dropped += 1
+            return
+        self._enqueue(OutboundAction(int(priority), next(self._seq), route, factory, None, key, time.monotonic()))
+
+    async def _dispatch(self) -> None:
+        while True:
+            await self._slots.acquire()
+            action = None
+            while action is None:
+                action, wait = self._next_ready()
+                if action is None:
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+                    except asyncio.TimeoutError:
+                        pass
+            asyncio.create_task(self._execute(action))
+
+    def _next_ready(self) -> Tuple[Optional[OutboundAction], Optional[float]]:
+        """
+        Pop the best action whose route has a token, or report how long to
+        wait until one does (None when nothing is queued).
+        """
+        now = time.monotonic()
+        best_route = None
+        min_wait = None
+        for route, queue in self._queues.items():
+            head = queue[0]
+            wait = self._bucket(route).wait_time(now)
+            if wait > 0:
+                if not head.throttled:
+                    head.throttled = True
+                    self.metrics.throttled += 1
+                min_wait = wait if min_wait is None else min(min_wait, wait)
+                continue
+            if best_route is None or head < self._queues[best_route][0]:
+                best_route = route
+
+        if best_route is None:
+            return None, min_wait
+
+        queue = self._queues[best_route]
+        action = heapq.heappop(queue)
+        if not queue:
+            del self._queues[best_route]
+        if action.key is not None:
+            self._keys.pop(action.key, None)
+        self._pending -= 1
+        self._bucket(best_route).try_acquire(now)
+        return action, None
+
+    async def _execute(self, action: OutboundAction) -> None:
+        started = time.monotonic()
+        wait = started - action.enqueued_at
+        self.metrics.total_wait += wait
+        ok = False
+        try:
+            result = await action.factory()
+        except Exception as e:
+            self.metrics.failed += 1
+            if action.future is not None and not action.future.done():
+                action.future.set_exception(e)
+            elif action.future is None:
+                log.warning("Error in outbound %s action: %s", action.route[0], e, extra={"event": f"outbound_{action.route[0]}"})
+        else:
+            ok = True
+            self.metrics.executed += 1
+            if action.future is not None and not action.future.done():
+                action.future.set_result(result)
+        finally:
+            self._slots.release()
+            if self.on_executed is not None:
+                self.on_executed(action.route[0], wait, time.monotonic() - started, ok)
+
+    def stats(self) -> Dict[str, Any]:
+        m = self.metrics
+        return {
+            "pending": self._pending,
+            "queued": m.queued,
+            "executed": m.executed,
+            "failed": m.failed,
+            "throttled": m.throttled,
+            "coalesced": m.coalesced,
+            "dropped": m.dropped,
+            "rate_limited": m.rate_limited,
+            "retried": m.retried,
+            "avg_wait": m.total_wait / m.executed if m.executed else 0.0,
+            "by_route_kind": dict(m.by_route_kind),
+        }
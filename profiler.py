@@ -0,0 +1,80 @@
+# profiler.py
+
+import asyncio
+import cProfile
+import io
+import os
+import pstats
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+@dataclass
+class ProfileResult:
+    path: str
+    seconds: float
+    events: int
+    top: List[str]
+
+class OnDemandProfiler:
+    """
+    cProfile switched on for a bounded window: N seconds, N handled events,
+    or whichever comes first. While off the only cost is the `active` check
+    in event_processed().
+    """
+    def __init__(self, output_dir: str = "logs", top: int = 10):
+        self.output_dir = output_dir
+        self.top = top
+        self.active = False
+        self._profile: Optional[cProfile.Profile] = None
+        self._events = 0
+        self._max_events = 0
+        self._started = 0.0
+        self._done: Optional[asyncio.Event] = None
+
+    def event_processed(self, *args) -> None:
+        if not self.active:
+            return
+        self._events += 1
+        if self._max_events and self._events >= self._max_events:
+            self._done.set()
+
+    async def run(self, seconds: float, events: int = 0) -> ProfileResult:
+        """
+        Profile the whole process until `seconds` pass or `events` events were
+        handled, then write a pstats file and return the top functions.
+        """
+        if self.active:
+            raise RuntimeError("A profile is already running")
+        self._profile = cProfile.Profile()
+        self._events = 0
+        self._max_events = events
+        self._done = asyncio.Event()
+        self._started = time.perf_counter()
+        self.active = True
+        self._profile.enable()
+        try:
+            await asyncio.wait_for(self._done.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._profile.disable()
+            self.active = False
+        return self._save(time.perf_counter() - self._started)
+
+    def _save(self, elapsed: float) -> ProfileResult:
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, time.strftime("profile_%Y%m%d_%H%M%S.pstats"))
+        self._profile.dump_stats(path)
+
+        stats = pstats.Stats(self._profile, stream=io.StringIO())
+        rows = []
+        for (filename, line, name), (calls, primitive, own, cumulative, callers) in stats.stats.items():
+            rows.append((own, cumulative, calls, f"{os.path.basename(filename)}:{line}({name})"))
+        rows.sort(reverse=True)
+        top = [
+            f"{own * 1000:8.1f}ms own {cumulative * 1000:8.1f}ms cum {calls:>7} calls  {where}"
+            for own, cumulative, calls, where in rows[:self.top]
+        ]
+        self._profile = None
+        return ProfileResult(path, elapsed, self._events, top)
@@ -0,0 +1,56 @@
+# qual_pool.py
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+from config import BracketConfig
+
+@dataclass(frozen=True)
+class QualPool:
+    """
+    Where a qualification round runs: the bracket channel on its own, or one
+    of OPEN_QUAL_POOL_CHANNELS. Every pool has its own submissions, ballots
+    and share of the round's qualifier spots.
+    """
+    index: Optional[int]
+    channel_name: str
+
+    def var(self, open_qual_round: int, name: str) -> str:
+        """
+        Guild var holding `name` for this pool in a round.
+        """
+        if self.index is None:
+            return f"open_qual_round_{open_qual_round}_{name}"
+        return f"open_qual_round_{open_qual_round}_pool_{self.index}_{name}"
+
+    def ballot_prefix(self, guild_id: int, open_qual_round: int) -> str:
+        if self.index is None:
+            return f"ballot:{guild_id}:{open_qual_round}"
+        return f"ballot:{guild_id}:{open_qual_round}-{self.index}"
+
+    def label(self, pool_count: int) -> str:
+        """
+        " (pool 2/3)", empty when the round runs in one channel.
+        """
+        return "" if self.index is None else f" (pool {self.index + 1}/{pool_count})"
+
+def qual_pools(config: BracketConfig) -> List[QualPool]:
+    if not config.open_qual_pool_channels:
+        return [QualPool(None, config.bracket_channel_name)]
+    return [QualPool(index, name) for index, name in enumerate(config.open_qual_pool_channels)]
+
+def find_qual_pool(config: BracketConfig, channel_name: str) -> Optional[QualPool]:
+    """
+    The pool running in a channel, None if qualification does not run there.
+    """
+    for pool in qual_pools(config):
+        if pool.channel_name == channel_name:
+            return pool
+    return None
+
+def pool_quotas(round_qual_spots: int, pool_count: int) -> List[int]:
+    """
+    Split a round's qualifier spots over its pools, earlier pools take the remainder.
+    """
+    share, remainder = divmod(round_qual_spots, pool_count)
+    return [share + (1 if index < remainder else 0) for index in range(pool_count)]
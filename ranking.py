@@ -0,0 +1,77 @@
+# ranking.py
+
+import zlib
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+class PairwiseRanking:
+    """
+    Head-to-head picks between a pool's submissions and a Bradley-Terry fit
+    over them. Voters only ever see two names, so a pool can hold thousands
+    of submissions while each voter makes a handful of picks.
+    """
+    def __init__(self, names: Sequence[str]):
+        self.names: List[str] = list(names)
+        self.winners: List[int] = []
+        self.losers: List[int] = []
+        self.voters: List[int] = []
+        self.counts = np.zeros(len(self.names), dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.winners)
+
+    def next_pair(self, seed: str) -> Tuple[int, int]:
+        """
+        Two of the least compared submissions, so picks spread over the whole
+        pool. The same seed and history give the same pair, which keeps
+        replays of a round identical.
+        """
+        rng = np.random.default_rng(zlib.crc32(seed.encode()))
+        second_fewest = np.partition(self.counts, 1)[1]
+        candidates = np.flatnonzero(self.counts <= second_fewest)
+        first, second = rng.choice(candidates, 2, replace=False)
+        return int(first), int(second)
+
+    def record(self, voter: int, winner: int, loser: int) -> None:
+        self.winners.append(winner)
+        self.losers.append(loser)
+        self.voters.append(voter)
+        self.counts[winner] += 1
+        self.counts[loser] += 1
+
+    def forget_voter(self, voter: int) -> None:
+        """
+        Drop every pick the voter made.
+        """
+        kept = [i for i, v in enumerate(self.voters) if v != voter]
+        self.winners = [self.winners[i] for i in kept]
+        self.losers = [self.losers[i] for i in kept]
+        self.voters = [self.voters[i] for i in kept]
+        self.counts = np.bincount(self.winners, minlength=len(self.names)) + np.bincount(self.losers, minlength=len(self.names))
+
+    def fit(self, prior: float = 1.0, iterations: int = 500, tolerance: float = 1e-9) -> np.ndarray:
+        """
+        Log strengths from the minorization-maximization Bradley-Terry fit.
+        Every submission also draws `prior` wins and losses against a virtual
+        opponent of strength 1, which keeps unpicked or unbeaten names finite
+        and pulls sparsely compared ones towards the middle.
+        """
+        count = len(self.names)
+        winners = np.asarray(self.winners, dtype=np.intp)
+        losers = np.asarray(self.losers, dtype=np.intp)
+        wins = np.bincount(winners, minlength=count) + prior
+        strength = np.ones(count)
+        for _ in range(iterations):
+            pair_weight = 1.0 / (strength[winners] + strength[losers])
+            games = (
+                np.bincount(winners, weights=pair_weight, minlength=count)
+                + np.bincount(losers, weights=pair_weight, minlength=count)
+                + 2 * prior / (strength + 1.0)
+            )
+            updated = wins / games
+            converged = np.max(np.abs(np.log(updated) - np.log(strength))) < tolerance
+            strength = updated
+            if converged:
+                break
+        return np.log(strength)
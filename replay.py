@@ -0,0 +1,246 @@
+# replay.py
+"""
+Feeds an event trace (recorded with EVENT_TRACE_DIR, or simulator.py
+--trace-dir) back through the real handlers on top of fake_discord, and
+reports throughput, handler latency and API calls like simulator.py.
+
+    python replay.py logs/traces/trace_20250101_120000_1234.jsonl.gz --speed 10
+
+By default the replay waits for the bot to settle at every recorded state
+change and compares its state with the recording, exiting non-zero when
+they diverge, so an incident trace doubles as a regression test.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import functools
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from event_trace import TRACE_VERSION, read_trace
+from fake_discord import FakeGateway, FakeMessage
+from simulator import measurements, prepare_bot, print_measurements
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Replay a recorded event trace against the bot's handlers.")
+    parser.add_argument("trace", help="trace file (.jsonl.gz)")
+    parser.add_argument("--speed", type=float, default=1.0, help="time scale, 1 is the original pace, 0 replays as fast as possible")
+    parser.add_argument("--no-verify", action="store_true", help="do not wait for or compare recorded state changes")
+    parser.add_argument("--render", action="store_true", help="render real bracket images and memes")
+    parser.add_argument("--realtime-limits", action="store_true", help="keep Discord-like outbound rate limits")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--verbose", action="store_true", help="show the bot's own output while replaying")
+    return parser.parse_args(argv)
+
+def env_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return str(value).lower()
+    if isinstance(value, (list, tuple)):
+        return ",".join(str(item) for item in value)
+    return str(value)
+
+def configure_environment(records: List[Dict[str, Any]]) -> str:
+    """
+    Rebuild the recorded guild settings: the first guild's become the base
+    config, every guild gets its own entry in a temporary GUILD_CONFIG_FILE.
+    Returns the path of that file.
+    """
+    settings = {str(r["g"]): r["config"] for r in records if r["e"] == "guild"}
+    if not settings:
+        raise SystemExit("Trace has no guild records, nothing to replay")
+
+    overrides = tempfile.NamedTemporaryFile("w", suffix=".json", delete=False)
+    with overrides:
+        json.dump(settings, overrides)
+
+    base = next(iter(settings.values()))
+    os.environ.update({name: env_value(value) for name, value in base.items()})
+    os.environ.update({
+        "DISCORD_TOKEN": "replay",
+        # the trace only holds events that got past the throttle when recorded
+        "USER_REACTION_RATE": "0",
+        "USER_MESSAGE_RATE": "0",
+        "GUILD_CONFIG_FILE": overrides.name,
+        "GUILD_STATE_STORE": "memory",
+        "SHARD_COUNT": "0",
+        "SHARD_IDS": "",
+        "EVENT_TRACE_DIR": "",
+    })
+    return overrides.name
+
+class TraceReplay:
+    """
+    Rebuilds the recorded guilds, channels and users with their original IDs,
+    then plays the records in order. Messages the bot posted get new IDs, so
+    recorded message IDs are mapped by the order the bot posted them in, and
+    clash emojis by the recorded state changes.
+    """
+    def __init__(self, app, gateway: FakeGateway, records: List[Dict[str, Any]], verify: bool):
+        self.app = app
+        self.gateway = gateway
+        self.records = records
+        self.verify = verify
+        self.posts: Dict[int, tuple] = {}
+        self.emojis: Dict[int, Dict[str, str]] = {}
+        self.divergences: List[str] = []
+        self.unmapped = 0
+        self._build_world()
+
+    def _build_world(self) -> None:
+        for record in self.records:
+            guild_id = record.get("g")
+            if guild_id is None:
+                continue
+            guild = self.gateway.guilds.get(guild_id) or self.gateway.add_guild(f"Replay Guild {len(self.gateway.guilds) + 1}", guild_id)
+            if "cn" in record and record["c"] not in self.gateway.channels:
+                self.gateway.add_channel(guild, record["cn"], record["c"])
+            user_id = record.get("u")
+            if user_id is not None and user_id not in self.gateway.users:
+                self.gateway.add_user(guild, record.get("un") or str(user_id), user_id)
+            elif user_id is not None and user_id not in guild._members:
+                guild._members[user_id] = self.gateway.users[user_id]
+            if record["e"] == "post":
+                self.posts[record["m"]] = (guild_id, record["i"])
+
+    async def message(self, guild_id: int, message_id: int) -> Optional[FakeMessage]:
+        """
+        The replayed counterpart of a recorded message ID.
+        """
+        if message_id not in self.posts:
+            return self.gateway.messages.get(message_id)
+        guild_id, index = self.posts[message_id]
+        posted = self.gateway.posted.get(guild_id, [])
+        if index >= len(posted):
+            # the bot has not caught up with the recording yet
+            await self.gateway.drain()
+            posted = self.gateway.posted.get(guild_id, [])
+        return posted[index] if index < len(posted) else None
+
+    async def button(self, guild_id: int, custom_id: str):
+        for attempt in range(2):
+            for message in reversed(self.gateway.posted.get(guild_id, [])):
+                for item in getattr(message.view, "children", []) if message.view is not None else []:
+                    if item.custom_id == custom_id:
+                        return item
+            # buttons only their user saw, like matchups
+            item = self.gateway.ephemeral_items.get(guild_id, {}).get(custom_id)
+            if item is not None:
+                return item
+            await self.gateway.drain()
+        return None
+
+    async def state(self, record: Dict[str, Any]) -> None:
+        guild_id = record["g"]
+        if self.verify:
+            await self.gateway.drain()
+        replayed = self.app.guild_state_summary(guild_id)
+        recorded = record["s"]
+        if recorded["clash"] and replayed["clash"]:
+            self.emojis[guild_id] = dict(zip(recorded["clash"], replayed["clash"]))
+        if not self.verify:
+            return
+        # emojis are random, only whether a clash is open has to match
+        expected = {**recorded, "clash": recorded["clash"] is not None}
+        actual = {**replayed, "clash": replayed["clash"] is not None}
+        if expected != actual:
+            self.divergences.append(f"guild {guild_id} at {record['t']}ms: recorded {expected}, replayed {actual}")
+
+    async def feed(self, record: Dict[str, Any]) -> None:
+        kind = record["e"]
+        gateway = self.gateway
+        if kind == "message":
+            gateway.post(gateway.channels[record["c"]], gateway.users[record["u"]], record["x"])
+        elif kind in ("reaction_add", "reaction_remove"):
+            message = await self.message(record["g"], record["m"])
+            if message is None:
+                self.unmapped += 1
+                return
+            emoji = self.emojis.get(record["g"], {}).get(record["em"], record["em"])
+            if kind == "reaction_add":
+                gateway.react(message, gateway.users[record["u"]], emoji)
+            else:
+                gateway.unreact(message, record["u"], emoji)
+        elif kind == "command":
+            command = self.app.bot.tree.get_command(record["n"])
+            if command is None:
+                self.unmapped += 1
+                return
+            gateway.interact(gateway.guilds[record["g"]], gateway.users[record["u"]], functools.partial(command.callback, **record["o"]))
+        elif kind == "button":
+            item = await self.button(record["g"], record["id"])
+            if item is None:
+                self.unmapped += 1
+                return
+            gateway.interact(gateway.guilds[record["g"]], gateway.users[record["u"]], item.callback, item.custom_id)
+        elif kind == "state":
+            await self.state(record)
+
+    async def run(self, speed: float) -> None:
+        started = time.perf_counter()
+        for record in self.records:
+            if speed > 0:
+                delay = record["t"] / 1000 / speed - (time.perf_counter() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            await self.feed(record)
+        await self.gateway.drain()
+
+async def replay(args: argparse.Namespace, records: List[Dict[str, Any]]) -> dict:
+    header = records[0] if records and records[0]["e"] == "header" else {}
+    if header.get("v", TRACE_VERSION) != TRACE_VERSION:
+        raise SystemExit(f"Unsupported trace version {header.get('v')}")
+
+    overrides = configure_environment(records)
+    try:
+        app, gateway, recorder = prepare_bot(args.render, args.realtime_limits, header.get("bot", 1000))
+        player = TraceReplay(app, gateway, records, not args.no_verify)
+
+        started = time.perf_counter()
+        await player.run(args.speed)
+        await app.vote_edits.flush()
+        while app.outbound.pending or gateway._tasks:
+            await gateway.drain()
+            await asyncio.sleep(0.01)
+        elapsed = time.perf_counter() - started
+    finally:
+        os.unlink(overrides)
+
+    return {
+        "trace": args.trace,
+        "records": len(records),
+        "recorded_seconds": records[-1]["t"] / 1000 if records else 0.0,
+        "speed": args.speed,
+        **measurements(app, gateway, recorder, elapsed),
+        "unmapped": player.unmapped,
+        "divergences": player.divergences,
+    }
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    records = list(read_trace(args.trace))
+    if args.verbose:
+        logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+        report = asyncio.run(replay(args, records))
+    else:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            report = asyncio.run(replay(args, records))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"Replayed {report['records']} records ({report['recorded_seconds']:.1f}s recorded) at speed {report['speed'] or 'max'}")
+        print_measurements(report)
+        print(f"Unmapped events: {report['unmapped']}")
+        print(f"State divergences: {len(report['divergences'])}")
+        for divergence in report["divergences"][:10]:
+            print(f"  {divergence}")
+    sys.exit(1 if report["divergences"] else 0)
+
+if __name__ == "__main__":
+    main()
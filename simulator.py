@@ -0,0 +1,553 @@
+# simulator.py
+"""
+Offline load simulator. Runs whole tournaments against the real bot
+handlers on top of fake_discord, then reports event throughput, handler
+latency percentiles and how many Discord API calls each scenario made.
+
+    python simulator.py --guilds 4 --users 300 --bracket-size 16 --rounds 2
+
+No token or network is needed. Rendering is stubbed unless --render is
+given, and outbound rate limits are lifted unless --realtime-limits is.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import functools
+import json
+import logging
+import os
+import pickle
+import random
+import threading
+import time
+from typing import Dict, List, Optional
+
+from fake_discord import FakeChannel, FakeGateway, FakeGuild, FakeUser
+from guild_state import FileGuildStore
+
+STUB_IMAGE = "images/memes/pass_sword.jpg"
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run simulated tournaments against the bot's handlers.")
+    parser.add_argument("--guilds", type=int, default=1, help="tournaments to run concurrently")
+    parser.add_argument("--users", type=int, default=100, help="members per guild")
+    parser.add_argument("--bracket-size", type=int, default=8, help="playoff bracket size (power of 2)")
+    parser.add_argument("--rounds", type=int, default=2, help="qualification rounds")
+    parser.add_argument("--max-round-submissions", type=int, default=0, help="submissions per round, default 2x the round's spots")
+    parser.add_argument("--votes-per-user", type=int, default=3, help="votes per user per qualification round")
+    parser.add_argument("--vote-rate", type=float, default=0.8, help="fraction of users that vote in each round and match")
+    parser.add_argument("--clear-rate", type=float, default=0.1, help="fraction of voters that clear their votes and vote again")
+    parser.add_argument("--invalid-rate", type=float, default=0.1, help="fraction of submissions that are rejected (too short)")
+    parser.add_argument("--ballot-mode", choices=("reactions", "buttons", "matchups"), default="reactions")
+    parser.add_argument("--pools", type=int, default=0, help="run qualification in this many pool channels at once")
+    parser.add_argument("--parallel-playoffs", action="store_true", help="open every clash of a playoff round at once")
+    parser.add_argument("--burst", type=int, default=25, help="user events in flight per guild before waiting for them")
+    parser.add_argument("--vote-edit-interval", type=float, default=0.05, help="VOTE_EDIT_INTERVAL for the run")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--render", action="store_true", help="render real bracket images and memes")
+    parser.add_argument("--realtime-limits", action="store_true", help="keep Discord-like outbound rate limits")
+    parser.add_argument("--no-member-cache", action="store_true", help="run without the members intent (MEMBER_CACHE=false)")
+    parser.add_argument("--user-throttle", action="store_true", help="keep the per-user event throttle, simulated users act far faster than real ones")
+    parser.add_argument("--state-dir", default="", help="keep guild state in a file store here and check it reloads from disk")
+    parser.add_argument("--trace-dir", default="", help="record the run as an event trace for replay.py")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--verbose", action="store_true", help="show the bot's own output while simulating")
+    return parser.parse_args(argv)
+
+def configure_environment(args: argparse.Namespace) -> None:
+    """
+    The bot validates its config on import, so the scenario goes in first.
+    """
+    max_round_submissions = args.max_round_submissions or 2 * -(-args.bracket_size // args.rounds)
+    os.environ.update({
+        "DISCORD_TOKEN": "simulated",
+        "BRACKET_CHANNEL_NAME": "bracket",
+        "OPEN_QUAL_MAX_ROUND_SUBMISSONS": str(max_round_submissions),
+        "OPEN_QUAL_ROUNDS": str(args.rounds),
+        "OPEN_QUAL_PASSTHRU_SUBMISSIONS": str(args.bracket_size),
+        "OPEN_QUAL_MAX_VOTES": str(args.votes_per_user),
+        "OPEN_QUAL_FORCE_TIE_BREAKER": "false",
+        "OPEN_QUAL_BALLOT_MODE": args.ballot_mode,
+        "BOT_IS_PLAYING": "false",
+        "OPEN_QUAL_POOL_CHANNELS": ",".join(pool_channel_names(args)),
+        "PLAYOFF_PARALLEL": str(args.parallel_playoffs).lower(),
+        "MEMBER_CACHE": str(not args.no_member_cache).lower(),
+        "VOTE_EDIT_INTERVAL": str(args.vote_edit_interval),
+        "GUILD_STATE_STORE": "file" if args.state_dir else "memory",
+        "GUILD_STATE_DIR": args.state_dir or "state",
+        "GUILD_CONFIG_FILE": "",
+        "SHARD_COUNT": "0",
+        "SHARD_IDS": "",
+        "EVENT_TRACE_DIR": args.trace_dir,
+    })
+    if not args.user_throttle:
+        os.environ.update({"USER_REACTION_RATE": "0", "USER_MESSAGE_RATE": "0"})
+
+def pool_channel_names(args: argparse.Namespace) -> List[str]:
+    return [f"pool-{index + 1}" for index in range(args.pools)]
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+class LatencyRecorder:
+    """
+    Wraps module or class attributes so every call is timed under a label.
+    """
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+
+    def add(self, label: str, seconds: float) -> None:
+        self.samples.setdefault(label, []).append(seconds)
+
+    def wrap(self, owner, name: str, label=None) -> None:
+        original = getattr(owner, name)
+        label = label or (lambda *args, **kwargs: name)
+        recorder = self
+
+        if asyncio.iscoroutinefunction(original):
+            @functools.wraps(original)
+            async def timed(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await original(*args, **kwargs)
+                finally:
+                    recorder.add(label(*args, **kwargs), time.perf_counter() - started)
+        else:
+            @functools.wraps(original)
+            def timed(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return original(*args, **kwargs)
+                finally:
+                    recorder.add(label(*args, **kwargs), time.perf_counter() - started)
+        setattr(owner, name, timed)
+
+class TournamentScenario:
+    """
+    One guild playing a tournament from /start to the winner's memes.
+    """
+    def __init__(self, app, gateway: FakeGateway, guild: FakeGuild, channel: FakeChannel, admin: FakeUser, users: List[FakeUser], args: argparse.Namespace, rng: random.Random, pool_channels: List[FakeChannel] = ()):
+        self.app = app
+        self.gateway = gateway
+        self.guild = guild
+        self.channel = channel
+        # where qualification runs, the bracket channel unless there are pools
+        self.pool_channels = list(pool_channels) or [channel]
+        self.admin = admin
+        self.users = users
+        self.args = args
+        self.rng = rng
+        self.in_flight: List[asyncio.Task] = []
+        self.submitted = 0
+        self.winner: Optional[str] = None
+
+    def var(self, key: str, default=None):
+        return self.app.getGuildVar(self.guild.id, key, default)
+
+    async def pace(self, task: Optional[asyncio.Task]) -> None:
+        """
+        Keep at most --burst user events in flight for this guild.
+        """
+        if task is not None:
+            self.in_flight.append(task)
+        if len(self.in_flight) >= self.args.burst:
+            await self.settle()
+
+    async def settle(self) -> None:
+        if self.in_flight:
+            await asyncio.gather(*self.in_flight)
+            self.in_flight = []
+        await asyncio.sleep(0)
+
+    async def command(self, name: str):
+        command = self.app.bot.tree.get_command(name)
+        interaction, task = self.gateway.interact(self.guild, self.admin, command.callback)
+        await task
+        return interaction
+
+    async def run(self) -> None:
+        await self.command("start")
+        while self.var("stage", 0) == 1:
+            qual_round = self.var("open_qual_round", 0)
+            await self.submissions()
+            await self.voting(qual_round)
+            await self.command("confirm")
+            if self.var("open_qual_round", 0) == qual_round and self.var("stage", 0) == 1:
+                raise RuntimeError(f"guild {self.guild.id}: qualification round {qual_round} did not advance")
+        await self.playoffs()
+
+    async def submissions(self) -> None:
+        for attempt in range(len(self.users) * 4 * len(self.pool_channels)):
+            open_channels = [channel for channel in self.pool_channels if channel.can_send()]
+            if self.var("open_qual_mode") != "submissions" or not open_channels:
+                break
+            channel = open_channels[0] if len(open_channels) == 1 else self.rng.choice(open_channels)
+            user = self.rng.choice(self.users)
+            if self.rng.random() < self.args.invalid_rate:
+                content = "x"
+            else:
+                self.submitted += 1
+                content = f"Team {self.guild.id % 10000}-{self.submitted}"
+            await self.pace(self.gateway.user_post(channel, user, content))
+        await self.settle()
+        await self.gateway.drain()
+
+    def voters(self) -> List[FakeUser]:
+        return self.rng.sample(self.users, int(len(self.users) * self.args.vote_rate))
+
+    async def voting(self, qual_round: int) -> None:
+        if self.var("open_qual_mode") != "voting":
+            return
+        pools = self.app.qual_pools(self.app.get_config(self.guild.id))
+        for pool, channel in zip(pools, self.pool_channels):
+            if self.args.ballot_mode == "matchups":
+                await self.vote_with_matchups(pool, channel, qual_round)
+            elif self.args.ballot_mode == "buttons":
+                await self.vote_with_buttons(pool, channel, qual_round)
+            else:
+                await self.vote_with_reactions(pool, qual_round)
+        await self.settle()
+        await self.gateway.drain()
+
+    async def vote_with_reactions(self, pool, qual_round: int) -> None:
+        index = self.var(pool.var(qual_round, "message_index"), {})
+        ballots = [self.gateway.messages[message_id] for message_id in index if message_id in self.gateway.messages]
+        instruction = self.gateway.messages.get(self.var(pool.var(qual_round, "instruction_message_id")))
+        if not ballots:
+            return
+        for user in self.voters():
+            for _ in range(self.args.votes_per_user):
+                await self.pace(self.gateway.react(self.rng.choice(ballots), user, "👍"))
+            if instruction is not None and self.rng.random() < self.args.clear_rate:
+                await self.pace(self.gateway.react(instruction, user, "⭕"))
+                await self.pace(self.gateway.react(self.rng.choice(ballots), user, "👍"))
+
+    async def vote_with_buttons(self, pool, channel: FakeChannel, qual_round: int) -> None:
+        prefix = pool.ballot_prefix(self.guild.id, qual_round) + ":"
+        votes, clears = [], []
+        for message in self.gateway.messages_in(channel):
+            for item in getattr(message.view, "children", []) if message.view is not None else []:
+                if not item.custom_id.startswith(prefix):
+                    continue
+                (clears if ":clear:" in item.custom_id else votes).append(item)
+        if not votes:
+            return
+        for user in self.voters():
+            for _ in range(self.args.votes_per_user):
+                await self.pace(self.click(user, self.rng.choice(votes)))
+            if clears and self.rng.random() < self.args.clear_rate:
+                await self.pace(self.click(user, clears[0]))
+                await self.pace(self.click(user, self.rng.choice(votes)))
+
+    async def vote_with_matchups(self, pool, channel: FakeChannel, qual_round: int) -> None:
+        prefix = pool.ballot_prefix(self.guild.id, qual_round) + ":"
+        buttons = {}
+        for message in self.gateway.messages_in(channel):
+            for item in getattr(message.view, "children", []) if message.view is not None else []:
+                if item.custom_id.startswith(prefix):
+                    buttons[item.custom_id[len(prefix):].split(":")[0]] = item
+        if "start" not in buttons:
+            return
+        for user in self.voters():
+            # a voter's picks follow each other, different voters overlap
+            await self.pace(asyncio.create_task(self.pick_matchups(user, buttons["start"], buttons.get("clear"))))
+
+    async def pick_matchups(self, user: FakeUser, start, clear) -> None:
+        interaction, task = self.gateway.interact(self.guild, user, start.callback, start.custom_id)
+        await task
+        view = interaction.response.view
+        while view is not None:
+            button = self.rng.choice(view.children)
+            interaction, task = self.gateway.interact(self.guild, user, button.callback, button.custom_id)
+            await task
+            view = interaction.response.view
+        if clear is not None and self.rng.random() < self.args.clear_rate:
+            await self.click(user, clear)
+            interaction, task = self.gateway.interact(self.guild, user, start.callback, start.custom_id)
+            await task
+            if interaction.response.view is not None:
+                button = self.rng.choice(interaction.response.view.children)
+                await self.click(user, button)
+
+    def click(self, user: FakeUser, button) -> asyncio.Task:
+        return self.gateway.interact(self.guild, user, button.callback, button.custom_id)[1]
+
+    def vs_message(self):
+        for message in reversed(self.gateway.messages_in(self.channel)):
+            if " VS " in message.content:
+                return message
+        return None
+
+    async def playoffs(self) -> None:
+        matches = 0
+        while self.var("stage", 0) == 2 and matches < self.args.bracket_size * 2:
+            bracket = self.app.load_bracket(self.guild.id)
+            if bracket is not None and bracket.get_winner() is not None:
+                self.winner = bracket.get_winner()
+                # one confirm per win meme
+                await self.command("confirm")
+                await self.command("confirm")
+                break
+
+            # post the next clash (or the whole round), then vote on it
+            await self.command("confirm")
+            if self.args.parallel_playoffs:
+                round_clashes = self.var("round_clashes", {})
+                if not round_clashes:
+                    raise RuntimeError(f"guild {self.guild.id}: no clashes to vote on")
+                for message_id, clash in round_clashes.items():
+                    await self.vote_on(
+                        self.gateway.messages[message_id],
+                        (clash.team1emoji, clash.team2emoji),
+                        lambda message_id=message_id: self.var("round_votes")[message_id]
+                    )
+            else:
+                clash = self.var("current_clash")
+                message = self.vs_message()
+                if message is None or not hasattr(clash, "team1emoji"):
+                    raise RuntimeError(f"guild {self.guild.id}: no clash to vote on")
+                await self.vote_on(message, (clash.team1emoji, clash.team2emoji), lambda: (self.var("team1_votes", []), self.var("team2_votes", [])))
+
+            await self.command("confirm")
+            matches += 1
+        await self.gateway.drain()
+
+    async def vote_on(self, message, emojis, tally) -> None:
+        """
+        Every voter picks a side of one VS message, some switch sides, and a
+        tie gets a fresh voter. `tally` returns the (team1, team2) voter lists.
+        """
+        for user in self.voters():
+            choice = self.rng.randrange(2)
+            await self.pace(self.gateway.react(message, user, emojis[choice]))
+            if self.rng.random() < self.args.clear_rate:
+                await self.pace(self.gateway.react(message, user, emojis[1 - choice]))
+        await self.settle()
+        await wait_for_outbound(self.app, self.gateway)
+
+        # break ties with a fresh voter
+        team1_votes, team2_votes = tally()
+        if len(team1_votes) == len(team2_votes):
+            voted = set(team1_votes) | set(team2_votes)
+            tie_breaker = next(user for user in self.users if user.id not in voted)
+            await self.gateway.react(message, tie_breaker, emojis[0])
+        await self.gateway.drain()
+
+async def wait_for_outbound(app, gateway: FakeGateway) -> None:
+    await app.vote_edits.flush()
+    while app.outbound.pending or gateway._tasks:
+        await gateway.drain()
+        await asyncio.sleep(0.01)
+
+def measurements(app, gateway: FakeGateway, recorder: LatencyRecorder, elapsed: float) -> dict:
+    """
+    Throughput, latency percentiles and API usage of a finished run.
+    """
+    events = sum(count for name, count in gateway.events.items() if not name.endswith("_error"))
+    errors = sum(count for name, count in gateway.events.items() if name.endswith("_error"))
+
+    latencies = {}
+    for label, samples in sorted({**{f"event {k}": v for k, v in gateway.event_latencies.items()}, **recorder.samples}.items()):
+        latencies[label] = {
+            "count": len(samples),
+            "p50_ms": percentile(samples, 50) * 1000,
+            "p90_ms": percentile(samples, 90) * 1000,
+            "p99_ms": percentile(samples, 99) * 1000,
+            "max_ms": max(samples) * 1000,
+        }
+
+    mailboxes = app.guild_actors.stats()
+    guilds = max(len(gateway.guilds), 1)
+    return {
+        "wall_seconds": elapsed,
+        "events": dict(gateway.events),
+        "events_per_second": events / elapsed if elapsed else 0.0,
+        "handler_errors": errors,
+        "errors": dict(gateway.errors.most_common(5)),
+        "latency": latencies,
+        "api_calls": dict(gateway.api_calls),
+        "api_calls_total": sum(gateway.api_calls.values()),
+        "api_calls_per_guild": sum(gateway.api_calls.values()) / guilds,
+        "outbound": app.outbound.stats(),
+        "user_throttle": app.user_throttle.stats(),
+        "mailbox_max_latency_ms": max((m["max_latency"] for m in mailboxes.values()), default=0.0) * 1000,
+    }
+
+def build_report(args, app, gateway: FakeGateway, recorder: LatencyRecorder, scenarios: List[TournamentScenario], elapsed: float) -> dict:
+    return {
+        "scenario": {
+            "guilds": args.guilds,
+            "users": args.users,
+            "bracket_size": args.bracket_size,
+            "rounds": args.rounds,
+            "ballot_mode": args.ballot_mode,
+            "pools": args.pools,
+            "votes_per_user": args.votes_per_user,
+            "vote_rate": args.vote_rate,
+            "render": args.render,
+            "realtime_limits": args.realtime_limits,
+            "user_throttle": args.user_throttle,
+            "member_cache": not args.no_member_cache,
+        },
+        **measurements(app, gateway, recorder, elapsed),
+        "winners": [scenario.winner for scenario in scenarios],
+    }
+
+def print_measurements(report: dict) -> None:
+    print(
+        f"Wall time {report['wall_seconds']:.2f}s, {sum(report['events'].values())} events "
+        f"({report['events_per_second']:.0f}/s), {report['handler_errors']} handler error(s)"
+    )
+    for error, count in report["errors"].items():
+        print(f"  {count} x {error}")
+    print()
+    print(f"{'latency (ms)':<36}{'count':>8}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}")
+    for label, row in report["latency"].items():
+        print(f"{label:<36}{row['count']:>8}{row['p50_ms']:>9.2f}{row['p90_ms']:>9.2f}{row['p99_ms']:>9.2f}{row['max_ms']:>9.2f}")
+    print()
+    calls = ", ".join(f"{kind} {count}" for kind, count in sorted(report["api_calls"].items()))
+    print(f"API calls: {report['api_calls_total']} ({report['api_calls_per_guild']:.0f}/guild) - {calls}")
+    outbound = report["outbound"]
+    print(
+        f"Outbound: executed {outbound['executed']}, coalesced {outbound['coalesced']}, dropped {outbound['dropped']}, "
+        f"throttled {outbound['throttled']}, avg wait {outbound['avg_wait'] * 1000:.2f}ms"
+    )
+    print(f"User throttle: {report['user_throttle']['dropped']} events dropped")
+    print(f"Mailbox max latency: {report['mailbox_max_latency_ms']:.2f}ms")
+    if "state_store" in report:
+        state_store = report["state_store"]
+        print(
+            f"State store: {state_store['guilds']} guild(s) reloaded, {len(state_store['stale_vars'])} stale var(s), "
+            f"cleared guild read back: {'yes' if state_store['cleared_read_back'] else 'no'}"
+        )
+        for var in state_store["stale_vars"]:
+            print(f"  stale {var}")
+
+def print_report(report: dict) -> None:
+    scenario = report["scenario"]
+    print(
+        f"Scenario: {scenario['guilds']} guild(s) x {scenario['users']} users, bracket {scenario['bracket_size']}, "
+        f"{scenario['rounds']} qual round(s), {scenario['ballot_mode']} ballots"
+    )
+    print_measurements(report)
+    print(f"Winners: {', '.join(str(w) for w in report['winners'])}")
+
+def prepare_bot(render: bool = False, realtime_limits: bool = False, bot_user_id: int = 1000):
+    """
+    Import the bot (the environment must already hold its config), time its
+    handlers and point it at a fresh fake gateway. Returns (app, gateway, recorder).
+    """
+    import bot as app
+    import mr_bracket
+
+    recorder = LatencyRecorder()
+    if not render:
+        mr_bracket.Bracket.generate_standings = lambda self, guild_id: STUB_IMAGE
+        mr_bracket.Bracket.generate_win_meme = lambda self, guild_id, name: STUB_IMAGE
+    recorder.wrap(mr_bracket.Bracket, "generate_standings")
+    recorder.wrap(mr_bracket.Bracket, "generate_win_meme")
+    for name in ("handle_message", "handle_reaction_add", "handle_reaction_remove", "handle_ballot_vote", "handle_ballot_clear", "handle_matchup_start", "handle_matchup_pick", "handle_start", "handle_confirm"):
+        recorder.wrap(app, name)
+    recorder.wrap(app, "process_stage", lambda guild_id: f"process_stage[stage {app.getGuildVar(guild_id, 'stage', 0)}]")
+
+    if not realtime_limits:
+        app.outbound.set_route_rates({kind: (1e9, 1e9) for kind in app.outbound.route_rates})
+
+    gateway = FakeGateway(bot_user_id)
+    gateway.install(app.bot, app.on_message, app.on_raw_reaction_add, app.on_raw_reaction_remove, app.on_interaction)
+    gateway.member_cache = app.config.member_cache
+    if app.gateway_trace is not None:
+        app.gateway_trace.start(bot_user_id)
+    return app, gateway, recorder
+
+async def simulate(args: argparse.Namespace) -> dict:
+    configure_environment(args)
+    app, gateway, recorder = prepare_bot(args.render, args.realtime_limits)
+
+    rng = random.Random(args.seed)
+    scenarios = []
+    for g in range(args.guilds):
+        guild = gateway.add_guild(f"Sim Guild {g + 1}")
+        channel = gateway.add_channel(guild, "bracket")
+        gateway.add_channel(guild, "general")
+        pool_channels = [gateway.add_channel(guild, name) for name in pool_channel_names(args)]
+        admin = gateway.add_user(guild, f"admin-{g + 1}")
+        users = [gateway.add_user(guild, f"user-{g + 1}-{u + 1}") for u in range(args.users)]
+        scenarios.append(TournamentScenario(app, gateway, guild, channel, admin, users, args, random.Random(rng.random()), pool_channels))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(scenario.run() for scenario in scenarios))
+    await wait_for_outbound(app, gateway)
+    elapsed = time.perf_counter() - started
+    if app.gateway_trace is not None:
+        app.gateway_trace.close()
+    report = build_report(args, app, gateway, recorder, scenarios, elapsed)
+    if args.state_dir:
+        report["state_store"] = check_state_store(app, [scenario.guild.id for scenario in scenarios])
+    return report
+
+def check_state_store(app, guild_ids: List[int]) -> dict:
+    """
+    Flush the file store and load every guild back from disk. A var that
+    reloads differently was changed in place without setGuildVar and would
+    be lost on restart.
+    """
+    store = app.getStore()
+    store.flush_all()
+    reloaded = FileGuildStore(store.root, store.shard_count)
+    stale = []
+    for guild_id in guild_ids:
+        saved = reloaded.get(guild_id) or {}
+        for key, value in (store.get(guild_id) or {}).items():
+            try:
+                expected = pickle.dumps(value)
+            except Exception:
+                # live discord objects are never saved
+                continue
+            if key not in saved or pickle.dumps(saved[key]) != expected:
+                stale.append(f"{guild_id}:{key}")
+    return {"guilds": len(guild_ids), "stale_vars": stale, "cleared_read_back": check_clear_while_queued(store.root)}
+
+def check_clear_while_queued(root: str) -> bool:
+    """
+    Whether a cleared guild reads back from its file while the removal still
+    waits on the writer thread, or after it ran. Should be False.
+    """
+    guild_id = 1
+    store = FileGuildStore(os.path.join(root, "clear_check"))
+    store.setdefault(guild_id)["stage"] = 2
+    store.commit(guild_id, "stage")
+    store.flush_all()
+
+    # a fresh store only has the guild on disk
+    store = FileGuildStore(store.root)
+    hold = threading.Event()
+    store._writer.submit(hold.wait)
+    try:
+        store.clear(guild_id)
+        read_back = store.get(guild_id) is not None
+    finally:
+        hold.set()
+    store.flush_all()
+    return read_back or store.get(guild_id) is not None
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    if args.verbose:
+        logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+        report = asyncio.run(simulate(args))
+    else:
+        # keep the report readable
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            report = asyncio.run(simulate(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+if __name__ == "__main__":
+    main()
@@ -11,14 +11,19 @@ set -a
 [ -f .env ] && source .env
 set +a
 
-# ─── Check for existing bot process ──────────────────────────────
+# ─── Check for existing bot processes ────────────────────────────
 if [ -f bot.pid ]; then
-  EXISTING_PID=$(cat bot.pid)
-  if kill -0 "$EXISTING_PID" 2>/dev/null; then
-    echo "Bot is already running with PID $EXISTING_PID. Exiting start script."
+  RUNNING=0
+  for EXISTING_PID in $(cat bot.pid); do
+    if kill -0 "$EXISTING_PID" 2>/dev/null; then
+      RUNNING=1
+    fi
+  done
+  if [ "$RUNNING" -eq 1 ]; then
+    echo "Bot is already running with PID(s) $(tr '\n' ' ' < bot.pid). Exiting start script."
     exit 0
   else
-    echo "Found stale bot.pid (PID $EXISTING_PID not running). Cleaning up."
+    echo "Found stale bot.pid (PID(s) $(tr '\n' ' ' < bot.pid) not running). Cleaning up."
     rm -f bot.pid
   fi
 fi
@@ -27,9 +32,48 @@ fi
 mkdir -p logs
 
 # ─── Launch bot in background ───────────────────────────────────
-nohup python bot.py > logs/bot.log 2>&1 &
+SHARD_WORKERS=${SHARD_WORKERS:-1}
 
-# ─── Record new PID ──────────────────────────────────────────────
-echo $! > bot.pid
+# the bot rotates its own LOG_FILE, stdout/stderr only carry warnings and crashes
+LOG_FILE=${LOG_FILE:-logs/bot.log}
 
-echo "Bot started with PID $(cat bot.pid). Logs: logs/bot.log"
\ No newline at end of file
+if [ "$SHARD_WORKERS" -le 1 ]; then
+  nohup python bot.py >> logs/console.log 2>&1 &
+  echo $! > bot.pid
+  echo "Bot started with PID $(cat bot.pid). Logs: $LOG_FILE (console: logs/console.log)"
+  exit 0
+fi
+
+# ─── Launch sharded worker group ────────────────────────────────
+# Shards are dealt round-robin: worker i owns every shard s where s % SHARD_WORKERS == i
+SHARD_COUNT=${SHARD_COUNT:-$SHARD_WORKERS}
+if [ "$SHARD_COUNT" -lt "$SHARD_WORKERS" ]; then
+  echo "SHARD_COUNT ($SHARD_COUNT) must be at least SHARD_WORKERS ($SHARD_WORKERS)." >&2
+  exit 1
+fi
+
+: > bot.pid
+for WORKER in $(seq 0 $((SHARD_WORKERS - 1))); do
+  WORKER_SHARDS=""
+  for SHARD in $(seq 0 $((SHARD_COUNT - 1))); do
+    if [ $((SHARD % SHARD_WORKERS)) -eq "$WORKER" ]; then
+      WORKER_SHARDS="${WORKER_SHARDS:+$WORKER_SHARDS,}$SHARD"
+    fi
+  done
+
+  # each worker gets its own metrics port, dump file and log file
+  WORKER_METRICS_PORT=0
+  if [ "${METRICS_PORT:-0}" -gt 0 ]; then
+    WORKER_METRICS_PORT=$((METRICS_PORT + WORKER))
+  fi
+  WORKER_METRICS_DUMP_FILE="${METRICS_DUMP_FILE:+${METRICS_DUMP_FILE%.*}_worker_${WORKER}.${METRICS_DUMP_FILE##*.}}"
+  WORKER_LOG_FILE="${LOG_FILE%.*}_worker_${WORKER}.${LOG_FILE##*.}"
+
+  SHARD_COUNT="$SHARD_COUNT" SHARD_IDS="$WORKER_SHARDS" \
+    METRICS_PORT="$WORKER_METRICS_PORT" METRICS_DUMP_FILE="$WORKER_METRICS_DUMP_FILE" LOG_FILE="$WORKER_LOG_FILE" \
+    nohup python bot.py >> "logs/console_worker_${WORKER}.log" 2>&1 &
+  echo $! >> bot.pid
+  echo "Worker $WORKER started with PID $! (shards $WORKER_SHARDS). Logs: $WORKER_LOG_FILE"
+done
+
+echo "Started $SHARD_WORKERS workers for $SHARD_COUNT shards."
\ No newline at end of file
@@ -11,14 +11,19 @@ if [ ! -f bot.pid ]; then
   exit 1
 fi
 
-# ─── Read and verify PID ────────────────────────────────────────
-PID=$(cat bot.pid)
-if ! kill -0 "$PID" 2>/dev/null; then
-  echo "Process $PID not running. Removing stale bot.pid"
-  rm -f bot.pid
-  exit 1
-fi
+# ─── Terminate every worker in the group ────────────────────────
+STOPPED=0
+for PID in $(cat bot.pid); do
+  if kill -0 "$PID" 2>/dev/null; then
+    kill "$PID" && echo "Sent TERM to process $PID."
+    STOPPED=1
+  else
+    echo "Process $PID not running."
+  fi
+done
+rm -f bot.pid
 
-# ─── Terminate bot ──────────────────────────────────────────────
-kill "$PID" && echo "Sent TERM to process $PID."
-rm -f bot.pid
\ No newline at end of file
+if [ "$STOPPED" -eq 0 ]; then
+  echo "Removed stale bot.pid"
+  exit 1
+fi
\ No newline at end of file
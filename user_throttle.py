@@ -0,0 +1,48 @@
+# user_throttle.py
+
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from outbound import TokenBucket
+
+class UserThrottle:
+    """
+    Per-user, per-guild token buckets for gateway events, one bucket per
+    event kind. allow() is checked before an event is queued for its guild,
+    so a user spamming reactions or messages only burns their own tokens and
+    never reaches the guild's mailbox, state or our API budget.
+
+    Buckets live in a bounded LRU, a user who went quiet long enough to be
+    evicted starts over with a full bucket anyway.
+    """
+    def __init__(self, rates: Dict[str, Tuple[float, float]], maxsize: int = 10000):
+        # kind -> (tokens per second, burst), a rate of 0 leaves the kind unthrottled
+        self.rates = rates
+        self.maxsize = maxsize
+        self._buckets: "OrderedDict[Tuple[int, int, str], TokenBucket]" = OrderedDict()
+        self.allowed = 0
+        self.dropped = 0
+
+    def allow(self, guild_id: int, user_id: int, kind: str, now: Optional[float] = None) -> bool:
+        rate, burst = self.rates.get(kind, (0, 0))
+        if rate <= 0:
+            return True
+
+        key = (guild_id, user_id, kind)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(rate, burst)
+            while len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+
+        if bucket.try_acquire(time.monotonic() if now is None else now):
+            self.allowed += 1
+            return True
+        self.dropped += 1
+        return False
+
+    def stats(self) -> Dict[str, int]:
+        return {"buckets": len(self._buckets), "allowed": self.allowed, "dropped": self.dropped}
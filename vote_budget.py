@@ -0,0 +1,43 @@
+# vote_budget.py
+
+from typing import Dict, Mapping
+
+class VoteBudget:
+    """
+    Votes every user has left in a qualification round, without an entry per
+    member: everyone starts at `base`, `granted` is what /give_vote handed
+    the whole guild since, and only users who voted or got their own votes
+    have an adjustment. Giving everyone votes is a single addition however
+    large the guild is.
+    """
+    def __init__(self, base: int):
+        self.base = base
+        self.granted = 0
+        self.adjustments: Dict[int, int] = {}
+
+    @classmethod
+    def from_counts(cls, base: int, counts: Mapping[str, int]) -> "VoteBudget":
+        """
+        Carry over the per-user counts of the old "user_vote_count" guild var.
+        """
+        budget = cls(base)
+        for user_id, count in counts.items():
+            budget.add(int(user_id), count - base)
+        return budget
+
+    def remaining(self, user_id: int) -> int:
+        return self.base + self.granted + self.adjustments.get(user_id, 0)
+
+    def add(self, user_id: int, amount: int) -> int:
+        """
+        Give (or take, with a negative amount) one user votes. Returns what they have left.
+        """
+        adjustment = self.adjustments.get(user_id, 0) + amount
+        if adjustment:
+            self.adjustments[user_id] = adjustment
+        else:
+            self.adjustments.pop(user_id, None)
+        return self.remaining(user_id)
+
+    def grant_all(self, amount: int) -> None:
+        self.granted += amount